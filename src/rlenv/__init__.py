@@ -13,15 +13,20 @@ __version__ = "1.0.4"
 from . import models
 from . import wrappers
 from . import adapters
+from . import remote
 from .models import spaces
 
 
-from .env_builder import make, Builder
+from .env_builder import make, Builder, EnvSpec
 from .models import (
     RLEnv,
+    AsyncRLEnv,
+    ThreadedAsyncEnv,
     Observation,
     Episode,
     EpisodeBuilder,
+    BatchEpisodeBuilder,
+    EpisodeStatistics,
     Transition,
     DiscreteSpace,
     ContinuousSpace,
@@ -30,18 +35,29 @@ from .models import (
     ContinuousActionSpace,
 )
 from .mock_env import MockEnv
+from .rollout import rollout
+from .actor_pool import ActorPool
+from .rate_limiter import RateLimiter
+from .replay import EpisodeReplay
+from .profiler import StackProfiler
 
 __all__ = [
     "models",
     "wrappers",
     "adapters",
+    "remote",
     "spaces",
     "make",
     "Builder",
+    "EnvSpec",
     "RLEnv",
+    "AsyncRLEnv",
+    "ThreadedAsyncEnv",
     "Observation",
     "Episode",
     "EpisodeBuilder",
+    "BatchEpisodeBuilder",
+    "EpisodeStatistics",
     "Transition",
     "ActionSpace",
     "DiscreteSpace",
@@ -49,4 +65,9 @@ __all__ = [
     "DiscreteActionSpace",
     "ContinuousActionSpace",
     "MockEnv",
+    "rollout",
+    "ActorPool",
+    "RateLimiter",
+    "EpisodeReplay",
+    "StackProfiler",
 ]
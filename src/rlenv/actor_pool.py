@@ -0,0 +1,195 @@
+import multiprocessing as mp
+import queue
+from multiprocessing.connection import Connection, wait
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Iterator, Optional
+
+from .models import RLEnv, Episode, wire
+from .rate_limiter import RateLimiter
+from .rollout import Policy, rollout
+
+
+def _worker(env_factory: Callable[[], RLEnv], policy: Policy, weights: Any, episodes: Connection, slots, commands: mp.Queue, stop):
+    env = env_factory()
+    # The schema of the episodes is only sent with the first message, then the learner uses its cached layout
+    encoder = wire.Encoder()
+    if weights is not None:
+        policy.set_weights(weights)  # type: ignore
+    while not stop.is_set():
+        # Weight updates are only applied between episodes
+        try:
+            while True:
+                policy.set_weights(commands.get_nowait())  # type: ignore
+        except queue.Empty:
+            pass
+        for episode in rollout(env, policy, 1):
+            message = encoder.encode(episode)
+            # Block while all the slots are used (backpressure), but regularly check whether the pool is closing
+            while not stop.is_set():
+                if slots.acquire(timeout=0.1):
+                    episodes.send_bytes(message)
+                    break
+
+
+class ActorPool:
+    """
+    Pool of worker processes that run episodes and stream them back to the learner.
+
+    Each worker builds its own environment with `env_factory` and runs episodes with `policy`; both must be picklable.
+    The finished episodes are encoded with `rlenv.models.wire` and sent through a pipe per worker, each with
+    `max(1, queue_size // n_workers)` slots: workers block when the learner does not consume the episodes fast enough.
+    Workers that die are restarted, up to `max_restarts` times in total. Since each worker has its own pipe, a worker
+    that is killed while sending an episode can not block the other ones.
+
+    To update the policy of the workers, call `update_weights(weights)`: the workers then call
+    `policy.set_weights(weights)` before their next episode.
+    """
+
+    def __init__(
+        self,
+        env_factory: Callable[[], RLEnv],
+        policy: Policy,
+        n_workers: int = 4,
+        queue_size: int = 16,
+        max_restarts: int = 10,
+        start_method: Optional[str] = None,
+    ):
+        self.env_factory = env_factory
+        self.policy = policy
+        self.n_workers = n_workers
+        self.max_restarts = max_restarts
+        self.n_restarts = 0
+        self._ctx: BaseContext = mp.get_context(start_method)
+        self._slots_per_worker = max(1, queue_size // n_workers)
+        self._stop = self._ctx.Event()
+        self._weights = None
+        self._processes = list[Any]()
+        self._connections = list[Connection]()
+        self._slots = list[Any]()
+        self._commands = list[mp.Queue]()
+        self._ready = list[Connection]()
+        """Connections that had an episode to receive at the last `wait`"""
+        self._decoder = wire.Decoder()
+        self._pending_inserts = 0
+        """Transitions of the received episodes that the rate limiter has not accepted yet"""
+
+    def start(self):
+        for i in range(self.n_workers):
+            self._spawn(i)
+        return self
+
+    def _spawn(self, i: int):
+        """Start the `i`-th worker with its own pipe, slots and command queue"""
+        reader, writer = self._ctx.Pipe(duplex=False)
+        slots = self._ctx.Semaphore(self._slots_per_worker)
+        # The new worker starts with the latest weights, so the pending updates of a dead worker are obsolete
+        commands = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker,
+            args=(self.env_factory, self.policy, self._weights, writer, slots, commands, self._stop),
+            daemon=True,
+        )
+        process.start()
+        # Only the worker keeps the write end, such that reading from the pipe fails instead of blocking if it dies
+        writer.close()
+        if i < len(self._processes):
+            self._connections[i].close()
+            self._processes[i], self._connections[i], self._slots[i], self._commands[i] = process, reader, slots, commands
+        else:
+            self._processes.append(process)
+            self._connections.append(reader)
+            self._slots.append(slots)
+            self._commands.append(commands)
+
+    def update_weights(self, weights: Any):
+        """Send new policy weights to all the workers"""
+        self._weights = weights
+        for commands in self._commands:
+            commands.put(weights)
+
+    def _restart_dead_workers(self):
+        for i, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            if self.n_restarts >= self.max_restarts:
+                raise RuntimeError(f"Worker {i} died with exit code {process.exitcode} and the maximal number of restarts has been reached")
+            self.n_restarts += 1
+            self._spawn(i)
+
+    def _receive(self, timeout: float) -> Optional[bytes]:
+        """Receive the next episode of the workers in turn, or None if no worker sent one within `timeout` seconds"""
+        if len(self._ready) == 0:
+            self._ready = wait(self._connections, timeout)  # type: ignore
+        while len(self._ready) > 0:
+            connection = self._ready.pop()
+            if connection.closed:
+                # The worker has been restarted with a new pipe
+                continue
+            try:
+                message = connection.recv_bytes()
+            except (EOFError, OSError):
+                # The worker died, it is restarted at the next iteration
+                continue
+            self._slots[self._connections.index(connection)].release()
+            return message
+        return None
+
+    def episodes(
+        self, n_episodes: Optional[int] = None, timeout: float = 1.0, rate_limiter: Optional[RateLimiter] = None
+    ) -> Iterator[Episode]:
+        """
+        Yield the episodes produced by the workers, indefinitely if `n_episodes` is None.
+
+        If a `rate_limiter` is given, the transitions of each episode are inserted in it without blocking. When the
+        limiter refuses the insertion (the learner samples too slowly), the iteration stops before receiving the next
+        episode, such that the learner can sample from the same thread and then call `episodes` again. Meanwhile, the
+        episodes are not consumed anymore and the workers block once all their slots are used.
+        """
+        if len(self._processes) == 0:
+            self.start()
+        n_received = 0
+        while n_episodes is None or n_received < n_episodes:
+            if rate_limiter is not None and not self._insert_pending(rate_limiter):
+                return
+            # Check the workers at every iteration, since the other workers may keep the learner fed
+            self._restart_dead_workers()
+            message = self._receive(timeout)
+            if message is None:
+                continue
+            episode = self._decoder.decode(message)
+            assert isinstance(episode, Episode)
+            n_received += 1
+            if rate_limiter is not None:
+                self._pending_inserts += len(episode)
+                self._insert_pending(rate_limiter)
+            yield episode
+
+    def _insert_pending(self, rate_limiter: RateLimiter) -> bool:
+        """Insert the pending transitions in the rate limiter without blocking. Returns whether all of them were inserted."""
+        while self._pending_inserts > 0:
+            chunk = min(self._pending_inserts, rate_limiter.max_chunk_size)
+            if not rate_limiter.insert(chunk, timeout=0):
+                return False
+            self._pending_inserts -= chunk
+        return True
+
+    def close(self):
+        """Stop the workers"""
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        self._processes.clear()
+        self._connections.clear()
+        self._slots.clear()
+        self._commands.clear()
+        self._ready.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.close()
@@ -1,3 +1,6 @@
+import copy
+import weakref
+from typing import Optional
 from gymnasium import Env, spaces
 import numpy as np
 
@@ -7,13 +10,19 @@ from rlenv.models import (
     ActionSpace,
     DiscreteSpace,
     ContinuousSpace,
+    ObservationRing,
 )
 
 
 class Gym(RLEnv[ActionSpace]):
-    """Wraps a gym envronment in an RLEnv"""
+    """
+    Wraps a gym envronment in an RLEnv.
 
-    def __init__(self, env: Env):
+    If `lazy` is True, the `state` and `available_actions` of the observations are only computed when they are read,
+    or before the next call to `step` or `reset` if the observation is still referenced.
+    """
+
+    def __init__(self, env: Env, lazy: bool = False):
         if env.observation_space.shape is None:
             raise NotImplementedError("Observation space must have a shape")
         match env.action_space:
@@ -35,27 +44,71 @@ class Gym(RLEnv[ActionSpace]):
             self.name = self.env.unwrapped.spec.id
         else:
             self.name = "gym-no-id"
+        self.lazy = lazy
+        self._last_obs: Optional[weakref.ref[Observation]] = None
+        self._ring = None
 
     def step(self, actions):
+        self._release_last_observation()
         obs_, reward, done, truncated, info = self.env.step(list(actions)[0])
-        obs_ = Observation(
-            np.array([obs_], dtype=np.float32),
-            self.available_actions(),
-            self.get_state(),
-        )
+        obs_ = self._make_observation(obs_)
         return obs_, np.array([reward], dtype=np.float32), done, truncated, info
 
+    def _make_observation(self, obs_data):
+        if self._ring is None:
+            data = np.array([obs_data], dtype=np.float32)
+            if not self.lazy:
+                return Observation(data, self.available_actions(), self.get_state())
+            obs = Observation(data, self.available_actions, self.get_state)
+        else:
+            obs = self._ring.next()
+            obs.data[0] = obs_data
+            if not self.lazy:
+                np.copyto(obs.available_actions, self.available_actions())
+                np.copyto(obs.state, self.get_state())
+                return obs
+            obs.available_actions = self.available_actions
+            obs.state = self.get_state
+        self._last_obs = weakref.ref(obs)
+        return obs
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        self._ring = ObservationRing(
+            self.n_agents,
+            self.n_actions,
+            self.observation_shape,
+            self.state_shape,
+            self.extra_feature_shape,
+            size,
+            debug,
+        )
+
+    def _release_last_observation(self):
+        # The last lazy observation is only resolved if the caller kept it. Reused buffers are expired instead, since the
+        # caller must copy them (which resolves them) to keep them.
+        obs = self._last_obs() if self._last_obs is not None else None
+        if obs is not None:
+            if self._ring is None:
+                obs.resolve()
+            else:
+                obs.expire()
+        self._last_obs = None
+
+    def snapshot(self):
+        """Fallback that deep copies the gym environment, which fails for environments that can not be copied."""
+        return copy.deepcopy(self.env)
+
+    def restore(self, snapshot):
+        self._release_last_observation()
+        self.env = copy.deepcopy(snapshot)
+
     def get_state(self):
         return np.zeros(1, dtype=np.float32)
 
     def reset(self):
+        self._release_last_observation()
         obs_data, _info = self.env.reset()
-        obs = Observation(
-            np.array([obs_data], dtype=np.float32),
-            self.available_actions(),
-            self.get_state(),
-        )
-        return obs
+        return self._make_observation(obs_data)
 
     def render(self, mode: str = "human"):
         return self.env.render()
@@ -1,12 +1,22 @@
+import copy
+import weakref
+from typing import Optional
 from pettingzoo import ParallelEnv
 from gymnasium import spaces  # pettingzoo uses gymnasium spaces
-from rlenv.models import RLEnv, Observation, ActionSpace, DiscreteActionSpace, ContinuousActionSpace, ContinuousSpace
+from rlenv.models import RLEnv, Observation, ActionSpace, DiscreteActionSpace, ContinuousActionSpace, ObservationRing, BufferRing
 import numpy as np
 import numpy.typing as npt
 
 
 class PettingZoo(RLEnv[ActionSpace]):
-    def __init__(self, env: ParallelEnv):
+    """
+    Wraps a PettingZoo parallel environment in an RLEnv.
+
+    If `lazy` is True, the `state` and `available_actions` of the observations are only computed when they are read,
+    or before the next call to `step` or `reset` if the observation is still referenced.
+    """
+
+    def __init__(self, env: ParallelEnv, lazy: bool = False):
         env.reset()
         aspace = env.action_space(env.possible_agents[0])
 
@@ -31,6 +41,13 @@ class PettingZoo(RLEnv[ActionSpace]):
         self._env = env
         super().__init__(space, obs_space.shape, self.get_state().shape)
         self.agents = env.possible_agents
+        self.agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        """Index of each agent in the [n_agents, ...] arrays, which does not depend on the order of the dictionaries."""
+        self.lazy = lazy
+        self._alive = np.ones(self.n_agents, dtype=np.bool_)
+        self._last_obs: Optional[weakref.ref[Observation]] = None
+        self._ring = None
+        self._alive_ring = None
 
     def get_state(self):
         try:
@@ -38,18 +55,97 @@ class PettingZoo(RLEnv[ActionSpace]):
         except NotImplementedError:
             return np.array([0])
 
+    @property
+    def alive(self) -> npt.NDArray[np.bool_]:
+        """Which agents are still in the episode"""
+        return self._alive
+
     def step(self, actions: npt.NDArray[np.int64]):
-        action_dict = dict(zip(self.agents, actions))
+        self._release_last_observation()
+        # Only the agents that are still alive act
+        agent_index = self.agent_index
+        action_dict = {agent: actions[agent_index[agent]] for agent in self._env.agents}
         obs, reward, term, trunc, info = self._env.step(action_dict)
-        obs_data = np.array([v for v in obs.values()])
-        reward = np.sum([r for r in reward.values()], keepdims=True)
-        observation = Observation(obs_data, self.available_actions(), self.get_state())
-        return observation, reward, any(term.values()), any(trunc.values()), info
+        reward = np.array([sum(reward.values())], dtype=np.float32)
+        observation = self._make_observation(obs)
+        # The episode ends when all the agents have left it, not when the first one does
+        remaining = len(self._env.agents) > 0
+        done = not remaining and any(term.values())
+        truncated = not remaining and not done
+        return observation, reward, done, truncated, info
 
     def reset(self) -> Observation:
+        self._release_last_observation()
         obs = self._env.reset()[0]
-        obs_data = np.array([v for v in obs.values()])
-        return Observation(obs_data, self.available_actions(), self.get_state())
+        return self._make_observation(obs)
+
+    def _make_observation(self, obs: dict[str, np.ndarray]):
+        if self._ring is None:
+            observation = None
+            data = np.zeros((self.n_agents, *self.observation_shape), dtype=np.float32)
+            alive = np.zeros(self.n_agents, dtype=np.bool_)
+        else:
+            assert self._alive_ring is not None
+            observation = self._ring.next()
+            data = observation.data
+            alive = self._alive_ring.next()
+            if len(obs) < self.n_agents:
+                data.fill(0.0)
+                alive.fill(False)
+        # Dead agents keep a zero observation and are masked out
+        agent_index = self.agent_index
+        for agent, agent_obs in obs.items():
+            i = agent_index[agent]
+            data[i] = agent_obs
+            alive[i] = True
+        self._alive = alive
+        if observation is None:
+            if not self.lazy:
+                return Observation(data, self.available_actions(), self.get_state(), alive=alive)
+            observation = Observation(data, self.available_actions, self.get_state, alive=alive)
+        else:
+            observation.alive = alive
+            if not self.lazy:
+                np.copyto(observation.available_actions, self.available_actions())
+                np.copyto(observation.state, self.get_state())
+                return observation
+            observation.available_actions = self.available_actions
+            observation.state = self.get_state
+        self._last_obs = weakref.ref(observation)
+        return observation
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        self._ring = ObservationRing(
+            self.n_agents,
+            self.n_actions,
+            self.observation_shape,
+            self.state_shape,
+            self.extra_feature_shape,
+            size,
+            debug,
+        )
+        self._alive_ring = BufferRing((self.n_agents,), np.bool_, size)
+
+    def _release_last_observation(self):
+        # The last lazy observation is only resolved if the caller kept it. Reused buffers are expired instead, since the
+        # caller must copy them (which resolves them) to keep them.
+        obs = self._last_obs() if self._last_obs is not None else None
+        if obs is not None:
+            if self._ring is None:
+                obs.resolve()
+            else:
+                obs.expire()
+        self._last_obs = None
+
+    def snapshot(self):
+        """Fallback that deep copies the pettingzoo environment, which fails for environments that can not be copied."""
+        return copy.deepcopy(self._env), self._alive.copy()
+
+    def restore(self, snapshot):
+        self._release_last_observation()
+        env, alive = snapshot
+        self._env = copy.deepcopy(env)
+        self._alive = alive.copy()
 
     def seed(self, seed_value: int):
         self._env.reset(seed=seed_value)
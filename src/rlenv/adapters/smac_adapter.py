@@ -1,21 +1,27 @@
 import numpy as np
 import numpy.typing as npt
-from typing import Literal, overload
+import weakref
+from typing import Callable, Literal, Optional, overload
 from smac.env import StarCraft2Env
 
-from rlenv.models import RLEnv, Observation, DiscreteActionSpace
+from rlenv.models import RLEnv, Observation, DiscreteActionSpace, ObservationRing
 
 
 class SMAC(RLEnv[DiscreteActionSpace]):
-    """Wrapper for the SMAC environment to work with this framework"""
+    """
+    Wrapper for the SMAC environment to work with this framework.
+
+    If `lazy` is True, the `state` and `available_actions` of the observations are only computed when they are read,
+    or before the next call to `step` or `reset` if the observation is still referenced.
+    """
 
     @overload
-    def __init__(self, map_name: str) -> None: ...
+    def __init__(self, map_name: str, lazy: bool = False) -> None: ...
 
     @overload
-    def __init__(self, env: StarCraft2Env) -> None: ...
+    def __init__(self, env: StarCraft2Env, lazy: bool = False) -> None: ...
 
-    def __init__(self, env_or_map_name):  # type: ignore
+    def __init__(self, env_or_map_name, lazy: bool = False):  # type: ignore
         match env_or_map_name:
             case StarCraft2Env():
                 self._env = env_or_map_name
@@ -35,20 +41,64 @@ class SMAC(RLEnv[DiscreteActionSpace]):
         )
         self._seed = self._env.seed()
         self.name = f"smac-{self._env.map_name}"
+        self.lazy = lazy
+        self._last_obs: Optional[weakref.ref[Observation]] = None
+        self._ring = None
 
     def reset(self):
+        self._release_last_observation()
         obs, state = self._env.reset()
-        obs = Observation(np.array(obs), self.available_actions(), state)
-        return obs
+        return self._make_observation(obs, state)
 
     def get_state(self):
         return self._env.get_state()
 
     def step(self, actions):
+        self._release_last_observation()
         reward, done, info = self._env.step(actions)
-        obs = Observation(np.array(self._env.get_obs()), self.available_actions(), self.get_state())
+        obs = self._make_observation(self._env.get_obs(), self.get_state)
         return obs, np.array([reward], np.float32), done, False, info
 
+    def _make_observation(self, obs_data: list[np.ndarray], state: np.ndarray | Callable[[], np.ndarray]):
+        if self._ring is None:
+            if not self.lazy:
+                return Observation(np.array(obs_data), self.available_actions(), state if isinstance(state, np.ndarray) else state())
+            obs = Observation(np.array(obs_data), self.available_actions, state)
+        else:
+            obs = self._ring.next()
+            for i, agent_obs in enumerate(obs_data):
+                obs.data[i] = agent_obs
+            if not self.lazy:
+                np.copyto(obs.available_actions, self.available_actions())
+                np.copyto(obs.state, state if isinstance(state, np.ndarray) else state())
+                return obs
+            obs.available_actions = self.available_actions
+            obs.state = state
+        self._last_obs = weakref.ref(obs)
+        return obs
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        self._ring = ObservationRing(
+            self.n_agents,
+            self.n_actions,
+            self.observation_shape,
+            self.state_shape,
+            self.extra_feature_shape,
+            size,
+            debug,
+        )
+
+    def _release_last_observation(self):
+        # The last lazy observation is only resolved if the caller kept it. Reused buffers are expired instead, since the
+        # caller must copy them (which resolves them) to keep them.
+        obs = self._last_obs() if self._last_obs is not None else None
+        if obs is not None:
+            if self._ring is None:
+                obs.resolve()
+            else:
+                obs.expire()
+        self._last_obs = None
+
     def available_actions(self) -> npt.NDArray[np.bool_]:
         return np.array(self._env.get_avail_actions()) == 1
 
@@ -0,0 +1,25 @@
+"""
+Performance benchmarks of rlenv, runnable with `python -m rlenv.benchmarks`.
+
+Results are written to JSON and compared to a baseline to detect performance regressions: a metric regresses when it is
+more than `--threshold` (20% by default) worse than in the baseline. The default baseline, `baseline.json`, holds the
+results of `--quick` runs. Timings are machine-specific, so regenerate it with `--output` on the machine that runs the
+comparison. Run `python -m rlenv.benchmarks --help` for the available options.
+"""
+
+from .common import BenchmarkResult, Scale, compare, load_results, save_results
+from .stepping import run_stepping_benchmarks
+from .episodes import EpisodeScale, run_episode_benchmarks
+from .serialization import run_serialization_benchmarks
+
+__all__ = [
+    "BenchmarkResult",
+    "Scale",
+    "compare",
+    "load_results",
+    "save_results",
+    "run_stepping_benchmarks",
+    "EpisodeScale",
+    "run_episode_benchmarks",
+    "run_serialization_benchmarks",
+]
@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+
+from .common import compare, format_table, load_results, save_results
+from .episodes import DEFAULT_EPISODE_SCALES, QUICK_EPISODE_SCALES, run_episode_benchmarks
+from .serialization import run_serialization_benchmarks
+from .stepping import DEFAULT_SCALES, QUICK_SCALES, run_stepping_benchmarks
+
+SUITES = ["stepping", "episodes", "serialization"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+"""Results of `python -m rlenv.benchmarks --quick` committed with the package, regenerated with `--output`"""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m rlenv.benchmarks", description="Run the rlenv performance benchmarks")
+    # Some Python versions check an empty positional list against the choices, so the suites are validated below
+    parser.add_argument(
+        "suites", nargs="*", metavar="suite", help=f"The benchmark suites to run among {', '.join(SUITES)} (all by default)"
+    )
+    parser.add_argument("--quick", action="store_true", help="Run on fewer scales and with fewer steps")
+    parser.add_argument("--steps", type=int, default=None, help="Number of timed steps per stepping benchmark")
+    parser.add_argument("--repeats", type=int, default=None, help="Number of timed repetitions per episode benchmark")
+    parser.add_argument("--filter", default=None, help="Only run the benchmarks whose name contains this string")
+    parser.add_argument("--output", default=None, help="Path of the JSON file in which to write the results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON results to compare with (the committed baseline by default)")
+    parser.add_argument("--no-baseline", action="store_true", help="Do not compare the results with a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Tolerance: relative difference with the baseline considered a regression (default: 0.2, i.e. 20%%)",
+    )
+    args = parser.parse_args(argv)
+    unknown_suites = [suite for suite in args.suites if suite not in SUITES]
+    if len(unknown_suites) > 0:
+        parser.error(f"unknown suite(s) {', '.join(unknown_suites)} (choose from {', '.join(SUITES)})")
+    suites = args.suites or SUITES
+    if not args.no_baseline and not os.path.isfile(args.baseline):
+        parser.error(f"Baseline {args.baseline} not found: create it with --output, or run without comparison with --no-baseline")
+
+    results = []
+    if "stepping" in suites:
+        scales = QUICK_SCALES if args.quick else DEFAULT_SCALES
+        n_steps = args.steps or (500 if args.quick else 2_000)
+        stepping = run_stepping_benchmarks(scales, n_steps, name_filter=args.filter)
+        print(format_table(stepping, ["steps_per_s", "latency_p50_us", "latency_p99_us"]), end="\n\n")
+        results += stepping
+    if "episodes" in suites:
+        episode_scales = QUICK_EPISODE_SCALES if args.quick else DEFAULT_EPISODE_SCALES
+        n_repeats = args.repeats or (5 if args.quick else 20)
+        episodes = run_episode_benchmarks(episode_scales, n_repeats, name_filter=args.filter)
+        print(format_table(episodes, ["time_mean_us", "time_min_us", "peak_memory_kib"]), end="\n\n")
+        results += episodes
+    if "serialization" in suites:
+        episode_scales = QUICK_EPISODE_SCALES if args.quick else DEFAULT_EPISODE_SCALES
+        n_repeats = args.repeats or (5 if args.quick else 20)
+        serialization = run_serialization_benchmarks(episode_scales, n_repeats, name_filter=args.filter)
+        print(format_table(serialization, ["time_mean_us", "time_min_us", "peak_memory_kib"]), end="\n\n")
+        results += serialization
+    if args.output is not None:
+        save_results(results, args.output)
+    if not args.no_baseline:
+        regressions = compare(
+            results, load_results(args.baseline), args.threshold, ["steps_per_s", "latency_p50_us", "time_min_us", "peak_memory_kib"]
+        )
+        tolerance = f"tolerance: {args.threshold:.0%}"
+        if len(regressions) > 0:
+            print(f"{len(regressions)} regression(s) with respect to {args.baseline} ({tolerance}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regression with respect to {args.baseline} ({tolerance})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import json
+import platform
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of the benchmarked environments"""
+
+    n_agents: int
+    obs_size: int
+    n_actions: int
+
+
+@dataclass
+class BenchmarkResult:
+    suite: str
+    name: str
+    params: dict[str, Any]
+    metrics: dict[str, float]
+    """The measured values. By convention, metrics ending with `_per_s` are better when higher, the others when lower."""
+
+    @property
+    def key(self) -> str:
+        """Identifier of the benchmark, used to match results with the baseline"""
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.suite}/{self.name}[{params}]"
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    value: float
+
+    @property
+    def ratio(self) -> float:
+        return self.value / self.baseline
+
+    def __str__(self):
+        return f"{self.key} {self.metric}: {self.baseline:.4g} -> {self.value:.4g} ({self.ratio:.2f}x)"
+
+
+def latency_metrics(durations: list[float] | np.ndarray, prefix: str = "latency") -> dict[str, float]:
+    """Mean and percentiles (in microseconds) of the given durations (in seconds)"""
+    durations_us = np.asarray(durations, dtype=np.float64) * 1e6
+    p50, p90, p99 = np.percentile(durations_us, [50, 90, 99])
+    return {
+        f"{prefix}_mean_us": float(durations_us.mean()),
+        f"{prefix}_p50_us": float(p50),
+        f"{prefix}_p90_us": float(p90),
+        f"{prefix}_p99_us": float(p99),
+    }
+
+
+def environment_info() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(results: list[BenchmarkResult], path: str):
+    with open(path, "w") as f:
+        json.dump({"environment": environment_info(), "results": [asdict(r) for r in results]}, f, indent=2)
+
+
+def load_results(path: str) -> list[BenchmarkResult]:
+    with open(path) as f:
+        return [BenchmarkResult(**r) for r in json.load(f)["results"]]
+
+
+def compare(results: list[BenchmarkResult], baseline: list[BenchmarkResult], threshold: float = 0.2, metrics: Optional[list[str]] = None):
+    """
+    Regressions of `results` with respect to `baseline`: the metrics ending with `_per_s` that are more than `threshold`
+    (relative) below their baseline value, and the other metrics that are more than `threshold` above.
+
+    Only the `metrics` given are compared (all the metrics by default). Benchmarks missing from the baseline are ignored.
+    """
+    baseline_by_key = {r.key: r for r in baseline}
+    regressions = list[Regression]()
+    for result in results:
+        reference = baseline_by_key.get(result.key)
+        if reference is None:
+            continue
+        for metric, value in result.metrics.items():
+            if metrics is not None and metric not in metrics:
+                continue
+            reference_value = reference.metrics.get(metric)
+            if reference_value is None or reference_value <= 0:
+                continue
+            if metric.endswith("_per_s"):
+                regressed = value < reference_value * (1 - threshold)
+            else:
+                regressed = value > reference_value * (1 + threshold)
+            if regressed:
+                regressions.append(Regression(result.key, metric, reference_value, value))
+    return regressions
+
+
+def format_table(results: list[BenchmarkResult], metrics: list[str]) -> str:
+    rows = [["benchmark", *metrics]]
+    for result in results:
+        rows.append([result.key, *(f"{result.metrics[m]:.4g}" if m in result.metrics else "-" for m in metrics)])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
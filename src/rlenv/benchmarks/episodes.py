@@ -0,0 +1,119 @@
+"""
+Time and peak memory of the episode data path: `EpisodeBuilder`, `Episode` and the hashing/equality of `Observation`s
+and `Transition`s.
+"""
+
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from rlenv import EpisodeBuilder, Observation, Transition
+from .common import BenchmarkResult
+
+
+@dataclass(frozen=True)
+class EpisodeScale:
+    episode_len: int
+    n_agents: int
+    obs_size: int
+
+
+DEFAULT_EPISODE_SCALES = [
+    EpisodeScale(episode_len, n_agents, obs_size) for episode_len in (50, 500) for n_agents in (1, 8) for obs_size in (16, 1024)
+]
+QUICK_EPISODE_SCALES = [EpisodeScale(50, 2, 16), EpisodeScale(200, 8, 256)]
+N_ACTIONS = 5
+
+
+def make_transitions(scale: EpisodeScale, seed: int = 0) -> list[Transition]:
+    """Random transitions of an episode that is done at its last step"""
+    rng = np.random.default_rng(seed)
+
+    def observation():
+        return Observation(
+            rng.random((scale.n_agents, scale.obs_size), dtype=np.float32),
+            np.full((scale.n_agents, N_ACTIONS), True),
+            rng.random(scale.n_agents, dtype=np.float32),
+            rng.random((scale.n_agents, 4), dtype=np.float32),
+        )
+
+    observations = [observation() for _ in range(scale.episode_len + 1)]
+    return [
+        Transition(
+            observations[t],
+            rng.integers(0, N_ACTIONS, scale.n_agents),
+            np.ones(1, dtype=np.float32),
+            t == scale.episode_len - 1,
+            {},
+            observations[t + 1],
+            False,
+        )
+        for t in range(scale.episode_len)
+    ]
+
+
+def add_transitions(transitions: list[Transition]) -> EpisodeBuilder:
+    builder = EpisodeBuilder()
+    for transition in transitions:
+        builder.add(transition)
+    return builder
+
+
+def measure(fn: Callable[[], object], n_repeats: int) -> dict[str, float]:
+    """
+    Time `n_repeats` calls to `fn`, then measure the peak memory allocated during one call with tracemalloc (which is
+    not enabled while timing because it slows down allocations).
+    """
+    durations = np.empty(n_repeats, dtype=np.float64)
+    for i in range(n_repeats):
+        start = time.perf_counter_ns()
+        fn()
+        durations[i] = time.perf_counter_ns() - start
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    durations *= 1e-3
+    return {"time_mean_us": float(durations.mean()), "time_min_us": float(durations.min()), "peak_memory_kib": peak / 1024}
+
+
+def episode_cases(transitions: list[Transition]) -> dict[str, Callable[[], object]]:
+    # Building an episode does not modify the content of the builder, so the same builder can be built repeatedly
+    builder = add_transitions(transitions)
+    episode = builder.build()
+    last = transitions[-1]
+    obs, other_obs = last.obs, last.obs.copy()
+    other_transition = Transition(other_obs, last.action.copy(), last.reward.copy(), last.done, {}, last.obs_.copy(), last.truncated)
+    return {
+        "EpisodeBuilder.add": lambda: add_transitions(transitions),
+        "EpisodeBuilder.build": builder.build,
+        "Episode.padded": lambda: episode.padded(2 * episode.episode_len),
+        "Episode.transitions": lambda: list(episode.transitions()),
+        "Episode.compute_returns": lambda: episode.compute_returns(0.99),
+        "Observation.__hash__": lambda: hash(obs),
+        "Observation.__eq__": lambda: obs == other_obs,
+        "Transition.__hash__": lambda: hash(last),
+        "Transition.__eq__": lambda: last == other_transition,
+    }
+
+
+def run_episode_benchmarks(
+    scales: Iterable[EpisodeScale] = DEFAULT_EPISODE_SCALES,
+    n_repeats: int = 20,
+    name_filter: Optional[str] = None,
+) -> list[BenchmarkResult]:
+    """Run the episode data path benchmarks at each scale."""
+    results = list[BenchmarkResult]()
+    for scale in scales:
+        cases = episode_cases(make_transitions(scale))
+        for name, fn in cases.items():
+            if name_filter is not None and name_filter not in name:
+                continue
+            results.append(BenchmarkResult("episodes", name, asdict(scale), measure(fn, n_repeats)))
+    return results
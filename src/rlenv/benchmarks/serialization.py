@@ -0,0 +1,49 @@
+"""
+Time and peak memory of the serialization of transitions and episodes with `rlenv.models.wire`, compared to pickle.
+"""
+
+import pickle
+from dataclasses import asdict
+from typing import Callable, Iterable, Optional
+
+from rlenv.models import wire
+from .common import BenchmarkResult
+from .episodes import DEFAULT_EPISODE_SCALES, EpisodeScale, add_transitions, make_transitions, measure
+
+
+def serialization_cases(scale: EpisodeScale) -> dict[str, Callable[[], object]]:
+    transitions = make_transitions(scale)
+    transition = transitions[-1]
+    episode = add_transitions(transitions).build()
+    cases = dict[str, Callable[[], object]]()
+    for kind, item in (("Transition", transition), ("Episode", episode)):
+        # A stream encoder only sends the schema with its first message, which the stream decoder then caches
+        encoder, decoder = wire.Encoder(), wire.Decoder()
+        decoder.decode(encoder.encode(item))
+        message = bytes(wire.encode(item))
+        stream_message = bytes(encoder.encode(item))
+        pickled = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        cases |= {
+            f"{kind}/wire.encode": lambda item=item: wire.encode(item),
+            f"{kind}/wire.decode": lambda message=message: wire.decode(message),
+            f"{kind}/Encoder.encode": lambda item=item, encoder=encoder: encoder.encode(item),
+            f"{kind}/Decoder.decode": lambda message=stream_message, decoder=decoder: decoder.decode(message),
+            f"{kind}/pickle.dumps": lambda item=item: pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL),
+            f"{kind}/pickle.loads": lambda pickled=pickled: pickle.loads(pickled),
+        }
+    return cases
+
+
+def run_serialization_benchmarks(
+    scales: Iterable[EpisodeScale] = DEFAULT_EPISODE_SCALES,
+    n_repeats: int = 20,
+    name_filter: Optional[str] = None,
+) -> list[BenchmarkResult]:
+    """Run the serialization benchmarks at each scale."""
+    results = list[BenchmarkResult]()
+    for scale in scales:
+        for name, fn in serialization_cases(scale).items():
+            if name_filter is not None and name_filter not in name:
+                continue
+            results.append(BenchmarkResult("serialization", name, asdict(scale), measure(fn, n_repeats)))
+    return results
@@ -0,0 +1,189 @@
+"""
+Throughput and latency of `step()` for `MockEnv` under every wrapper, common `Builder` chains and the adapters.
+"""
+
+import time
+from dataclasses import asdict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from gymnasium import Env, spaces
+from pettingzoo import ParallelEnv
+
+from rlenv import Builder, MockEnv, RLEnv
+from rlenv import wrappers
+from rlenv.adapters import Gym, PettingZoo
+from .common import BenchmarkResult, Scale, latency_metrics
+
+EnvFactory = Callable[[Scale], Optional[RLEnv]]
+"""Creates the benchmarked environment at the given scale, or returns None if the case does not apply to this scale."""
+
+DEFAULT_SCALES = [Scale(n_agents, obs_size, n_actions) for n_agents in (1, 4, 16) for obs_size in (16, 256) for n_actions in (5, 20)]
+QUICK_SCALES = [Scale(1, 16, 5), Scale(8, 128, 10)]
+MAX_CENTRALISED_ACTIONS = 10_000
+
+
+class _GymEnv(Env):
+    """Minimal gymnasium environment, to measure the overhead of the adapter"""
+
+    def __init__(self, obs_size: int, n_actions: int):
+        self.observation_space = spaces.Box(-1.0, 1.0, (obs_size,), np.float32)
+        self.action_space = spaces.Discrete(n_actions)
+        self._obs = np.zeros(obs_size, dtype=np.float32)
+
+    def reset(self, *, seed=None, options=None):
+        return self._obs, {}
+
+    def step(self, action):
+        return self._obs, 1.0, False, False, {}
+
+
+class _ParallelEnv(ParallelEnv):
+    """Minimal pettingzoo parallel environment, to measure the overhead of the adapter"""
+
+    def __init__(self, n_agents: int, obs_size: int, n_actions: int):
+        self.possible_agents = [f"agent_{i}" for i in range(n_agents)]
+        self.agents = list(self.possible_agents)
+        self._observation_space = spaces.Box(-1.0, 1.0, (obs_size,), np.float32)
+        self._action_space = spaces.Discrete(n_actions)
+        self._obs = np.zeros(obs_size, dtype=np.float32)
+
+    def observation_space(self, agent):
+        return self._observation_space
+
+    def action_space(self, agent):
+        return self._action_space
+
+    def state(self):
+        return np.zeros(1, dtype=np.float32)
+
+    def reset(self, seed=None, options=None):
+        return {agent: self._obs for agent in self.agents}, {agent: {} for agent in self.agents}
+
+    def step(self, actions):
+        agents = self.agents
+        return (
+            {agent: self._obs for agent in agents},
+            {agent: 1.0 for agent in agents},
+            {agent: False for agent in agents},
+            {agent: False for agent in agents},
+            {agent: {} for agent in agents},
+        )
+
+
+def _mock(scale: Scale, **kwargs) -> MockEnv:
+    return MockEnv(scale.n_agents, obs_size=scale.obs_size, n_actions=scale.n_actions, end_game=1_000, **kwargs)
+
+
+def _centralised(scale: Scale):
+    if scale.n_actions**scale.n_agents > MAX_CENTRALISED_ACTIONS:
+        return None
+    return wrappers.Centralised(_mock(scale))
+
+
+def _potential(state: np.ndarray) -> float:
+    return float(state.sum())
+
+
+def wrapper_cases() -> dict[str, EnvFactory]:
+    """One case per wrapper of `rlenv.wrappers`, applied on `MockEnv`"""
+    return {
+        "MockEnv": _mock,
+        "AgentId": lambda s: wrappers.AgentId(_mock(s)),
+        "LastAction": lambda s: wrappers.LastAction(_mock(s)),
+        "TimeLimit": lambda s: wrappers.TimeLimit(_mock(s), 100, add_extra=True),
+        "PadObservations": lambda s: wrappers.PadObservations(_mock(s), 4),
+        "PadExtras": lambda s: wrappers.PadExtras(_mock(s), 4),
+        "TimePenalty": lambda s: wrappers.TimePenalty(_mock(s), 0.1),
+        "AvailableActions": lambda s: wrappers.AvailableActions(_mock(s)),
+        "AvailableActionsMask": lambda s: wrappers.AvailableActionsMask(_mock(s), np.full((s.n_agents, s.n_actions), True)),
+        "Blind": lambda s: wrappers.Blind(_mock(s), 0.5),
+        "Centralised": _centralised,
+        "ActionRepeat": lambda s: wrappers.ActionRepeat(_mock(s), 4),
+        "FrameStack": lambda s: wrappers.FrameStack(_mock(s), 4),
+        "NormalizeObservations": lambda s: wrappers.NormalizeObservations(_mock(s)),
+        "NormalizeRewards": lambda s: wrappers.NormalizeRewards(_mock(s)),
+        "Scalarize": lambda s: wrappers.Scalarize(_mock(s, n_objectives=2), np.array([[0.5, 0.5], [1.0, 0.0]])),
+        "ClipRewards": lambda s: wrappers.ClipRewards(_mock(s), -1.0, 1.0),
+        "ScaleRewards": lambda s: wrappers.ScaleRewards(_mock(s), 0.5),
+        "PotentialShaping": lambda s: wrappers.PotentialShaping(_mock(s), _potential),
+        "CountBonus": lambda s: wrappers.CountBonus(_mock(s), seed=0),
+        "ResetCache": lambda s: wrappers.ResetCache(_mock(s)),
+        # VideoRecorder is not benchmarked: it requires a rendering environment and writes to the disk
+    }
+
+
+def builder_cases() -> dict[str, EnvFactory]:
+    """Common `Builder` chains"""
+    return {
+        "agent_id+time_limit": lambda s: Builder(_mock(s)).agent_id().time_limit(100).build(),
+        "agent_id+last_action+time_limit": lambda s: Builder(_mock(s)).agent_id().last_action().time_limit(100, add_extra=True).build(),
+        "agent_id+last_action+time_limit+reuse_buffers": lambda s: (
+            Builder(_mock(s)).agent_id().last_action().time_limit(100, add_extra=True).reuse_buffers().build()
+        ),
+        "frame_stack+normalize": lambda s: Builder(_mock(s)).frame_stack(4).normalize_observations().normalize_rewards().build(),
+    }
+
+
+def adapter_cases() -> dict[str, EnvFactory]:
+    """The Gym and PettingZoo adapters, on minimal environments such that the measure is dominated by the adapter"""
+    return {
+        "Gym": lambda s: Gym(_GymEnv(s.obs_size, s.n_actions)) if s.n_agents == 1 else None,
+        "Gym-reuse_buffers": lambda s: Builder(Gym(_GymEnv(s.obs_size, s.n_actions))).reuse_buffers().build() if s.n_agents == 1 else None,
+        "PettingZoo": lambda s: PettingZoo(_ParallelEnv(s.n_agents, s.obs_size, s.n_actions)),
+        "PettingZoo-reuse_buffers": lambda s: (
+            Builder(PettingZoo(_ParallelEnv(s.n_agents, s.obs_size, s.n_actions))).reuse_buffers().build()
+        ),
+    }
+
+
+def measure_steps(env: RLEnv, n_steps: int, n_warmup: int = 100, seed: int = 0) -> dict[str, float]:
+    """
+    Time `n_steps` calls to `env.step` with random actions (sampled beforehand), after `n_warmup` untimed steps.
+    The environment is reset when an episode ends, and resets are timed separately.
+    """
+    np.random.seed(seed)
+    actions = [env.action_space.sample() for _ in range(min(n_steps, 1_000))]
+    env.reset()
+    for i in range(n_warmup):
+        _, _, done, truncated, _ = env.step(actions[i % len(actions)])
+        if done or truncated:
+            env.reset()
+    step_durations = np.empty(n_steps, dtype=np.float64)
+    reset_durations = []
+    clock = time.perf_counter_ns
+    for i in range(n_steps):
+        start = clock()
+        _, _, done, truncated, _ = env.step(actions[i % len(actions)])
+        step_durations[i] = clock() - start
+        if done or truncated:
+            start = clock()
+            env.reset()
+            reset_durations.append(clock() - start)
+    step_durations *= 1e-9
+    metrics = {"steps_per_s": n_steps / step_durations.sum(), **latency_metrics(step_durations)}
+    if len(reset_durations) > 0:
+        metrics["reset_mean_us"] = float(np.mean(reset_durations)) * 1e-3
+    return metrics
+
+
+def run_stepping_benchmarks(
+    scales: Iterable[Scale] = DEFAULT_SCALES,
+    n_steps: int = 2_000,
+    cases: Optional[dict[str, EnvFactory]] = None,
+    name_filter: Optional[str] = None,
+) -> list[BenchmarkResult]:
+    """Run the stepping benchmarks (all the wrapper, builder and adapter cases by default) at each scale."""
+    if cases is None:
+        cases = wrapper_cases() | builder_cases() | adapter_cases()
+    results = list[BenchmarkResult]()
+    for scale in scales:
+        for name, factory in cases.items():
+            if name_filter is not None and name_filter not in name:
+                continue
+            env = factory(scale)
+            if env is None:
+                continue
+            metrics = measure_steps(env, n_steps)
+            results.append(BenchmarkResult("stepping", name, asdict(scale), metrics))
+    return results
@@ -1,5 +1,11 @@
-from dataclasses import dataclass
-from typing import Literal, Optional, TypeVar, Generic, overload
+from dataclasses import dataclass, field
+from functools import cached_property, partial, wraps
+from typing import Any, Callable, Iterable, Literal, Optional, TypeVar, Generic, overload
+import hashlib
+import inspect
+import json
+import numpy as np
+import numpy.typing as npt
 
 
 from .models import RLEnv, ActionSpace, DiscreteActionSpace
@@ -56,10 +62,12 @@ def make(env: RLEnv[A]) -> RLEnv[A]:
 
 
 def make(env):
-    """Make an RLEnv from str (Gym) or PettingZoo"""
+    """Make an RLEnv from str (Gym), PettingZoo or an `EnvSpec`"""
     match env:
         case RLEnv():
             return env
+        case EnvSpec():
+            return env.make()
         case str():
             import gymnasium
             from rlenv.adapters import Gym
@@ -85,6 +93,92 @@ def make(env):
     raise ValueError(f"Unknown environment type: {type(env)}")
 
 
+EnvFactory = Callable[[], Any] | str
+"""A picklable callable that creates the base environment (RLEnv, Gym or PettingZoo environment), or a Gym id."""
+
+
+def _canonical(value: Any) -> Any:
+    """
+    JSON-serializable representation of a Builder argument, used to hash an `EnvSpec`.
+
+    Raises a TypeError for values without a representation that is stable across processes (e.g. lambdas, bound
+    methods or environment instances).
+    """
+    match value:
+        case None | bool() | int() | float() | str():
+            return value
+        case np.ndarray() | np.generic():
+            return {"dtype": value.dtype.str, "value": value.tolist()}
+        case list() | tuple():
+            return [_canonical(v) for v in value]
+        case dict():
+            return {str(k): _canonical(v) for k, v in sorted(value.items())}
+        case partial():
+            return {"partial": _canonical(value.func), "args": _canonical(value.args), "kwargs": _canonical(value.keywords)}
+        case EnvSpec():
+            return {"spec": value.content_hash}
+    if (inspect.isfunction(value) or inspect.isclass(value) or inspect.isbuiltin(value)) and "<" not in value.__qualname__:
+        # Module-level functions and classes are identified by their import path
+        return f"{value.__module__}.{value.__qualname__}"
+    raise TypeError(f"{value!r} of type {type(value)} has no stable representation and can not be part of an EnvSpec")
+
+
+Operation = tuple[str, tuple, tuple[tuple[str, Any], ...]]
+"""Name of a `Builder` method, its positional arguments and its keyword arguments as sorted (name, value) pairs"""
+
+
+@dataclass(frozen=True, eq=False)
+class EnvSpec:
+    """
+    Lightweight and picklable description of an environment: the factory of the base environment followed by the ordered
+    `Builder` operations and their arguments. Shipping a spec to a worker is much cheaper than pickling the environment.
+
+    The factory and the arguments of the operations must be picklable (e.g. no lambdas). Two specs are equal (and have
+    the same hash) when their `content_hash` is the same.
+    """
+
+    factory: EnvFactory
+    operations: tuple[Operation, ...] = field(default_factory=tuple)
+
+    def make(self) -> RLEnv[ActionSpace]:
+        """Build the environment described by the spec"""
+        return Builder.from_spec(self).build()
+
+    def __call__(self) -> RLEnv[ActionSpace]:
+        return self.make()
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Hash of the content of the spec, which is stable across processes and can be used as a cache key"""
+        content = json.dumps([_canonical(self.factory), _canonical(self.operations)], separators=(",", ":"))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, EnvSpec):
+            return False
+        return self.content_hash == other.content_hash
+
+    def __hash__(self):
+        return hash(self.content_hash)
+
+
+def _recorded(method):
+    """
+    Records the call in the operations of the builder such that it can be replayed from an `EnvSpec`. The arguments are
+    bound to the signature of the method with their defaults, such that equivalent calls are recorded identically.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self: "Builder", *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        self._operations.append((method.__name__, bound.args[1:], tuple(sorted(bound.kwargs.items()))))
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 @dataclass
 class Builder(Generic[A]):
     """Builder for environments"""
@@ -93,7 +187,38 @@ class Builder(Generic[A]):
 
     def __init__(self, env: RLEnv[A]):
         self._env = env
-
+        self._reuse_buffers: Optional[tuple[int, bool]] = None
+        self._factory: Optional[EnvFactory] = None
+        self._operations = list[Operation]()
+
+    @staticmethod
+    def from_factory(factory: EnvFactory) -> "Builder[ActionSpace]":
+        """Builder whose base environment is created by the factory, such that the builder can produce an `EnvSpec`"""
+        env = make(factory if isinstance(factory, str) else factory())
+        builder = Builder(env)
+        builder._factory = factory
+        return builder
+
+    @staticmethod
+    def from_spec(spec: EnvSpec) -> "Builder[ActionSpace]":
+        """Builder that applies the operations of the spec to a new base environment"""
+        builder = Builder.from_factory(spec.factory)
+        for name, args, kwargs in spec.operations:
+            getattr(builder, name)(*args, **dict(kwargs))
+        return builder
+
+    def spec(self) -> EnvSpec:
+        """The `EnvSpec` that describes this builder"""
+        if self._factory is None:
+            raise ValueError("Only builders created with `Builder.from_factory` or `Builder.from_spec` can produce an EnvSpec")
+        # Fail when the spec is created rather than when it is used as a cache key
+        try:
+            _canonical([self._factory, self._operations])
+        except TypeError as e:
+            raise ValueError(f"This builder can not be described by an EnvSpec: {e}") from e
+        return EnvSpec(self._factory, tuple(self._operations))
+
+    @_recorded
     def time_limit(self, n_steps: int, add_extra: bool = False, truncation_penalty: Optional[float] = None):
         """
         Limits the number of time steps for an episode. When the number of steps is reached, then the episode is truncated.
@@ -108,6 +233,7 @@ class Builder(Generic[A]):
         self._env = wrappers.TimeLimit(self._env, n_steps, add_extra, truncation_penalty)
         return self
 
+    @_recorded
     def pad(self, to_pad: Literal["obs", "extra"], n: int):
         match to_pad:
             case "obs":
@@ -118,21 +244,25 @@ class Builder(Generic[A]):
                 raise ValueError(f"Unknown padding type: {other}")
         return self
 
+    @_recorded
     def agent_id(self):
         """Adds agent ID to the observations"""
         self._env = wrappers.AgentId(self._env)
         return self
 
+    @_recorded
     def last_action(self):
         """Adds the last action to the observations"""
         self._env = wrappers.LastAction(self._env)
         return self
 
+    @_recorded
     def centralised(self):
         """Centralises the observations and actions"""
         self._env = wrappers.Centralised(self._env)
         return self
 
+    @_recorded
     def record(
         self,
         folder: str,
@@ -142,20 +272,108 @@ class Builder(Generic[A]):
         self._env = wrappers.VideoRecorder(self._env, folder, video_encoding=encoding)
         return self
 
+    @_recorded
     def available_actions(self):
         """Adds the available actions to the observations extras"""
         self._env = wrappers.AvailableActions(self._env)
         return self
 
+    @_recorded
     def blind(self, p: float):
         """Blinds the observations with probability p"""
         self._env = wrappers.Blind(self._env, p)
         return self
 
-    def time_penalty(self, penalty: float):
+    @_recorded
+    def action_repeat(self, n_repeats: int, max_pool: bool = False):
+        """
+        Repeats each joint action `n_repeats` times and sums the rewards.
+
+        Only the last observation is returned, so the wrappers added after this one only process one observation per action.
+        """
+        self._env = wrappers.ActionRepeat(self._env, n_repeats, max_pool)
+        return self
+
+    @_recorded
+    def frame_stack(self, n_frames: int):
+        """Stacks the last `n_frames` observations along the first dimension of the observation data"""
+        self._env = wrappers.FrameStack(self._env, n_frames)
+        return self
+
+    @_recorded
+    def normalize_observations(self, normalize_extras: bool = False, clip: Optional[float] = None):
+        """Normalizes the observations (and optionally the extras) with running statistics"""
+        self._env = wrappers.NormalizeObservations(self._env, normalize_extras, clip)
+        return self
+
+    @_recorded
+    def normalize_rewards(self, gamma: float = 0.99, clip: Optional[float] = None):
+        """Scales the rewards by the running standard deviation of the discounted returns"""
+        self._env = wrappers.NormalizeRewards(self._env, gamma, clip)
+        return self
+
+    @_recorded
+    def scalarize(self, weights: npt.ArrayLike, labels: Optional[list[str]] = None):
+        """Scalarizes the multi-objective rewards with a [W, n_objectives] weight matrix"""
+        self._env = wrappers.Scalarize(self._env, weights, labels)
+        return self
+
+    @_recorded
+    def count_bonus(
+        self, beta: float = 0.01, n_bits: int = 32, joint: bool = False, max_entries: int = 1_000_000, seed: Optional[int] = None
+    ):
+        """Adds a count-based exploration bonus `beta / sqrt(n)` to the rewards, where states are counted with SimHash"""
+        self._env = wrappers.CountBonus(self._env, beta, n_bits, joint, max_entries, seed)
+        return self
+
+    @_recorded
+    def time_penalty(self, penalty: float | npt.ArrayLike):
+        """Subtracts a penalty from the reward (of each objective) at every time step"""
         self._env = wrappers.TimePenalty(self._env, penalty)
         return self
 
+    @_recorded
+    def clip_rewards(self, low: float | npt.ArrayLike, high: float | npt.ArrayLike):
+        """Clips the reward of each objective in [low, high]"""
+        self._env = wrappers.ClipRewards(self._env, low, high)
+        return self
+
+    @_recorded
+    def scale_rewards(self, scale: float | npt.ArrayLike):
+        """Multiplies the reward of each objective by its scale factor"""
+        self._env = wrappers.ScaleRewards(self._env, scale)
+        return self
+
+    @_recorded
+    def potential_shaping(self, potential: Callable[[npt.NDArray[np.float32]], float | npt.NDArray[np.float32]], gamma: float = 0.99):
+        """Adds the potential-based shaping term `gamma * potential(s') - potential(s)` to the rewards"""
+        self._env = wrappers.PotentialShaping(self._env, potential, gamma)
+        return self
+
+    @_recorded
+    def reset_cache(
+        self,
+        pool_size: int = 16,
+        max_uses: int = 1,
+        seeds: Optional[Iterable[int]] = None,
+        generator: Optional[RLEnv[A]] = None,
+        background: bool = False,
+    ):
+        """Serves `reset()` from a pool of initial states captured with `snapshot()`, optionally refilled in the background"""
+        self._env = wrappers.ResetCache(self._env, pool_size, max_uses, seeds, generator, background)
+        return self
+
+    @_recorded
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        """
+        Write the observations of the whole wrapper stack in rings of `size` preallocated buffers instead of allocating
+        new arrays at every step. The caller must `copy()` the observations it wants to keep for more than `size` steps.
+        """
+        self._reuse_buffers = (size, debug)
+        return self
+
     def build(self) -> RLEnv[A]:
         """Build and return the environment"""
+        if self._reuse_buffers is not None:
+            self._env.reuse_buffers(*self._reuse_buffers)
         return self._env
@@ -1,5 +1,8 @@
+import weakref
+from typing import Optional
 import numpy as np
 from rlenv import RLEnv, Observation, DiscreteActionSpace, DiscreteSpace
+from rlenv.models import ObservationRing
 
 
 class MockEnv(RLEnv[DiscreteActionSpace]):
@@ -13,6 +16,7 @@ class MockEnv(RLEnv[DiscreteActionSpace]):
         reward_step: int = 1,
         agent_state_size: int = 1,
         extras_size: int = 0,
+        lazy: bool = False,
     ) -> None:
         super().__init__(
             DiscreteActionSpace(n_agents, n_actions),
@@ -28,23 +32,79 @@ class MockEnv(RLEnv[DiscreteActionSpace]):
         self.reward_step = reward_step
         self.t = 0
         self.actions_history = []
+        self.lazy = lazy
+        self._last_obs: Optional[weakref.ref[Observation]] = None
+        self._ring = None
 
     @property
     def agent_state_size(self):
         return self._agent_state_size
 
     def reset(self):
+        self._release_last_observation()
         self.t = 0
         return self.observation()
 
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        self._ring = ObservationRing(
+            self.n_agents,
+            self.n_actions,
+            self.observation_shape,
+            self.state_shape,
+            self.extra_feature_shape,
+            size,
+            debug,
+        )
+        self._obs_offsets = np.arange(self.obs_size, dtype=np.float32) + np.arange(self.n_agents, dtype=np.float32)[:, None]
+        self._extras = np.arange(self.n_agents * self.extra_size, dtype=np.float32).reshape((self.n_agents, self.extra_size))
+
     def observation(self):
+        if self._ring is not None:
+            return self._buffered_observation()
         obs_data = np.array(
             [np.arange(self.t + agent, self.t + agent + self.obs_size) for agent in range(self.n_agents)],
             dtype=np.float32,
         )
         extras = np.arange(self.n_agents * self.extra_size, dtype=np.float32).reshape((self.n_agents, self.extra_size))
+        if self.lazy:
+            obs = Observation(obs_data, self.available_actions, self.get_state, extras)
+            self._last_obs = weakref.ref(obs)
+            return obs
         return Observation(obs_data, self.available_actions(), self.get_state(), extras)
 
+    def _buffered_observation(self):
+        assert self._ring is not None
+        obs = self._ring.next()
+        np.add(self._obs_offsets, self.t, out=obs.data)
+        obs.extras[:] = self._extras
+        if self.lazy:
+            obs.available_actions = self.available_actions
+            obs.state = self.get_state
+            self._last_obs = weakref.ref(obs)
+        else:
+            np.copyto(obs.available_actions, self.available_actions())
+            np.copyto(obs.state, self.get_state())
+        return obs
+
+    def _release_last_observation(self):
+        # The last lazy observation is only resolved if the caller kept it. Reused buffers are expired instead, since the
+        # caller must copy them (which resolves them) to keep them.
+        obs = self._last_obs() if self._last_obs is not None else None
+        if obs is not None:
+            if self._ring is None:
+                obs.resolve()
+            else:
+                obs.expire()
+        self._last_obs = None
+
+    def snapshot(self):
+        return self.t, list(self.actions_history)
+
+    def restore(self, snapshot):
+        self._release_last_observation()
+        self.t, actions_history = snapshot
+        self.actions_history = list(actions_history)
+
     def get_state(self):
         return np.full((self.n_agents * self.agent_state_size,), self.t, dtype=np.float32)
 
@@ -52,6 +112,7 @@ class MockEnv(RLEnv[DiscreteActionSpace]):
         return
 
     def step(self, action):
+        self._release_last_observation()
         self.t += 1
         self.actions_history.append(action)
         return (
@@ -1,8 +1,17 @@
 from .spaces import ActionSpace, DiscreteSpace, ContinuousSpace, MultiDiscreteSpace, DiscreteActionSpace, ContinuousActionSpace
 from .observation import Observation
 from .rl_env import RLEnv
+from .async_env import AsyncRLEnv, ThreadedAsyncEnv, gather_reset, gather_step
 from .transition import Transition
 from .episode import Episode, EpisodeBuilder
+from .batch_episode_builder import BatchEpisodeBuilder
+from .buffers import BufferRing, ObservationRing
+from .running_stats import RunningMeanStd
+from .scalarization import LinearScalarization
+from .quantile_sketch import QuantileSketch
+from .episode_statistics import EpisodeStatistics, StatisticsWriter
+from . import wire
+from .hooks import ResetEvent, StepEvent, EpisodeEndEvent, Subscription
 
 
 __all__ = [
@@ -11,10 +20,27 @@ __all__ = [
     "ContinuousSpace",
     "Observation",
     "RLEnv",
+    "AsyncRLEnv",
+    "ThreadedAsyncEnv",
+    "gather_reset",
+    "gather_step",
     "Transition",
     "Episode",
     "EpisodeBuilder",
+    "BatchEpisodeBuilder",
     "MultiDiscreteSpace",
     "DiscreteActionSpace",
     "ContinuousActionSpace",
+    "BufferRing",
+    "ObservationRing",
+    "RunningMeanStd",
+    "LinearScalarization",
+    "QuantileSketch",
+    "EpisodeStatistics",
+    "StatisticsWriter",
+    "wire",
+    "ResetEvent",
+    "StepEvent",
+    "EpisodeEndEvent",
+    "Subscription",
 ]
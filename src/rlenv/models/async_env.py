@@ -0,0 +1,112 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, Sequence, TypeVar
+import numpy as np
+import numpy.typing as npt
+
+from .observation import Observation
+from .rl_env import RLEnv
+from .spaces import ActionSpace, DiscreteSpace
+
+A = TypeVar("A", bound=ActionSpace)
+
+Step = tuple[Observation, npt.NDArray[np.float32], bool, bool, dict[str, Any]]
+
+
+@dataclass
+class AsyncRLEnv(ABC, Generic[A]):
+    """
+    Asynchronous counterpart of `RLEnv`, for environments whose `reset` and `step` mostly wait for I/O (remote
+    simulators, sockets, ...). Many such environments can be stepped concurrently in a single event loop.
+    """
+
+    action_space: A
+    observation_shape: tuple[int, ...]
+    state_shape: tuple[int, ...]
+    extra_feature_shape: tuple[int, ...]
+    reward_space: DiscreteSpace
+    n_agents: int
+    n_actions: int
+    name: str
+
+    def __init__(
+        self,
+        action_space: A,
+        observation_shape: tuple[int, ...],
+        state_shape: tuple[int, ...],
+        extra_feature_shape: tuple[int, ...] = (0,),
+        reward_space: Optional[DiscreteSpace] = None,
+    ):
+        self.name = self.__class__.__name__
+        self.action_space = action_space
+        self.n_actions = action_space.n_actions
+        self.n_agents = action_space.n_agents
+        self.observation_shape = observation_shape
+        self.state_shape = state_shape
+        self.extra_feature_shape = extra_feature_shape
+        self.reward_space = reward_space or DiscreteSpace(1, ["default"])
+
+    @abstractmethod
+    async def reset(self) -> Observation:
+        """Reset the environment."""
+
+    @abstractmethod
+    async def step(self, actions: npt.ArrayLike) -> Step:
+        """Perform a step in the environment. See `RLEnv.step`."""
+
+    @abstractmethod
+    async def get_state(self) -> npt.NDArray[np.float32]:
+        """Retrieve the current state of the environment."""
+
+    async def available_actions(self) -> npt.NDArray[np.bool_]:
+        """Get the currently available actions for each agent."""
+        return np.full((self.n_agents, self.n_actions), True, dtype=bool)
+
+    async def close(self):
+        """Release the resources of the environment"""
+
+
+class ThreadedAsyncEnv(AsyncRLEnv[A]):
+    """
+    Lifts a synchronous `RLEnv` to an `AsyncRLEnv` by running its methods in a thread pool.
+
+    Calls to a given environment are never concurrent since each call is awaited before the next one. By default, the
+    default executor of the event loop is used, whose number of threads bounds the number of concurrent calls: give a
+    larger `executor` (shared by all the environments) to step many environments at once.
+    """
+
+    env: RLEnv[A]
+
+    def __init__(self, env: RLEnv[A], executor: Optional[Executor] = None):
+        super().__init__(env.action_space, env.observation_shape, env.state_shape, env.extra_feature_shape, env.reward_space)
+        self.env = env
+        self.name = env.name
+        self._executor = executor
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def reset(self) -> Observation:
+        return await self._run(self.env.reset)
+
+    async def step(self, actions: npt.ArrayLike) -> Step:
+        return await self._run(self.env.step, actions)
+
+    async def get_state(self) -> npt.NDArray[np.float32]:
+        return await self._run(self.env.get_state)
+
+    async def available_actions(self) -> npt.NDArray[np.bool_]:
+        return await self._run(self.env.available_actions)
+
+
+async def gather_reset(envs: Sequence[AsyncRLEnv]) -> list[Observation]:
+    """Reset all the environments concurrently"""
+    return await asyncio.gather(*(env.reset() for env in envs))
+
+
+async def gather_step(envs: Sequence[AsyncRLEnv], actions: Sequence[npt.ArrayLike]) -> list[Step]:
+    """Step all the environments concurrently, each with its own actions, and return the results in the same order"""
+    assert len(envs) == len(actions), "There must be one action per environment"
+    return await asyncio.gather(*(env.step(action) for env, action in zip(envs, actions)))
@@ -0,0 +1,124 @@
+from typing import Any, Optional
+import numpy as np
+import numpy.typing as npt
+
+from .episode import Episode
+from .observation import Observation
+
+
+class BatchEpisodeBuilder:
+    """
+    Builds the episodes of N environments that are stepped together (e.g. vectorized environments).
+
+    At each step, the observations, actions, rewards, ... of all the environments are given as stacked arrays with a
+    leading dimension of size N and written in one vectorized operation. The episodes are returned as soon as their
+    environment is done or truncated, without copying the data of the other environments.
+    """
+
+    def __init__(self, n_envs: int, initial_capacity: int = 64):
+        self.n_envs = n_envs
+        self.capacity = initial_capacity
+        self.t = np.zeros(n_envs, dtype=np.int64)
+        """The current time step of each environment"""
+        self._arrays = dict[str, np.ndarray]()
+        self._all_envs = np.arange(n_envs)
+        self._has_probs = False
+        self._has_alive = False
+
+    def add(
+        self,
+        obs: Observation,
+        actions: npt.ArrayLike,
+        rewards: npt.ArrayLike,
+        dones: npt.ArrayLike,
+        truncated: npt.ArrayLike,
+        next_obs: Observation,
+        infos: Optional[list[dict[str, Any]]] = None,
+        action_probs: Optional[npt.ArrayLike] = None,
+    ) -> dict[int, Episode]:
+        """
+        Add one step of every environment.
+
+        The fields of the observations have shape [N, ...]. Only the next observations of the environments that are done
+        or truncated are stored since the others are the observations of the next step.
+
+        Returns the episodes that are finished, indexed by environment.
+        """
+        if int(self.t.max()) + 1 >= self.capacity:
+            self._grow()
+        envs, t = self._all_envs, self.t
+        self._write_observation(obs, envs, t)
+        actions = np.asarray(actions)
+        self._write("actions", actions, envs, t, actions.dtype)
+        self._write("rewards", rewards, envs, t)
+        if action_probs is not None:
+            self._write("probs", action_probs, envs, t)
+            self._has_probs = True
+        self.t += 1
+
+        dones = np.asarray(dones, dtype=np.bool_)
+        finished = np.flatnonzero(dones | np.asarray(truncated, dtype=np.bool_))
+        if len(finished) == 0:
+            return {}
+        self._write_observation(next_obs, finished, self.t[finished], finished)
+        episodes = dict[int, Episode]()
+        for env in finished.tolist():
+            info = infos[env] if infos is not None else {}
+            episodes[env] = self._build(env, bool(dones[env]), info)
+            self.t[env] = 0
+        return episodes
+
+    def _build(self, env: int, is_done: bool, info: dict[str, Any]) -> Episode:
+        length = int(self.t[env])
+        rewards = self._arrays["rewards"][env, :length].copy()
+        metrics = {key: int(value) if isinstance(value, bool) else value for key, value in info.items()}
+        metrics["score"] = float(np.sum(rewards))
+        metrics["episode_length"] = length
+        return Episode(
+            _observations=self._arrays["data"][env, : length + 1].copy(),
+            _extras=self._arrays["extras"][env, : length + 1].copy(),
+            actions=self._arrays["actions"][env, :length].copy(),
+            rewards=rewards,
+            _available_actions=self._arrays["available_actions"][env, : length + 1].copy(),
+            _states=self._arrays["states"][env, : length + 1].copy(),
+            actions_probs=self._arrays["probs"][env, :length].copy() if self._has_probs else None,
+            alive_masks=self._arrays["alive"][env, : length + 1].copy() if self._has_alive else None,
+            metrics=metrics,
+            episode_len=length,
+            is_done=is_done,
+        )
+
+    def _write_observation(self, obs: Observation, envs: np.ndarray, t: np.ndarray, rows: Optional[np.ndarray] = None):
+        """Write the rows (all by default) of the stacked observation at time steps `t` of the environments `envs`"""
+        self._write("data", obs.data, envs, t, rows=rows)
+        self._write("extras", obs.extras, envs, t, rows=rows)
+        self._write("available_actions", obs.available_actions, envs, t, np.bool_, rows)
+        self._write("states", obs.state, envs, t, rows=rows)
+        if obs.alive is not None:
+            self._write("alive", obs.alive, envs, t, np.bool_, rows)
+            self._has_alive = True
+
+    def _write(
+        self,
+        key: str,
+        values: npt.ArrayLike,
+        envs: np.ndarray,
+        t: np.ndarray,
+        dtype: npt.DTypeLike = np.float32,
+        rows: Optional[np.ndarray] = None,
+    ):
+        values = np.asarray(values)
+        array = self._arrays.get(key)
+        if array is None:
+            array = np.empty((self.n_envs, self.capacity + 1, *values.shape[1:]), dtype=dtype)
+            self._arrays[key] = array
+        if rows is not None:
+            values = values[rows]
+        array[envs, t] = values
+
+    def _grow(self):
+        self.capacity *= 2
+        for key, array in self._arrays.items():
+            grown = np.empty((self.n_envs, self.capacity + 1, *array.shape[2:]), dtype=array.dtype)
+            grown[:, : array.shape[1]] = array
+            self._arrays[key] = grown
@@ -0,0 +1,133 @@
+import numpy as np
+import numpy.typing as npt
+
+from .observation import Observation
+
+
+class BufferRing:
+    """Ring of preallocated arrays that all have the same shape and dtype."""
+
+    def __init__(self, shape: tuple[int, ...], dtype: npt.DTypeLike = np.float32, size: int = 2):
+        assert size >= 1, "The ring must contain at least one buffer"
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self._buffers = list(np.zeros((size, *shape), dtype=dtype))
+        self._index = -1
+
+    @property
+    def size(self) -> int:
+        return len(self._buffers)
+
+    def next(self) -> np.ndarray:
+        """The next buffer of the ring. Its content is the one written `size` calls ago."""
+        self._index = (self._index + 1) % len(self._buffers)
+        return self._buffers[self._index]
+
+
+class ObservationRing:
+    """
+    Ring of preallocated observations.
+
+    The environment writes each new observation in the next buffer of the ring instead of allocating new arrays. The
+    observation returned by `next()` is therefore overwritten `size` calls later and callers must `copy()` anything
+    they want to keep for longer.
+
+    In debug mode, a new `Observation` object is handed out at every call (the arrays are still reused) and reading
+    any field of an observation whose buffer has been recycled raises a `ValueError`.
+    """
+
+    def __init__(
+        self,
+        n_agents: int,
+        n_actions: int,
+        observation_shape: tuple[int, ...],
+        state_shape: tuple[int, ...],
+        extras_shape: tuple[int, ...],
+        size: int = 2,
+        debug: bool = False,
+    ):
+        self.debug = debug
+        self._data = BufferRing((n_agents, *observation_shape), np.float32, size)
+        self._available_actions = BufferRing((n_agents, n_actions), np.bool_, size)
+        self._state = BufferRing(state_shape, np.float32, size)
+        self._extras = BufferRing((n_agents, *extras_shape), np.float32, size)
+        self._observations = [
+            Observation(self._data.next(), self._available_actions.next(), self._state.next(), self._extras.next()) for _ in range(size)
+        ]
+        self._generations = [0] * size
+        self._index = -1
+
+    @property
+    def size(self) -> int:
+        return len(self._observations)
+
+    def next(self) -> Observation:
+        """The next observation of the ring, whose fields point to the preallocated arrays."""
+        self._index = (self._index + 1) % len(self._observations)
+        data = self._data.next()
+        available_actions = self._available_actions.next()
+        state = self._state.next()
+        extras = self._extras.next()
+        if self.debug:
+            self._generations[self._index] += 1
+            return _TrackedObservation(self, self._index, data, available_actions, state, extras)
+        obs = self._observations[self._index]
+        # Wrappers may have replaced the fields of the observation, so we set them back to the ring buffers
+        obs.data = data
+        obs.available_actions = available_actions
+        obs.state = state
+        obs.extras = extras
+        return obs
+
+    def is_stale(self, obs: "_TrackedObservation") -> bool:
+        return self._generations[obs._slot] != obs._generation
+
+
+class _TrackedObservation(Observation):
+    """Observation handed out by an `ObservationRing` in debug mode, which detects reads after its buffer was recycled."""
+
+    def __init__(self, ring: ObservationRing, slot: int, data, available_actions, state, extras):
+        self._ring = ring
+        self._slot = slot
+        self._generation = ring._generations[slot]
+        super().__init__(data, available_actions, state, extras)
+
+    def _check(self):
+        if self._ring.is_stale(self):
+            raise ValueError("Stale observation: its buffer has been reused by the environment. Use `Observation.copy()` to keep it.")
+
+    @property
+    def data(self):
+        self._check()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def extras(self):
+        self._check()
+        return self._extras
+
+    @extras.setter
+    def extras(self, value):
+        self._extras = value
+
+    @property
+    def state(self):
+        self._check()
+        return Observation.state.fget(self)  # type: ignore
+
+    @state.setter
+    def state(self, value):
+        Observation.state.fset(self, value)  # type: ignore
+
+    @property
+    def available_actions(self):
+        self._check()
+        return Observation.available_actions.fget(self)  # type: ignore
+
+    @available_actions.setter
+    def available_actions(self, value):
+        Observation.available_actions.fset(self, value)  # type: ignore
@@ -23,6 +23,8 @@ class Episode:
     episode_len: int
     is_done: bool
     """Whether the episode did reach a terminal state (different from truncated)"""
+    alive_masks: Optional[npt.NDArray[np.bool_]] = None
+    """Which agents are alive at each time step (shape [episode_len + 1, n_agents]), if the environment provides it"""
 
     def padded(self, target_len: int) -> "Episode":
         """Copy of the episode, padded with zeros to the target length"""
@@ -40,6 +42,9 @@ class Episode:
         rewards = np.concatenate([self.rewards, np.zeros(rewards_padding_shape, dtype=np.float32)])
         availables = np.concatenate([self._available_actions, np.full((padding_size, self.n_agents, self.n_actions), True)])
         states = np.concatenate([self._states, np.zeros((padding_size, *self._states.shape[1:]), dtype=np.float32)])
+        alive_masks = None
+        if self.alive_masks is not None:
+            alive_masks = np.concatenate([self.alive_masks, np.full((padding_size, self.n_agents), False)])
         return Episode(
             _observations=obs,
             actions=actions,
@@ -51,6 +56,7 @@ class Episode:
             _extras=extras,
             actions_probs=None,
             is_done=self.is_done,
+            alive_masks=alive_masks,
         )
 
     @cached_property
@@ -172,6 +178,7 @@ class EpisodeBuilder:
         self.available_actions = list[np.ndarray]()
         self.states = list[np.ndarray]()
         self.action_probs = list[np.ndarray]()
+        self.alive_masks = list[np.ndarray]()
         self.episode_len = 0
         self.metrics = {}
         self._done = False
@@ -188,6 +195,8 @@ class EpisodeBuilder:
 
     def add(self, transition: Transition):
         """Add a transition to the episode"""
+        # The next observation is the observation of the next transition: resolve it before the environment steps again
+        transition.obs_.resolve()
         self.episode_len += 1
         self.observations.append(transition.obs.data)
         self.extras.append(transition.obs.extras)
@@ -197,6 +206,8 @@ class EpisodeBuilder:
         self.states.append(transition.obs.state)
         if transition.probs is not None:
             self.action_probs.append(transition.probs)
+        if transition.obs.alive is not None:
+            self.alive_masks.append(transition.obs.alive)
         if transition.is_terminal:
             # Only set the truncated flag if the episode is not done (both could happen with a time limit)
             self._truncated = transition.truncated
@@ -210,6 +221,8 @@ class EpisodeBuilder:
             self.extras.append(transition.obs_.extras)
             self.available_actions.append(transition.obs_.available_actions)
             self.states.append(transition.obs_.state)
+            if transition.obs_.alive is not None:
+                self.alive_masks.append(transition.obs_.alive)
 
     def build(self, extra_metrics: Optional[dict[str, float]] = None) -> Episode:
         """Build the Episode"""
@@ -223,6 +236,9 @@ class EpisodeBuilder:
         action_probs = None
         if len(self.action_probs) > 0:
             action_probs = np.array(self.action_probs, dtype=np.float32)
+        alive_masks = None
+        if len(self.alive_masks) > 0:
+            alive_masks = np.array(self.alive_masks, dtype=np.bool_)
         return Episode(
             _observations=np.array(self.observations, dtype=np.float32),
             _extras=np.array(self.extras, dtype=np.float32),
@@ -234,6 +250,7 @@ class EpisodeBuilder:
             _available_actions=np.array(self.available_actions),
             actions_probs=action_probs,
             is_done=self._done,
+            alive_masks=alive_masks,
         )
 
     def __len__(self) -> int:
@@ -0,0 +1,177 @@
+import csv
+import json
+import math
+import time
+from numbers import Real
+from typing import Any, Iterable, Literal, Optional
+
+import numpy as np
+
+from .episode import Episode
+from .quantile_sketch import QuantileSketch
+from .running_stats import RunningMeanStd
+
+
+class StatisticsWriter:
+    """
+    Appends summaries of `EpisodeStatistics` to a JSONL file (one summary per line) or to a CSV file (one row per metric
+    and per summary). The file is buffered and only written to the disk when the buffer is full or on `flush()`.
+    """
+
+    COLUMNS = ["time", "n_episodes", "metric", "count", "mean", "std", "min", "max"]
+
+    def __init__(self, path: str, format: Optional[Literal["jsonl", "csv"]] = None, buffer_size: int = 64 * 1024):
+        if format is None:
+            format = "csv" if path.endswith(".csv") else "jsonl"
+        self.path = path
+        self.format = format
+        self._file = open(path, "a", buffering=buffer_size, newline="")
+        self._csv = csv.writer(self._file) if format == "csv" else None
+        self._header_written = self._file.tell() > 0
+
+    def write(self, n_episodes: int, summary: dict[str, dict[str, float]]):
+        timestamp = time.time()
+        if self._csv is None:
+            self._file.write(json.dumps({"time": timestamp, "n_episodes": n_episodes, "metrics": summary}) + "\n")
+            return
+        quantiles = sorted({key for stats in summary.values() for key in stats if key.startswith("p")})
+        if not self._header_written:
+            self._csv.writerow(self.COLUMNS + quantiles)
+            self._header_written = True
+        for metric, stats in summary.items():
+            self._csv.writerow(
+                [timestamp, n_episodes, metric, *(stats.get(c) for c in self.COLUMNS[3:]), *(stats.get(q) for q in quantiles)]
+            )
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class EpisodeStatistics:
+    """
+    Streaming statistics of the metrics of episodes (`Episode.metrics`), in bounded memory.
+
+    For each metric, the count, mean, variance, min and max are computed exactly and the quantiles are estimated with a
+    `QuantileSketch`. Statistics computed by different workers can be merged with `merge`, e.g. after being exported
+    with `to_dict`.
+
+    If a `writer` is given, a summary of the statistics is written every `flush_every` episodes. With `reset_on_flush`,
+    the statistics are reset after each summary, such that each summary covers a window of `flush_every` episodes.
+    """
+
+    def __init__(
+        self,
+        quantiles: tuple[float, ...] = (0.5, 0.9, 0.99),
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        writer: Optional[StatisticsWriter] = None,
+        flush_every: Optional[int] = None,
+        reset_on_flush: bool = False,
+    ):
+        assert flush_every is None or writer is not None, "A writer is required to flush the statistics"
+        self.quantiles = quantiles
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.writer = writer
+        self.flush_every = flush_every
+        self.reset_on_flush = reset_on_flush
+        self.n_episodes = 0
+        self._moments = dict[str, RunningMeanStd]()
+        self._sketches = dict[str, QuantileSketch]()
+        self._since_flush = 0
+
+    def add(self, metrics: dict[str, Any] | Episode):
+        """Add the metrics of one episode. Non-numeric values are ignored."""
+        self.add_batch([metrics])
+
+    def add_batch(self, batch: Iterable[dict[str, Any] | Episode]):
+        """Add the metrics of several episodes, with one vectorized update per metric."""
+        values = dict[str, list[float]]()
+        n_episodes = 0
+        for metrics in batch:
+            if isinstance(metrics, Episode):
+                metrics = metrics.metrics
+            n_episodes += 1
+            for key, value in metrics.items():
+                if isinstance(value, Real):
+                    values.setdefault(key, []).append(float(value))
+        for key, key_values in values.items():
+            array = np.array(key_values, dtype=np.float64)
+            moments, sketch = self._stats(key)
+            moments.update(array)
+            sketch.add(array)
+        self.n_episodes += n_episodes
+        self._since_flush += n_episodes
+        if self.flush_every is not None and self._since_flush >= self.flush_every:
+            self.flush()
+
+    def _stats(self, key: str) -> tuple[RunningMeanStd, QuantileSketch]:
+        moments = self._moments.get(key)
+        if moments is None:
+            moments = RunningMeanStd()
+            self._moments[key] = moments
+            self._sketches[key] = QuantileSketch(self.relative_accuracy, self.max_buckets)
+        return moments, self._sketches[key]
+
+    def merge(self, other: "EpisodeStatistics"):
+        """Merge the statistics of `other` into this instance."""
+        for key, moments in other._moments.items():
+            own_moments, sketch = self._stats(key)
+            own_moments.merge(moments)
+            sketch.merge(other._sketches[key])
+        self.n_episodes += other.n_episodes
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Count, mean, std, min, max and quantiles (`p50`, `p90`, ...) of each metric"""
+        summary = {}
+        for key, moments in self._moments.items():
+            sketch = self._sketches[key]
+            stats = {
+                "count": moments.count,
+                "mean": float(moments.mean),
+                "std": math.sqrt(float(moments.var)),
+                "min": sketch.min,
+                "max": sketch.max,
+            }
+            for q in self.quantiles:
+                stats[f"p{100 * q:g}"] = sketch.quantile(q)
+            summary[key] = stats
+        return summary
+
+    def flush(self):
+        """Write a summary of the statistics with the writer and flush the writer"""
+        if self.writer is None:
+            return
+        self.writer.write(self.n_episodes, self.summary())
+        self.writer.flush()
+        self._since_flush = 0
+        if self.reset_on_flush:
+            self.reset()
+
+    def reset(self):
+        self.n_episodes = 0
+        self._moments.clear()
+        self._sketches.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export the statistics to a JSON-serializable dictionary, e.g. to send them to another process."""
+        return {
+            "n_episodes": self.n_episodes,
+            "quantiles": list(self.quantiles),
+            "metrics": {key: {"moments": self._moments[key].to_dict(), "sketch": self._sketches[key].to_dict()} for key in self._moments},
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "EpisodeStatistics":
+        stats = EpisodeStatistics(tuple(data["quantiles"]))
+        stats.n_episodes = data["n_episodes"]
+        for key, metric in data["metrics"].items():
+            stats._moments[key] = RunningMeanStd.from_dict(metric["moments"])
+            sketch = QuantileSketch.from_dict(metric["sketch"])
+            stats._sketches[key] = sketch
+            stats.relative_accuracy = sketch.relative_accuracy
+            stats.max_buckets = sketch.max_buckets
+        return stats
@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .observation import Observation
+
+if TYPE_CHECKING:
+    from .rl_env import RLEnv
+
+EventName = Literal["reset", "step", "episode_end"]
+
+
+@dataclass
+class ResetEvent:
+    obs: Observation
+
+
+@dataclass
+class StepEvent:
+    actions: npt.ArrayLike
+    obs: Observation
+    reward: npt.NDArray[np.float32]
+    done: bool
+    truncated: bool
+    info: dict[str, Any]
+
+
+@dataclass
+class EpisodeEndEvent:
+    episode_length: int
+    score: npt.NDArray[np.float64]
+    """The sum of the rewards of the episode (one value per objective)"""
+    done: bool
+    truncated: bool
+    info: dict[str, Any]
+
+
+class _Instrumentation:
+    """The functions installed around a method of an environment, from the innermost to the outermost"""
+
+    def __init__(self, original: Optional[Callable]):
+        self.original = original
+        """The instance attribute that was in place before the instrumentation, if any"""
+        self.layers = list[tuple[object, Callable[[Callable], Callable]]]()
+
+
+def instrument(env: "RLEnv", name: str, owner: object, factory: Callable[[Callable], Callable]):
+    """
+    Replace the method `name` of `env` by `factory(method)`, as an instance attribute.
+
+    Several owners (e.g. the event hooks and a profiler) can instrument the same method: their functions are chained in
+    the order of installation, and `uninstrument` removes the function of one owner wherever it is in the chain.
+    """
+    instrumentations: dict[str, _Instrumentation] = env.__dict__.setdefault("_instrumentation", {})
+    if name not in instrumentations:
+        instrumentations[name] = _Instrumentation(env.__dict__.get(name))
+    instrumentations[name].layers.append((owner, factory))
+    _install(env, name)
+
+
+def uninstrument(env: "RLEnv", name: str, owner: object):
+    """Remove the function that `owner` installed around the method `name` of `env`"""
+    instrumentations: dict[str, _Instrumentation] = env.__dict__.get("_instrumentation", {})
+    instrumentation = instrumentations.get(name)
+    if instrumentation is None:
+        return
+    instrumentation.layers = [(o, factory) for o, factory in instrumentation.layers if o is not owner]
+    _install(env, name)
+
+
+def _install(env: "RLEnv", name: str):
+    """Chain the functions of the instrumentation of `name` from its original method, or restore the original method"""
+    instrumentations: dict[str, _Instrumentation] = env.__dict__["_instrumentation"]
+    instrumentation = instrumentations[name]
+    if len(instrumentation.layers) == 0:
+        if instrumentation.original is None:
+            env.__dict__.pop(name, None)
+        else:
+            env.__dict__[name] = instrumentation.original
+        del instrumentations[name]
+        if len(instrumentations) == 0:
+            del env.__dict__["_instrumentation"]
+        return
+    method = instrumentation.original or getattr(type(env), name).__get__(env)
+    for _, factory in instrumentation.layers:
+        method = factory(method)
+    env.__dict__[name] = method
+
+
+class Subscription:
+    """
+    Subscription of a callback to the events of an environment.
+
+    Without `batch_size`, the callback is called with each event. Otherwise, the events are accumulated and the callback
+    is called with a list of `batch_size` events (or fewer when the subscription is flushed).
+    """
+
+    def __init__(self, hooks: "EnvHooks", event: EventName, callback: Callable[[Any], Any], batch_size: Optional[int]):
+        assert batch_size is None or batch_size >= 1, "The batch size must be at least 1"
+        self.event = event
+        self.callback = callback
+        self.batch_size = batch_size
+        self._hooks = hooks
+        self._batch = []
+
+    def _emit(self, event):
+        if self.batch_size is None:
+            self.callback(event)
+            return
+        self._batch.append(event)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Deliver the pending events of the batch"""
+        if len(self._batch) > 0:
+            batch = self._batch
+            self._batch = []
+            self.callback(batch)
+
+    def unsubscribe(self):
+        """Flush the pending events and stop receiving new ones"""
+        self.flush()
+        self._hooks.remove(self)
+
+
+class EnvHooks:
+    """
+    Dispatches the events of an environment to its subscribers.
+
+    The `step` and `reset` methods of the environment are only replaced by dispatching versions (with `instrument`)
+    while there is at least one subscriber, such that an environment without subscribers runs at full speed. All the
+    subscribers share the same dispatching call, instead of one wrapper layer per concern.
+    """
+
+    def __init__(self, env: "RLEnv"):
+        self.env = env
+        self.subscriptions: dict[EventName, list[Subscription]] = {"reset": [], "step": [], "episode_end": []}
+        self._original_step = None
+        self._original_reset = None
+        self._score = None
+        self._episode_length = 0
+
+    def add(self, event: EventName, callback: Callable[[Any], Any], batch_size: Optional[int] = None) -> Subscription:
+        if event not in self.subscriptions:
+            raise ValueError(f"Unknown event: {event}. Expected one of {list(self.subscriptions)}")
+        subscription = Subscription(self, event, callback, batch_size)
+        if not self.has_subscribers:
+            self._install()
+        self.subscriptions[event].append(subscription)
+        return subscription
+
+    def remove(self, subscription: Subscription):
+        self.subscriptions[subscription.event].remove(subscription)
+        if not self.has_subscribers:
+            self._uninstall()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return any(len(subscriptions) > 0 for subscriptions in self.subscriptions.values())
+
+    def _install(self):
+        instrument(self.env, "step", self, self._dispatch_step)
+        instrument(self.env, "reset", self, self._dispatch_reset)
+
+    def _uninstall(self):
+        uninstrument(self.env, "step", self)
+        uninstrument(self.env, "reset", self)
+        self._original_step = None
+        self._original_reset = None
+        del self.env.__dict__["_hooks"]
+
+    def _dispatch_step(self, step: Callable):
+        self._original_step = step
+        return self._step
+
+    def _dispatch_reset(self, reset: Callable):
+        self._original_reset = reset
+        return self._reset
+
+    def _reset(self, *args, **kwargs):
+        assert self._original_reset is not None
+        obs = self._original_reset(*args, **kwargs)
+        self._score = None
+        self._episode_length = 0
+        subscriptions = self.subscriptions["reset"]
+        if len(subscriptions) > 0:
+            event = ResetEvent(obs)
+            for subscription in subscriptions:
+                subscription._emit(event)
+        return obs
+
+    def _step(self, actions):
+        assert self._original_step is not None
+        obs, reward, done, truncated, info = self._original_step(actions)
+        subscriptions = self.subscriptions["step"]
+        if len(subscriptions) > 0:
+            event = StepEvent(actions, obs, reward, done, truncated, info)
+            for subscription in subscriptions:
+                subscription._emit(event)
+        subscriptions = self.subscriptions["episode_end"]
+        if len(subscriptions) > 0:
+            self._episode_length += 1
+            if self._score is None:
+                self._score = np.array(reward, dtype=np.float64)
+            else:
+                self._score += reward
+            if done or truncated:
+                event = EpisodeEndEvent(self._episode_length, self._score, done, truncated, info)
+                for subscription in subscriptions:
+                    subscription._emit(event)
+                self._score = None
+                self._episode_length = 0
+        return obs, reward, done, truncated, info
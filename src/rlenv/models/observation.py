@@ -1,32 +1,42 @@
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass
 import numpy as np
 import numpy.typing as npt
 
 
+def _expired():
+    raise ValueError("This lazy observation field has expired: the observation was discarded with `Observation.expire()`.")
+
+
 @dataclass
 class Observation:
     """
     Container class for policy input arguments.
+
+    The `available_actions` and `state` fields can be given as thunks (callables without arguments) instead of arrays.
+    In that case, the thunk is only evaluated on the first access to the field and the result is cached. Before their
+    internal state changes (i.e. on the next `step` or `reset`), environments resolve their last observation if it is
+    still referenced by the caller. Observations that are dropped or discarded with `expire()` are never resolved.
+
+    Environments in which agents can leave the episode provide an `alive` mask of shape [n_agents]. It is None when all
+    the agents are always alive.
     """
 
     data: npt.NDArray[np.float32]
     """The actual environment observation. The shape is [n_agents, *obs_shape]"""
-    available_actions: npt.NDArray[np.bool_]
-    """The available actions at the time of the observation"""
-    state: npt.NDArray[np.float32]
-    """The environment state at the time of the observation"""
     extras: npt.NDArray[np.float32]
     """The extra information to provide to the dqn alongisde the features (agent ID, last action, ...)"""
 
     def __init__(
         self,
         data: npt.NDArray[np.float32],
-        available_actions: npt.NDArray[np.bool_],
-        state: npt.NDArray[np.float32],
+        available_actions: npt.NDArray[np.bool_] | Callable[[], npt.NDArray[np.bool_]],
+        state: npt.NDArray[np.float32] | Callable[[], npt.NDArray[np.float32]],
         extras: Optional[npt.NDArray[np.float32]] = None,
+        alive: Optional[npt.NDArray[np.bool_]] = None,
     ):
         self.data = data
+        self.alive = alive
         self.available_actions = available_actions
         self.state = state
         if extras is not None:
@@ -34,6 +44,68 @@ class Observation:
         else:
             self.extras = np.zeros((len(data), 0), dtype=np.float32)
 
+    @property
+    def available_actions(self) -> npt.NDArray[np.bool_]:
+        """The available actions at the time of the observation"""
+        if self._available_actions_thunk is not None:
+            self._available_actions = self._available_actions_thunk()
+            self._available_actions_thunk = None
+        return self._available_actions
+
+    @available_actions.setter
+    def available_actions(self, value: npt.NDArray[np.bool_] | Callable[[], npt.NDArray[np.bool_]]):
+        if callable(value):
+            self._available_actions_thunk = value
+        else:
+            self._available_actions = value
+            self._available_actions_thunk = None
+
+    @property
+    def state(self) -> npt.NDArray[np.float32]:
+        """The environment state at the time of the observation"""
+        if self._state_thunk is not None:
+            self._state = self._state_thunk()
+            self._state_thunk = None
+        return self._state
+
+    @state.setter
+    def state(self, value: npt.NDArray[np.float32] | Callable[[], npt.NDArray[np.float32]]):
+        if callable(value):
+            self._state_thunk = value
+        else:
+            self._state = value
+            self._state_thunk = None
+
+    @property
+    def is_resolved(self) -> bool:
+        """Whether all the lazy fields of the observation have been evaluated"""
+        return self._available_actions_thunk is None and self._state_thunk is None
+
+    def resolve(self):
+        """Evaluate the pending lazy fields such that the observation no longer depends on the environment."""
+        if self._available_actions_thunk is not None and self._available_actions_thunk is not _expired:
+            self._available_actions = self._available_actions_thunk()
+            self._available_actions_thunk = None
+        if self._state_thunk is not None and self._state_thunk is not _expired:
+            self._state = self._state_thunk()
+            self._state_thunk = None
+        return self
+
+    def expire(self):
+        """
+        Discard the lazy fields that have not been evaluated yet, such that they are not computed when the environment
+        steps. Reading them afterwards raises a `ValueError`.
+        """
+        if self._available_actions_thunk is not None:
+            self._available_actions_thunk = _expired
+        if self._state_thunk is not None:
+            self._state_thunk = _expired
+
+    def copy(self) -> "Observation":
+        """Deep copy of the observation, which does not share any memory with the original one."""
+        alive = None if self.alive is None else self.alive.copy()
+        return Observation(self.data.copy(), self.available_actions.copy(), self.state.copy(), self.extras.copy(), alive)
+
     @property
     def n_agents(self) -> int:
         """The number of agents in the observation"""
@@ -49,8 +121,19 @@ class Observation:
         """The shape of the observation extras"""
         return self.extras.shape
 
+    def __getstate__(self):
+        # Thunks are bound to the environment and can not be serialized
+        self.resolve()
+        return self.__dict__
+
+    def _dead_agents(self) -> Optional[bytes]:
+        """The alive mask as bytes, or None when all the agents are alive (which is what a None mask means)"""
+        if self.alive is None or self.alive.all():
+            return None
+        return self.alive.tobytes()
+
     def __hash__(self):
-        return hash((self.data.tobytes(), self.state.tobytes(), self.extras.tobytes()))
+        return hash((self.data.tobytes(), self.state.tobytes(), self.extras.tobytes(), self._dead_agents()))
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -64,4 +147,5 @@ class Observation:
             and np.array_equal(self.state, other.state)
             and np.array_equal(self.extras, other.extras)
             and np.array_equal(self.available_actions, other.available_actions)
+            and self._dead_agents() == other._dead_agents()
         )
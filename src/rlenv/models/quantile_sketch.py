@@ -0,0 +1,122 @@
+import math
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy guarantees (DDSketch, Masson et al., 2019).
+
+    Values are counted in logarithmically sized buckets, such that any quantile is estimated within `relative_accuracy`
+    of its true value. The memory is bounded by `max_buckets` buckets for the positive values and as many for the
+    negative values: when this limit is reached, the buckets of the values closest to zero are collapsed together, which
+    only degrades the accuracy of the lowest quantiles (in absolute value).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048, min_value: float = 1e-9):
+        assert 0 < relative_accuracy < 1, "The relative accuracy must be in ]0, 1["
+        assert max_buckets >= 1, "The sketch must have at least one bucket"
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        """Values whose absolute value is below `min_value` are counted as zeros."""
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = dict[int, int]()
+        self.negative = dict[int, int]()
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: npt.ArrayLike):
+        """Add one value or an array of values to the sketch"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._add_to_store(self.positive, values[values > self.min_value])
+        self._add_to_store(self.negative, -values[values < -self.min_value])
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.min_value))
+
+    def _add_to_store(self, store: dict[int, int], values: npt.NDArray[np.float64]):
+        if len(values) == 0:
+            return
+        keys, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+        self._collapse(store)
+
+    def _collapse(self, store: dict[int, int]):
+        if len(store) <= self.max_buckets:
+            return
+        keys = sorted(store)
+        n_collapsed = len(keys) - self.max_buckets + 1
+        target = keys[n_collapsed - 1]
+        store[target] = sum(store.pop(key) for key in keys[: n_collapsed - 1]) + store[target]
+
+    def merge(self, other: "QuantileSketch"):
+        """Merge the values of `other` into this sketch"""
+        assert math.isclose(self.gamma, other.gamma), "Can not merge sketches with different accuracies"
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+            self._collapse(store)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the `q`-quantile (q in [0, 1]) of the values, or NaN if the sketch is empty"""
+        assert 0 <= q <= 1, "The quantile must be in [0, 1]"
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negative values, from the lowest (largest absolute value) to the highest
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(-self._value(key), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self._value(key), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export the sketch to a JSON-serializable dictionary."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "min_value": self.min_value,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "QuantileSketch":
+        sketch = QuantileSketch(data["relative_accuracy"], data["max_buckets"], data["min_value"])
+        sketch.positive = {int(k): v for k, v in data["positive"].items()}
+        sketch.negative = {int(k): v for k, v in data["negative"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
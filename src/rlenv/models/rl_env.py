@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, overload, Any, Literal, Optional
+from typing import Callable, Generic, TypeVar, overload, Any, Literal, Optional
 import numpy as np
 import numpy.typing as npt
 from dataclasses import dataclass
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 
 from .spaces import ActionSpace, DiscreteSpace
 from .observation import Observation
+from .hooks import EnvHooks, EventName, Subscription
 
 A = TypeVar("A", bound=ActionSpace)
 
@@ -67,6 +68,41 @@ class RLEnv(ABC, Generic[A]):
         """Set the environment seed"""
         raise NotImplementedError("Method not implemented")
 
+    def snapshot(self) -> Any:
+        """
+        Capture the current state of the environment in a token that can later be given to `restore`.
+
+        A token can be restored any number of times, which is typically used for tree search or to reset to checkpoints.
+        """
+        raise NotImplementedError(f"{self.name} does not support snapshots")
+
+    def restore(self, snapshot: Any):
+        """Restore the environment to the state captured by `snapshot()`."""
+        raise NotImplementedError(f"{self.name} does not support snapshots")
+
+    def subscribe(self, event: EventName, callback: Callable[[Any], Any], batch_size: Optional[int] = None) -> Subscription:
+        """
+        Call `callback` on every "reset", "step" or "episode_end" event of the environment (see `ResetEvent`,
+        `StepEvent` and `EpisodeEndEvent`). If `batch_size` is given, the callback receives lists of `batch_size` events.
+
+        Environments without subscribers do not pay any dispatch cost. The events hold the observations returned by
+        the environment, which subscribers must copy if they keep them and buffers are reused (see `reuse_buffers`).
+        """
+        hooks = self.__dict__.get("_hooks")
+        if hooks is None:
+            hooks = EnvHooks(self)
+            self.__dict__["_hooks"] = hooks
+        return hooks.add(event, callback, batch_size)
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        """
+        Write the observations in a ring of `size` preallocated buffers instead of allocating new arrays at every step.
+
+        An observation is then overwritten `size` steps later and the caller must `copy()` anything it wants to keep.
+        In debug mode, reading an observation whose buffer has been reused raises a `ValueError`.
+        """
+        raise NotImplementedError(f"{self.name} does not support buffer reuse")
+
     @abstractmethod
     def get_state(self) -> npt.NDArray[np.float32]:
         """Retrieve the current state of the environment."""
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+import numpy as np
+import numpy.typing as npt
+
+
+@dataclass
+class RunningMeanStd:
+    """
+    Running mean and variance of each feature, updated with batches of samples.
+
+    Statistics computed on different streams of data can be merged together with `merge`, which gives the same result
+    as if all the samples had been seen by a single instance (parallel algorithm of Chan et al.).
+    """
+
+    mean: npt.NDArray[np.float64]
+    var: npt.NDArray[np.float64]
+    count: float
+
+    def __init__(self, shape: tuple[int, ...] = ()):
+        self.mean = np.zeros(shape, dtype=np.float64)
+        self.var = np.ones(shape, dtype=np.float64)
+        self.count = 0.0
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.mean.shape
+
+    @property
+    def std(self) -> npt.NDArray[np.float64]:
+        return np.sqrt(self.var)
+
+    def update(self, batch: npt.NDArray):
+        """Update the statistics with a batch of samples of shape (batch_size, *shape)."""
+        self._merge(batch.mean(axis=0), batch.var(axis=0), batch.shape[0])
+
+    def merge(self, other: "RunningMeanStd"):
+        """Merge the statistics of `other` into this instance."""
+        assert self.shape == other.shape, f"Can not merge statistics of different shapes: {self.shape} != {other.shape}"
+        self._merge(other.mean, other.var, other.count)
+
+    def _merge(self, mean: npt.NDArray, var: npt.NDArray, count: float):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        m2 = self.var * self.count + var * count + np.square(delta) * self.count * count / total
+        self.mean = self.mean + delta * count / total
+        self.var = m2 / total
+        self.count = total
+
+    def normalize(self, x: npt.NDArray, epsilon: float = 1e-8, clip: Optional[float] = None, out: Optional[npt.NDArray] = None):
+        """Center and scale `x` with the current statistics, optionally clipping the result in [-clip, clip]."""
+        out = np.subtract(x, self.mean, out=out, casting="unsafe")
+        out /= np.sqrt(self.var + epsilon)
+        if clip is not None:
+            np.clip(out, -clip, clip, out=out)
+        return out
+
+    def copy(self) -> "RunningMeanStd":
+        stats = RunningMeanStd(self.shape)
+        stats.mean = self.mean.copy()
+        stats.var = self.var.copy()
+        stats.count = self.count
+        return stats
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export the statistics to a JSON-serializable dictionary."""
+        return {"mean": self.mean.tolist(), "var": self.var.tolist(), "count": self.count}
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "RunningMeanStd":
+        mean = np.array(data["mean"], dtype=np.float64)
+        stats = RunningMeanStd(mean.shape)
+        stats.mean = mean
+        stats.var = np.array(data["var"], dtype=np.float64)
+        stats.count = float(data["count"])
+        return stats
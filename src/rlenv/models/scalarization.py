@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import numpy.typing as npt
+
+from .episode import Episode
+
+
+@dataclass
+class LinearScalarization:
+    """
+    Linear scalarization of multi-objective rewards with W preference weight vectors at once.
+
+    Applied on rewards of shape `[..., n_objectives]`, it returns one scalar per weight vector, i.e. a shape `[..., W]`.
+    Since the scalarization is linear, the scalarized returns and scores are computed from the multi-objective ones in a
+    single matrix product.
+    """
+
+    weights: npt.NDArray[np.float32]
+    """The weight matrix of shape [W, n_objectives]"""
+    labels: list[str]
+    """The name of each weight vector, used as suffix of the metrics"""
+
+    def __init__(self, weights: npt.ArrayLike, labels: Optional[list[str]] = None):
+        weights = np.asarray(weights, dtype=np.float32)
+        if weights.ndim == 1:
+            weights = weights[np.newaxis]
+        assert weights.ndim == 2, "The weights must have shape [W, n_objectives]"
+        self.weights = weights
+        if labels is None:
+            labels = [f"w{i}" for i in range(len(weights))]
+        assert len(labels) == len(weights), "There must be one label per weight vector"
+        self.labels = labels
+
+    @property
+    def n_weights(self) -> int:
+        return self.weights.shape[0]
+
+    @property
+    def n_objectives(self) -> int:
+        return self.weights.shape[1]
+
+    def __call__(self, rewards: npt.ArrayLike) -> npt.NDArray[np.float32]:
+        """Scalarize rewards of shape [..., n_objectives] into shape [..., W]"""
+        return np.asarray(rewards, dtype=np.float32) @ self.weights.T
+
+    def returns(self, episode: Episode, discount: float = 1.0) -> npt.NDArray[np.float32]:
+        """The scalarized returns of the episode, with shape [episode_len, W]"""
+        return self(episode.compute_returns(discount))
+
+    def scores(self, episode: Episode) -> npt.NDArray[np.float32]:
+        """The scalarized score of the episode for each weight vector, with shape [W]"""
+        return self(episode.rewards.sum(axis=0))
+
+    def metrics(self, episode: Episode) -> dict[str, float]:
+        """The scalarized scores of the episode, with keys `score_<label>`"""
+        return {f"score_{label}": float(score) for label, score in zip(self.labels, self.scores(episode))}
+
+    def add_metrics(self, episode: Episode):
+        """Add the scalarized scores to the metrics of the episode"""
+        episode.metrics.update(self.metrics(episode))
@@ -0,0 +1,250 @@
+"""
+Compact binary format for `Observation`s, `Transition`s and `Episode`s.
+
+A message is made of
+- a fixed-size header: the magic bytes `RLW`, the format version, the kind of object (`O`, `T` or `E`), flags, the
+identifier of the layout of the arrays and the sizes of the two optional sections below,
+- the schema of the layout (JSON with the name, dtype and shape of every array), only when the layout is sent for the
+first time,
+- the scalar fields that can not be encoded in the flags (metrics, info) as JSON, when there are any,
+- the raw content of the arrays, each one aligned on 8 bytes.
+
+The layout of the arrays (dtypes, shapes and offsets) is parsed once and cached by the `Decoder`, such that decoding a
+message of a known layout only reads the fixed-size header and creates views on the arrays. An `Encoder` only sends the
+schema of a layout with the first message that uses it, which requires the messages of an encoder to be decoded in
+order by the same decoder (e.g. through a queue). The module-level `encode` always includes the schema, such that each
+message can be decoded on its own.
+
+Decoding does not copy the arrays: they are `np.frombuffer` views on the message, which are read-only if the message
+is a `bytes` object. Unlike pickle, decoding a message never executes code, so it is safe to decode untrusted data.
+"""
+
+import hashlib
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from .episode import Episode
+from .observation import Observation
+from .transition import Transition
+
+MAGIC = b"RLW"
+VERSION = 2
+_ALIGNMENT = 8
+_HEADER = struct.Struct("<3sBcBxxQII")
+"""magic, version, kind, flags, layout id, schema size, meta size"""
+_DONE = 1
+_TRUNCATED = 2
+_MAX_CACHED_LAYOUTS = 1024
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _to_json(value: Any):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Value of type {type(value)} can not be encoded")
+
+
+@dataclass
+class _Layout:
+    """Names, dtypes, shapes and offsets (relative to the start of the arrays) of the arrays of a message"""
+
+    id: int
+    schema: bytes
+    offsets: list[int]
+    dtype: np.dtype
+    """Structured dtype of all the arrays, such that decoding only creates one array from the buffer"""
+    fields: list[tuple[str, tuple[int, ...]]]
+
+    @property
+    def size(self) -> int:
+        return self.dtype.itemsize
+
+    @staticmethod
+    def from_schema(schema: bytes) -> "_Layout":
+        names, formats, offsets, fields = [], [], [], []
+        offset = 0
+        for name, dtype, shape in json.loads(schema):
+            dtype = np.dtype(dtype)
+            shape = tuple(shape)
+            names.append(name)
+            # Scalar fields of structured arrays are not views, so 0-d arrays are stored with shape (1,)
+            formats.append((dtype, shape or (1,)))
+            offsets.append(offset)
+            fields.append((name, shape))
+            offset = _align(offset + int(np.prod(shape, dtype=np.int64)) * dtype.itemsize)
+        dtype = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": max(offset, _ALIGNMENT)})
+        layout_id = int.from_bytes(hashlib.sha1(schema).digest()[:8], "little")
+        return _Layout(layout_id, schema, offsets, dtype, fields)
+
+
+def _observation_arrays(obs: Observation, prefix: str) -> dict[str, Optional[np.ndarray]]:
+    return {
+        f"{prefix}data": obs.data,
+        f"{prefix}available_actions": obs.available_actions,
+        f"{prefix}state": obs.state,
+        f"{prefix}extras": obs.extras,
+        f"{prefix}alive": obs.alive,
+    }
+
+
+def _observation_from_arrays(arrays: dict[str, np.ndarray], prefix: str) -> Observation:
+    return Observation(
+        arrays[f"{prefix}data"],
+        arrays[f"{prefix}available_actions"],
+        arrays[f"{prefix}state"],
+        arrays[f"{prefix}extras"],
+        arrays.get(f"{prefix}alive"),
+    )
+
+
+def _fields(item: Observation | Transition | Episode) -> tuple[bytes, dict[str, Optional[np.ndarray]], int, Optional[dict[str, Any]]]:
+    """The kind, the arrays, the flags and the other scalar fields of an item"""
+    match item:
+        case Observation():
+            return b"O", _observation_arrays(item, ""), 0, None
+        case Transition():
+            arrays = _observation_arrays(item.obs, "obs.") | _observation_arrays(item.obs_, "obs_.")
+            arrays |= {"action": item.action, "reward": item.reward, "probs": item.probs}
+            flags = (_DONE if item.done else 0) | (_TRUNCATED if item.truncated else 0)
+            return b"T", arrays, flags, {"info": item.info} if len(item.info) > 0 else None
+        case Episode():
+            arrays = {
+                "observations": item._observations,
+                "extras": item._extras,
+                "actions": item.actions,
+                "rewards": item.rewards,
+                "available_actions": item._available_actions,
+                "states": item._states,
+                "actions_probs": item.actions_probs,
+                "alive_masks": item.alive_masks,
+            }
+            flags = _DONE if item.is_done else 0
+            return b"E", arrays, flags, {"metrics": item.metrics, "episode_len": item.episode_len}
+    raise TypeError(f"Can not encode objects of type {type(item)}")
+
+
+class Encoder:
+    """
+    Encodes items with a cache of the layouts that have already been sent, such that the schema of a layout is only
+    included in the first message that uses it.
+    """
+
+    def __init__(self, send_schemas_once: bool = True):
+        self.send_schemas_once = send_schemas_once
+        self._layouts = dict[tuple, _Layout]()
+
+    def encode(self, item: Observation | Transition | Episode) -> bytearray:
+        kind, arrays, flags, meta = _fields(item)
+        contiguous = []
+        key = [kind]
+        for name, array in arrays.items():
+            if array is None:
+                continue
+            # np.ascontiguousarray would turn 0-d arrays into 1-d arrays
+            array = np.asarray(array, order="C")
+            if array.dtype.hasobject:
+                raise TypeError(f"Array {name} has dtype object and can not be encoded")
+            key.append((name, array.dtype.str, array.shape))
+            contiguous.append(array)
+        layout = self._layouts.get(key_tuple := tuple(key))
+        send_schema = not self.send_schemas_once or layout is None
+        if layout is None:
+            schema = json.dumps([[name, dtype, list(shape)] for name, dtype, shape in key[1:]], separators=(",", ":")).encode()
+            layout = _Layout.from_schema(schema)
+            self._layouts[key_tuple] = layout
+        schema = layout.schema if send_schema else b""
+        meta_bytes = b"" if meta is None else json.dumps(meta, default=_to_json, separators=(",", ":")).encode()
+        start = _align(_HEADER.size + len(schema) + len(meta_bytes))
+        message = bytearray(start + layout.size)
+        _HEADER.pack_into(message, 0, MAGIC, VERSION, kind, flags, layout.id, len(schema), len(meta_bytes))
+        position = _HEADER.size
+        message[position : position + len(schema)] = schema
+        position += len(schema)
+        message[position : position + len(meta_bytes)] = meta_bytes
+        view = memoryview(message)
+        for array, offset in zip(contiguous, layout.offsets):
+            if array.nbytes > 0:
+                view[start + offset : start + offset + array.nbytes] = memoryview(array).cast("B")
+        return message
+
+
+class Decoder:
+    """Decodes messages and caches the layouts of the arrays, such that each schema is only parsed once."""
+
+    def __init__(self):
+        self._layouts = dict[int, _Layout]()
+
+    def decode(self, message: bytes | bytearray | memoryview) -> Observation | Transition | Episode:
+        """Decode a message created by an `Encoder`. The arrays of the result share the memory of the message."""
+        view = memoryview(message).cast("B")
+        if len(view) < _HEADER.size or bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not an rlenv message")
+        _, version, kind, flags, layout_id, schema_size, meta_size = _HEADER.unpack_from(view)
+        if version != VERSION:
+            raise ValueError(f"Unsupported format version: {version}")
+        position = _HEADER.size
+        layout = self._layouts.get(layout_id)
+        if layout is None:
+            if schema_size == 0:
+                raise ValueError(f"Unknown layout {layout_id}: its schema has not been received")
+            layout = _Layout.from_schema(bytes(view[position : position + schema_size]))
+            if len(self._layouts) >= _MAX_CACHED_LAYOUTS:
+                self._layouts.clear()
+            self._layouts[layout_id] = layout
+        position += schema_size
+        meta = json.loads(bytes(view[position : position + meta_size])) if meta_size > 0 else {}
+        start = _align(position + meta_size)
+        record = np.frombuffer(view, dtype=layout.dtype, count=1, offset=start)[0]
+        arrays = {name: record[name] if len(shape) > 0 else record[name].reshape(shape) for name, shape in layout.fields}
+        match kind:
+            case b"O":
+                return _observation_from_arrays(arrays, "")
+            case b"T":
+                return Transition(
+                    obs=_observation_from_arrays(arrays, "obs."),
+                    action=arrays["action"],
+                    reward=arrays["reward"],
+                    done=bool(flags & _DONE),
+                    info=meta.get("info", {}),
+                    obs_=_observation_from_arrays(arrays, "obs_."),
+                    truncated=bool(flags & _TRUNCATED),
+                    action_probs=arrays.get("probs"),
+                )
+            case b"E":
+                return Episode(
+                    _observations=arrays["observations"],
+                    _extras=arrays["extras"],
+                    actions=arrays["actions"],
+                    rewards=arrays["rewards"],
+                    _available_actions=arrays["available_actions"],
+                    _states=arrays["states"],
+                    actions_probs=arrays.get("actions_probs"),
+                    metrics=meta["metrics"],
+                    episode_len=meta["episode_len"],
+                    is_done=bool(flags & _DONE),
+                    alive_masks=arrays.get("alive_masks"),
+                )
+        raise ValueError(f"Unknown message kind: {kind}")
+
+
+_encoder = Encoder(send_schemas_once=False)
+_decoder = Decoder()
+
+
+def encode(item: Observation | Transition | Episode) -> bytearray:
+    """Encode an observation, a transition or an episode in a message that includes its schema."""
+    return _encoder.encode(item)
+
+
+def decode(message: bytes | bytearray | memoryview) -> Observation | Transition | Episode:
+    """Decode a message. The arrays of the result share the memory of the message."""
+    return _decoder.decode(message)
@@ -0,0 +1,158 @@
+"""
+Per-layer timing of wrapper stacks.
+
+`StackProfiler` walks the `wrapped` chain of an environment and times the `step`, `reset`, `available_actions` and
+`get_state` methods of each layer, separating the time spent in the layer itself (self time) from the time spent in the
+layers below it (cumulative time). The methods are only instrumented between `start()` and `stop()`, such that
+profiling has no overhead at all when it is disabled.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .models import RLEnv
+from .models.hooks import instrument, uninstrument
+from .wrappers import RLEnvWrapper
+
+PROFILED_METHODS = ("step", "reset", "available_actions", "get_state")
+
+
+@dataclass
+class LayerStats:
+    depth: int
+    """Position of the layer in the stack, 0 being the outermost wrapper"""
+    layer: str
+    method: str
+    n_calls: int = 0
+    cumulative_ns: int = 0
+    """Time spent in the method, including the calls to the layers below"""
+    self_ns: int = 0
+    """Time spent in the method, excluding the calls to the other profiled methods"""
+
+    @property
+    def mean_self_us(self) -> float:
+        return self.self_ns / max(self.n_calls, 1) / 1e3
+
+
+class StackProfiler:
+    """
+    Profiles each layer of a wrapper stack.
+
+    The profiled methods of each layer are replaced by timed versions (with `instrument`) while the profiler is
+    running. The profiler is meant to be used from a single thread, and the environment can not be pickled while it is
+    being profiled.
+
+    If `trace` is True, every call is also recorded (up to `max_trace_events` calls) and can be saved with `save_trace`
+    in the Chrome trace event format (viewable with chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, env: RLEnv, methods: tuple[str, ...] = PROFILED_METHODS, trace: bool = False, max_trace_events: int = 1_000_000):
+        self.layers = list[RLEnv]()
+        layer: Optional[RLEnv] = env
+        while layer is not None:
+            self.layers.append(layer)
+            layer = layer.wrapped if isinstance(layer, RLEnvWrapper) else None
+        self.methods = methods
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.stats = {
+            (depth, method): LayerStats(depth, type(layer).__name__, method)
+            for depth, layer in enumerate(self.layers)
+            for method in methods
+        }
+        self._events = list[tuple[str, str, int, int]]()
+        self._children_ns = list[int]()
+        self._running = False
+
+    def start(self):
+        assert not self._running, "The profiler is already running"
+        for depth, layer in enumerate(self.layers):
+            for method in self.methods:
+                stats = self.stats[(depth, method)]
+                instrument(layer, method, self, lambda method, stats=stats: self._timed(method, stats))
+        self._running = True
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        for layer in self.layers:
+            for method in self.methods:
+                # Only remove the timed versions: the other instrumentations (e.g. event hooks) are kept
+                uninstrument(layer, method, self)
+        self._running = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def _timed(self, method, stats: LayerStats):
+        clock = time.perf_counter_ns
+        children_ns = self._children_ns
+        events = self._events
+        name = f"{stats.layer}.{stats.method}"
+
+        def timed(*args, **kwargs):
+            children_ns.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stats.n_calls += 1
+                stats.cumulative_ns += elapsed
+                stats.self_ns += elapsed - children_ns.pop()
+                if len(children_ns) > 0:
+                    children_ns[-1] += elapsed
+                if self.trace and len(events) < self.max_trace_events:
+                    events.append((name, stats.method, start, elapsed))
+
+        return timed
+
+    def reset_stats(self):
+        for stats in self.stats.values():
+            stats.n_calls = stats.cumulative_ns = stats.self_ns = 0
+        self._events.clear()
+
+    def table(self) -> str:
+        """Per-layer breakdown of the time spent in each profiled method"""
+        total_ns = sum(stats.self_ns for stats in self.stats.values())
+        rows = [["layer", "method", "calls", "cumulative (ms)", "self (ms)", "self (%)", "self/call (us)"]]
+        for stats in self.stats.values():
+            if stats.n_calls == 0:
+                continue
+            rows.append(
+                [
+                    "  " * stats.depth + stats.layer,
+                    stats.method,
+                    str(stats.n_calls),
+                    f"{stats.cumulative_ns / 1e6:.3f}",
+                    f"{stats.self_ns / 1e6:.3f}",
+                    f"{100 * stats.self_ns / max(total_ns, 1):.1f}",
+                    f"{stats.mean_self_us:.2f}",
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        pid = os.getpid()
+        tid = threading.get_ident()
+        return [
+            {"name": name, "cat": method, "ph": "X", "ts": start / 1e3, "dur": duration / 1e3, "pid": pid, "tid": tid}
+            for name, method, start, duration in self._events
+        ]
+
+    def save_trace(self, path: str):
+        """Save the recorded calls in the Chrome trace event format"""
+        assert self.trace, "The profiler must be created with trace=True to save a trace"
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ns"}, f)
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Keeps the ratio of sampled to inserted items (typically transitions) close to `samples_per_insert`.
+
+    The difference `inserts * samples_per_insert - samples` is kept in the band
+    `[min_size_to_sample * samples_per_insert - error_buffer, min_size_to_sample * samples_per_insert + error_buffer]`:
+    - `insert` blocks while inserting would push the difference above the band (the learner is behind);
+    - `sample` blocks until `min_size_to_sample` items have been inserted and while sampling would push the difference
+    below the band (the actors are behind).
+
+    The producer and the consumer must run in different threads, otherwise blocking calls can not be released.
+    """
+
+    def __init__(self, samples_per_insert: float, min_size_to_sample: int = 1, error_buffer: Optional[float] = None):
+        assert samples_per_insert > 0, "The samples per insert ratio must be positive"
+        assert min_size_to_sample >= 1, "At least one item must be inserted before sampling"
+        if error_buffer is None:
+            error_buffer = max(1.0, samples_per_insert) * 100
+        # Otherwise, inserts and samples could be blocked at the same time
+        assert error_buffer >= max(1.0, samples_per_insert), "The error buffer must be at least max(1, samples_per_insert)"
+        self.samples_per_insert = samples_per_insert
+        self.min_size_to_sample = min_size_to_sample
+        self.error_buffer = error_buffer
+        offset = min_size_to_sample * samples_per_insert
+        self.min_diff = offset - error_buffer
+        self.max_diff = offset + error_buffer
+        self.n_inserts = 0
+        self.n_samples = 0
+        self.insert_blocked_time = 0.0
+        """Total time (in seconds) spent waiting in `insert`"""
+        self.sample_blocked_time = 0.0
+        """Total time (in seconds) spent waiting in `sample`"""
+        self._condition = threading.Condition()
+
+    @property
+    def max_chunk_size(self) -> int:
+        """The largest number of items that can be inserted at once without risking to block forever"""
+        return max(1, int(self.error_buffer // self.samples_per_insert))
+
+    def can_insert(self, n: int = 1) -> bool:
+        if self.n_inserts + n <= self.min_size_to_sample:
+            return True
+        return (self.n_inserts + n) * self.samples_per_insert - self.n_samples <= self.max_diff
+
+    def can_sample(self, n: int = 1) -> bool:
+        if self.n_inserts < self.min_size_to_sample:
+            return False
+        return self.n_inserts * self.samples_per_insert - (self.n_samples + n) >= self.min_diff
+
+    def insert(self, n: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until `n` items can be inserted and record them. Returns False if the timeout expired, in which case nothing
+        is recorded.
+
+        Once `min_size_to_sample` items have been inserted, `n` must be at most `max_chunk_size`, otherwise the insertion
+        could never be allowed. Use `insert_chunked` to insert more items.
+        """
+        assert self.n_inserts + n <= self.min_size_to_sample or n <= self.max_chunk_size, (
+            f"Inserting {n} items at once could block forever, insert them in chunks of at most {self.max_chunk_size} items"
+        )
+        with self._condition:
+            if not self.can_insert(n):
+                start = time.perf_counter()
+                allowed = self._condition.wait_for(lambda: self.can_insert(n), timeout)
+                self.insert_blocked_time += time.perf_counter() - start
+                if not allowed:
+                    return False
+            self.n_inserts += n
+            self._condition.notify_all()
+            return True
+
+    def insert_chunked(self, n: int):
+        """Insert `n` items (e.g. the transitions of an episode) in chunks of at most `max_chunk_size` items."""
+        chunk_size = self.max_chunk_size
+        while n > 0:
+            chunk = min(n, chunk_size)
+            self.insert(chunk)
+            n -= chunk
+
+    def sample(self, n: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until `n` items can be sampled and record them. Returns False if the timeout expired, in which case nothing
+        is recorded.
+        """
+        with self._condition:
+            if not self.can_sample(n):
+                start = time.perf_counter()
+                allowed = self._condition.wait_for(lambda: self.can_sample(n), timeout)
+                self.sample_blocked_time += time.perf_counter() - start
+                if not allowed:
+                    return False
+            self.n_samples += n
+            self._condition.notify_all()
+            return True
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        with self._condition:
+            return {
+                "inserts": self.n_inserts,
+                "samples": self.n_samples,
+                "samples_per_insert": self.n_samples / max(1, self.n_inserts),
+                "insert_blocked_time": self.insert_blocked_time,
+                "sample_blocked_time": self.sample_blocked_time,
+            }
@@ -0,0 +1,436 @@
+"""
+Expose environments over TCP and use them as if they were local.
+
+An `EnvServer` creates environments with a factory and serves them over TCP. A `RemoteEnvClient` connects to a server,
+asks for `n_envs` environments on a single connection and exposes each of them as a `RemoteEnv` (an `RLEnv`).
+
+- Requests are pipelined: `RemoteEnvClient.step_all` sends the actions of all the environments before receiving any
+result, and `RemoteEnv.step_async` sends a request without waiting for its result.
+- The environments of a client belong to a session that outlives the connection: when the connection is lost, the client
+reconnects, attaches to the same session and sends the unanswered requests again. The server keeps the results of the
+requests until the client acknowledges them and answers requests that it already executed with the cached result, such
+that no step is executed twice.
+- A session ends when its client is closed, or when it has no connection for `session_timeout` seconds.
+
+Messages are pickled, so the server and the clients must trust each other. Before any message is exchanged, the server
+and the client authenticate each other with a shared `authkey` (HMAC challenge, as in `multiprocessing.connection`), and
+the server only listens on localhost by default.
+"""
+
+import hmac
+import os
+import pickle
+import secrets
+import socket
+import socketserver
+import struct
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import AuthenticationError
+from typing import Any, Callable, Optional, Sequence
+
+import numpy.typing as npt
+
+from .models import RLEnv, ActionSpace, DiscreteSpace, Observation
+
+_HEADER = struct.Struct("!Q")
+_ALLOWED_METHODS = {"reset", "step", "get_state", "available_actions", "seed"}
+_DETACH = "detach"
+_CHALLENGE_SIZE = 32
+_WELCOME = b"\x01"
+_FAILURE = b"\x00"
+
+
+def _send(sock: socket.socket, message: Any):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buffer = bytearray(n)
+    view = memoryview(buffer)
+    received = 0
+    while received < n:
+        n_bytes = sock.recv_into(view[received:])
+        if n_bytes == 0:
+            raise ConnectionError("Connection closed by peer")
+        received += n_bytes
+    return bytes(buffer)
+
+
+def _deliver_challenge(sock: socket.socket, authkey: bytes):
+    challenge = os.urandom(_CHALLENGE_SIZE)
+    sock.sendall(challenge)
+    digest = _recv_exactly(sock, _CHALLENGE_SIZE)
+    if not hmac.compare_digest(digest, hmac.digest(authkey, challenge, "sha256")):
+        sock.sendall(_FAILURE)
+        raise AuthenticationError("The digest received was wrong")
+    sock.sendall(_WELCOME)
+
+
+def _answer_challenge(sock: socket.socket, authkey: bytes):
+    challenge = _recv_exactly(sock, _CHALLENGE_SIZE)
+    sock.sendall(hmac.digest(authkey, challenge, "sha256"))
+    if _recv_exactly(sock, len(_WELCOME)) != _WELCOME:
+        raise AuthenticationError("The digest sent was rejected")
+
+
+def _authenticate(sock: socket.socket, authkey: bytes, server_side: bool):
+    """Mutual authentication, such that nothing is unpickled before both ends are known to share the key"""
+    if server_side:
+        _deliver_challenge(sock, authkey)
+        _answer_challenge(sock, authkey)
+    else:
+        _answer_challenge(sock, authkey)
+        _deliver_challenge(sock, authkey)
+
+
+def _recv(sock: socket.socket) -> Any:
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return pickle.loads(_recv_exactly(sock, size))
+
+
+@dataclass
+class _EnvDescription:
+    """The input and output spaces of an environment"""
+
+    name: str
+    action_space: ActionSpace
+    observation_shape: tuple[int, ...]
+    state_shape: tuple[int, ...]
+    extra_feature_shape: tuple[int, ...]
+    reward_space: DiscreteSpace
+
+    @staticmethod
+    def of(env: RLEnv) -> "_EnvDescription":
+        return _EnvDescription(
+            env.name, env.action_space, env.observation_shape, env.state_shape, env.extra_feature_shape, env.reward_space
+        )
+
+
+class _Session:
+    """
+    Environments of a client, with the responses that the client has not acknowledged yet to answer requests sent twice.
+    """
+
+    def __init__(self, envs: list[RLEnv]):
+        self.envs = envs
+        self.responses = dict[int, tuple[bool, Any]]()
+        """Responses by request id, in increasing order of request id"""
+        self.lock = threading.Lock()
+        self.n_connections = 0
+        self.last_active = time.monotonic()
+
+    def handle(self, request_id: int, acknowledged: int, env_index: int, method: str, args: tuple) -> tuple[bool, Any]:
+        # The client has received the responses of all the requests before `acknowledged`
+        while len(self.responses) > 0:
+            oldest = next(iter(self.responses))
+            if oldest >= acknowledged:
+                break
+            del self.responses[oldest]
+        response = self.responses.get(request_id)
+        if response is None:
+            response = self._execute(env_index, method, args)
+            self.responses[request_id] = response
+        return response
+
+    def _execute(self, env_index: int, method: str, args: tuple) -> tuple[bool, Any]:
+        try:
+            if method not in _ALLOWED_METHODS:
+                raise ValueError(f"Method {method} can not be called remotely")
+            result = getattr(self.envs[env_index], method)(*args)
+        except Exception as e:
+            return False, e
+        if isinstance(result, Observation):
+            result.resolve()
+        elif isinstance(result, tuple) and len(result) > 0 and isinstance(result[0], Observation):
+            result[0].resolve()
+        return True, result
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "_TCPServer"
+
+    def handle(self):
+        sock: socket.socket = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        env_server = self.server.env_server
+        try:
+            _authenticate(sock, env_server.authkey, server_side=True)
+            session_id, n_envs, resume = _recv(sock)
+        except (ConnectionError, OSError, AuthenticationError):
+            return
+        session = env_server._attach(session_id, n_envs, resume)
+        if session is None:
+            _send(sock, ValueError(f"The session {session_id} does not exist or has expired"))
+            return
+        try:
+            _send(sock, [_EnvDescription.of(env) for env in session.envs])
+            while True:
+                message = _recv(sock)
+                if message == _DETACH:
+                    env_server._detach(session_id)
+                    return
+                request_id, acknowledged, env_index, method, args = message
+                with session.lock:
+                    session.last_active = time.monotonic()
+                    success, value = session.handle(request_id, acknowledged, env_index, method, args)
+                _send(sock, (request_id, success, value))
+        except (ConnectionError, OSError):
+            return
+        finally:
+            with session.lock:
+                session.n_connections -= 1
+                session.last_active = time.monotonic()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    env_server: "EnvServer"
+
+    def service_actions(self):
+        # Called by `serve_forever` at every iteration of its loop
+        self.env_server._expire_sessions()
+
+
+class EnvServer:
+    """
+    Serves the environments created by `env_factory` over TCP. Each client session gets its own environments.
+
+    Use port 0 to let the OS pick a free port, available in `address` once the server is created. The environments of a
+    session are discarded when its client is closed or when the session has had no connection for `session_timeout`
+    seconds (never if None).
+
+    Clients must provide the same `authkey` as the server. If no key is given, a random one is generated and available
+    in `authkey`.
+    """
+
+    def __init__(
+        self,
+        env_factory: Callable[[], RLEnv],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        session_timeout: Optional[float] = 600.0,
+        authkey: Optional[bytes] = None,
+    ):
+        self.env_factory = env_factory
+        self.authkey = authkey if authkey is not None else secrets.token_bytes(32)
+        self.session_timeout = session_timeout
+        self._sessions = dict[str, _Session]()
+        self._lock = threading.Lock()
+        self._server = _TCPServer((host, port), _Handler)
+        self._server.env_server = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]  # type: ignore
+
+    @property
+    def n_sessions(self) -> int:
+        return len(self._sessions)
+
+    def _attach(self, session_id: str, n_envs: int, resume: bool) -> Optional[_Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                if resume:
+                    return None
+                session = _Session([self.env_factory() for _ in range(n_envs)])
+                self._sessions[session_id] = session
+            with session.lock:
+                session.n_connections += 1
+            return session
+
+    def _detach(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire_sessions(self):
+        if self.session_timeout is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                if session.n_connections == 0 and now - session.last_active > self.session_timeout:
+                    del self._sessions[session_id]
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class PendingResult:
+    """Result of a request that has been sent but not necessarily received yet"""
+
+    def __init__(self, client: "RemoteEnvClient", request_id: int):
+        self._client = client
+        self.request_id = request_id
+
+    def result(self):
+        return self._client._wait(self.request_id)
+
+
+class RemoteEnvClient:
+    """
+    Connection to an `EnvServer` that hosts `n_envs` environments, available in `envs`. The `authkey` must be the one of
+    the server, otherwise an `AuthenticationError` is raised.
+
+    If the connection is lost, the client tries to reconnect `max_retries` times (waiting `retry_delay` seconds between
+    attempts) before raising a `ConnectionError`. Closing the client ends its session on the server.
+    """
+
+    def __init__(self, host: str, port: int, authkey: bytes, n_envs: int = 1, max_retries: int = 5, retry_delay: float = 0.5):
+        self.address = (host, port)
+        self.authkey = authkey
+        self.n_envs = n_envs
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._session_id = uuid.uuid4().hex
+        self._next_id = 0
+        self._pending = deque[tuple[int, int, str, tuple]]()
+        self._results = dict[int, tuple[bool, Any]]()
+        self._sock: Optional[socket.socket] = None
+        specs = self._connect(resume=False)
+        self.envs = [RemoteEnv(self, i, spec) for i, spec in enumerate(specs)]
+
+    def _connect(self, resume: bool) -> list[_EnvDescription]:
+        sock = socket.create_connection(self.address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            _authenticate(sock, self.authkey, server_side=False)
+        except AuthenticationError:
+            sock.close()
+            raise
+        _send(sock, (self._session_id, self.n_envs, resume))
+        specs = _recv(sock)
+        if isinstance(specs, Exception):
+            sock.close()
+            raise specs
+        self._sock = sock
+        return specs
+
+    def _reconnect(self):
+        self._disconnect()
+        for attempt in range(self.max_retries):
+            try:
+                self._connect(resume=True)
+                # Send again the requests whose results have not been received
+                for request in self._pending:
+                    _send(self._sock, request)  # type: ignore
+                return
+            except OSError:
+                self._disconnect()
+                time.sleep(self.retry_delay * (attempt + 1))
+        raise ConnectionError(f"Could not reconnect to {self.address}")
+
+    def send(self, env_index: int, method: str, *args) -> PendingResult:
+        """Send a request without waiting for its result"""
+        # All the requests before the oldest pending one have been answered
+        acknowledged = self._pending[0][0] if len(self._pending) > 0 else self._next_id
+        request = (self._next_id, acknowledged, env_index, method, args)
+        self._next_id += 1
+        self._pending.append(request)
+        try:
+            if self._sock is None:
+                raise ConnectionError("Not connected")
+            _send(self._sock, request)
+        except OSError:
+            # The request is pending, so it is sent again after reconnection
+            self._reconnect()
+        return PendingResult(self, request[0])
+
+    def _wait(self, request_id: int):
+        while request_id not in self._results:
+            try:
+                if self._sock is None:
+                    raise ConnectionError("Not connected")
+                response_id, success, value = _recv(self._sock)
+            except OSError:
+                self._reconnect()
+                continue
+            # The server answers the requests of a connection in order
+            if len(self._pending) > 0 and self._pending[0][0] == response_id:
+                self._pending.popleft()
+                self._results[response_id] = (success, value)
+        success, value = self._results.pop(request_id)
+        if not success:
+            raise value
+        return value
+
+    def step_all(self, actions: Sequence[npt.ArrayLike]):
+        """Step all the environments with pipelined requests and return the results in order"""
+        assert len(actions) == self.n_envs, "There must be one action per environment"
+        pending = [self.send(i, "step", action) for i, action in enumerate(actions)]
+        return [p.result() for p in pending]
+
+    def reset_all(self) -> list[Observation]:
+        pending = [self.send(i, "reset") for i in range(self.n_envs)]
+        return [p.result() for p in pending]
+
+    def close(self):
+        """End the session on the server and close the connection"""
+        if self._sock is not None:
+            try:
+                _send(self._sock, _DETACH)
+            except OSError:
+                pass
+        self._disconnect()
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+
+class RemoteEnv(RLEnv[ActionSpace]):
+    """Proxy to an environment hosted by an `EnvServer`"""
+
+    def __init__(self, client: RemoteEnvClient, index: int, spec: _EnvDescription):
+        super().__init__(spec.action_space, spec.observation_shape, spec.state_shape, spec.extra_feature_shape, spec.reward_space)
+        self.name = spec.name
+        self.client = client
+        self.index = index
+
+    def reset(self) -> Observation:
+        return self.client.send(self.index, "reset").result()
+
+    def step(self, actions: npt.ArrayLike):
+        return self.client.send(self.index, "step", actions).result()
+
+    def step_async(self, actions: npt.ArrayLike) -> PendingResult:
+        """Send the actions without waiting for the result of the step"""
+        return self.client.send(self.index, "step", actions)
+
+    def get_state(self):
+        return self.client.send(self.index, "get_state").result()
+
+    def available_actions(self):
+        return self.client.send(self.index, "available_actions").result()
+
+    def seed(self, seed_value: int):
+        return self.client.send(self.index, "seed", seed_value).result()
+
+    def render(self, *_):
+        raise NotImplementedError("Remote environments can not be rendered")
@@ -0,0 +1,121 @@
+"""
+Compact encoding of the episodes of deterministic environments.
+
+An `EpisodeReplay` only stores the `EnvSpec` of the environment, the seed, the actions (and their probabilities) and
+the metrics of an episode. The full `Episode` is regenerated on demand by replaying the actions in a new environment
+built from the spec, and is verified against the checksum of the original episode.
+"""
+
+import hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .env_builder import EnvSpec
+from .models import Episode, RLEnv
+from .rollout import rollout
+
+
+def episode_checksum(episode: Episode) -> str:
+    """Hash of the content of an episode, excluding its metrics"""
+    h = hashlib.sha256()
+    for array in (
+        episode._observations,
+        episode._extras,
+        episode.actions,
+        episode.rewards,
+        episode._available_actions,
+        episode._states,
+    ):
+        array = np.ascontiguousarray(array)
+        h.update(f"{array.dtype.str}{array.shape}".encode())
+        h.update(array.data)
+    h.update(bytes([episode.is_done]))
+    return h.hexdigest()
+
+
+@dataclass
+class EpisodeReplay:
+    """Seed and actions of an episode, from which the full episode can be regenerated"""
+
+    spec: EnvSpec
+    seed: Optional[int]
+    """The seed given to the environment before the reset, or None if the environment is not seeded."""
+    actions: np.ndarray
+    actions_probs: Optional[np.ndarray]
+    metrics: dict[str, float]
+    checksum: str
+
+    @staticmethod
+    def record(spec: EnvSpec, seed: Optional[int], episode: Episode) -> "EpisodeReplay":
+        """Encode an episode that has been played in an environment built from `spec` and seeded with `seed`"""
+        return EpisodeReplay(spec, seed, episode.actions.copy(), episode.actions_probs, dict(episode.metrics), episode_checksum(episode))
+
+    def __len__(self):
+        return len(self.actions)
+
+    def regenerate(self, env: Optional[RLEnv] = None, verify: bool = True) -> Episode:
+        """
+        Regenerate the episode by replaying the actions in `env` (a new environment built from the spec by default).
+
+        If `verify` is True, a `ValueError` is raised when the regenerated episode differs from the original one, which
+        happens when the environment is not deterministic.
+        """
+        if env is None:
+            env = self.spec.make()
+        if self.seed is not None:
+            env.seed(self.seed)
+        t = 0
+
+        def policy(_obs):
+            nonlocal t
+            if t >= len(self.actions):
+                raise ValueError(f"The regenerated episode is longer than the original one ({len(self.actions)} steps)")
+            action = self.actions[t]
+            t += 1
+            if self.actions_probs is not None:
+                return action, self.actions_probs[t - 1]
+            return action
+
+        episode = next(iter(rollout(env, policy, 1)))
+        episode.metrics = dict(self.metrics)
+        if verify and episode_checksum(episode) != self.checksum:
+            raise ValueError("The regenerated episode differs from the original one: is the environment deterministic?")
+        return episode
+
+
+_worker_envs = dict[str, RLEnv]()
+
+
+def _regenerate(replay: EpisodeReplay, verify: bool) -> Episode:
+    # Each worker builds the environment of each spec only once
+    key = replay.spec.content_hash
+    env = _worker_envs.get(key)
+    if env is None:
+        env = replay.spec.make()
+        _worker_envs[key] = env
+    return replay.regenerate(env, verify)
+
+
+def regenerate(
+    replays: Iterable[EpisodeReplay],
+    n_workers: Optional[int] = None,
+    verify: bool = True,
+    start_method: Optional[str] = None,
+) -> list[Episode]:
+    """Regenerate the episodes of the replays in parallel with `n_workers` processes and return them in order."""
+    replays = list(replays)
+    if n_workers == 1:
+        envs = dict[str, RLEnv]()
+        episodes = []
+        for replay in replays:
+            key = replay.spec.content_hash
+            if key not in envs:
+                envs[key] = replay.spec.make()
+            episodes.append(replay.regenerate(envs[key], verify))
+        return episodes
+    with ProcessPoolExecutor(n_workers, mp_context=mp.get_context(start_method)) as executor:
+        return list(executor.map(_regenerate, replays, [verify] * len(replays)))
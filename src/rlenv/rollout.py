@@ -0,0 +1,98 @@
+from typing import Any, Callable, Iterator, Optional
+import numpy as np
+import numpy.typing as npt
+
+from .models import RLEnv, Observation, Episode
+from .rate_limiter import RateLimiter
+
+Policy = Callable[[Observation], npt.ArrayLike | tuple[npt.ArrayLike, npt.ArrayLike]]
+"""A policy returns the actions to take, or a tuple (actions, action probabilities)."""
+
+
+class _EpisodeArrays:
+    """Preallocated arrays in which the steps of an episode are written. The capacity doubles when it is reached."""
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.arrays = dict[str, np.ndarray]()
+
+    def write(self, key: str, t: int, value: npt.ArrayLike, dtype: npt.DTypeLike = np.float32):
+        array = self.arrays.get(key)
+        if array is None:
+            value = np.asarray(value)
+            array = np.empty((self.capacity + 1, *value.shape), dtype=dtype)
+            self.arrays[key] = array
+        elif t >= len(array):
+            grown = np.empty((2 * (len(array) - 1) + 1, *array.shape[1:]), dtype=array.dtype)
+            grown[: len(array)] = array
+            array = grown
+            self.arrays[key] = array
+        array[t] = value
+
+    def get(self, key: str, length: int) -> np.ndarray:
+        """A copy of the first `length` items of the array"""
+        return self.arrays[key][:length].copy()
+
+
+def rollout(env: RLEnv, policy: Policy, n_episodes: int, rate_limiter: Optional[RateLimiter] = None) -> Iterator[Episode]:
+    """
+    Run `n_episodes` episodes of `env` with the given policy and yield them as soon as they are finished.
+
+    The steps are directly written in preallocated arrays, without creating `Transition`s nor going through an
+    `EpisodeBuilder`. If the policy returns a tuple (actions, probabilities), the probabilities are stored in
+    `Episode.actions_probs`.
+
+    If a `rate_limiter` is given, each episode is inserted in it (one item per transition) before being yielded, which
+    blocks when the consumer of the episodes samples too slowly.
+    """
+    arrays = _EpisodeArrays()
+    for _ in range(n_episodes):
+        obs = env.reset()
+        t = 0
+        done = truncated = False
+        score = 0.0
+        has_probs = False
+        has_alive = obs.alive is not None
+        info: dict[str, Any] = {}
+        while not (done or truncated):
+            _write_observation(arrays, t, obs)
+            action = policy(obs)
+            if isinstance(action, tuple):
+                action, probs = action
+                arrays.write("probs", t, probs)
+                has_probs = True
+            action = np.asarray(action)
+            arrays.write("actions", t, action, action.dtype)
+            obs, reward, done, truncated, info = env.step(action)
+            arrays.write("rewards", t, reward)
+            score += float(np.sum(reward))
+            t += 1
+        _write_observation(arrays, t, obs)
+        metrics = {key: int(value) if isinstance(value, bool) else value for key, value in info.items()}
+        metrics["score"] = score
+        metrics["episode_length"] = t
+        episode = Episode(
+            _observations=arrays.get("data", t + 1),
+            _extras=arrays.get("extras", t + 1),
+            actions=arrays.get("actions", t),
+            rewards=arrays.get("rewards", t),
+            _available_actions=arrays.get("available_actions", t + 1),
+            _states=arrays.get("states", t + 1),
+            actions_probs=arrays.get("probs", t) if has_probs else None,
+            metrics=metrics,
+            episode_len=t,
+            is_done=done,
+            alive_masks=arrays.get("alive", t + 1) if has_alive else None,
+        )
+        if rate_limiter is not None:
+            rate_limiter.insert_chunked(t)
+        yield episode
+
+
+def _write_observation(arrays: _EpisodeArrays, t: int, obs: Observation):
+    arrays.write("data", t, obs.data)
+    arrays.write("extras", t, obs.extras)
+    arrays.write("available_actions", t, obs.available_actions, np.bool_)
+    arrays.write("states", t, obs.state)
+    if obs.alive is not None:
+        arrays.write("alive", t, obs.alive, np.bool_)
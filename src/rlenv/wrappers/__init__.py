@@ -9,6 +9,13 @@ from .available_actions_wrapper import AvailableActions
 from .blind_wrapper import Blind
 from .centralised import Centralised
 from .available_actions_mask import AvailableActionsMask
+from .action_repeat import ActionRepeat
+from .frame_stack import FrameStack
+from .normalization import NormalizeObservations, NormalizeRewards
+from .scalarize import Scalarize
+from .reward_shaping import RewardShaping, ClipRewards, ScaleRewards, PotentialShaping
+from .count_bonus import CountBonus, HashCounter
+from .reset_cache import ResetCache
 
 __all__ = [
     "RLEnvWrapper",
@@ -24,4 +31,16 @@ __all__ = [
     "AvailableActions",
     "Blind",
     "Centralised",
+    "ActionRepeat",
+    "FrameStack",
+    "NormalizeObservations",
+    "NormalizeRewards",
+    "Scalarize",
+    "RewardShaping",
+    "ClipRewards",
+    "ScaleRewards",
+    "PotentialShaping",
+    "CountBonus",
+    "HashCounter",
+    "ResetCache",
 ]
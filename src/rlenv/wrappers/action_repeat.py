@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import TypeVar
+import numpy as np
+
+from rlenv.models import ActionSpace
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+@dataclass
+class ActionRepeat(RLEnvWrapper[A]):
+    """
+    Repeats the joint action `n_repeats` times and sums the rewards. The repetition stops as soon as the episode is done
+    or truncated.
+
+    - Only the observation of the last step is returned, such that the wrappers added on top of this one only build their
+    extras once per repeated action. The intermediate observations are discarded with `Observation.expire()`, which means
+    that their `state` and `available_actions` are not computed with lazy environments.
+    - If `max_pool` is True, the observation data is the element-wise maximum of the last two observations (to remove
+    flickering in pixel environments). There is no pooling when the episode ends before the last repetition.
+    """
+
+    n_repeats: int
+    max_pool: bool
+
+    def __init__(self, env: RLEnv[A], n_repeats: int, max_pool: bool = False):
+        assert n_repeats >= 1, "The number of repeats must be at least 1"
+        super().__init__(env)
+        self.n_repeats = n_repeats
+        self.max_pool = max_pool
+        self._previous_data = None
+
+    def step(self, actions):
+        total_reward = np.zeros(self.reward_space.shape, dtype=np.float32)
+        has_previous = False
+        for i in range(self.n_repeats):
+            obs, reward, done, truncated, info = self.wrapped.step(actions)
+            total_reward += reward
+            if done or truncated:
+                break
+            if self.max_pool and i == self.n_repeats - 2:
+                # The buffers of the observation might be reused by the wrapped environment, so we copy the data
+                if self._previous_data is None or self._previous_data.shape != obs.data.shape:
+                    self._previous_data = np.empty_like(obs.data)
+                np.copyto(self._previous_data, obs.data)
+                has_previous = True
+            if i < self.n_repeats - 1:
+                obs.expire()
+        if has_previous:
+            obs.data = np.maximum(self._previous_data, obs.data, out=self._output_buffer("data", obs.data.shape, obs.data.dtype))
+        return obs, total_reward, done, truncated, info
@@ -19,5 +19,6 @@ class AgentId(RLEnvWrapper):
         return self._add_one_hot(super().reset())
 
     def _add_one_hot(self, observation: Observation):
-        observation.extras = np.concatenate([observation.extras, self._identity], axis=-1)
+        extras = self._output_buffer("extras", (self.n_agents, *self.extra_feature_shape))
+        observation.extras = np.concatenate([observation.extras, self._identity], axis=-1, out=extras)
         return observation
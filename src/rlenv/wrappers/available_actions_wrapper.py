@@ -1,7 +1,7 @@
 import numpy as np
 import numpy.typing as npt
 from typing import TypeVar
-from rlenv.models import ActionSpace, RLEnv
+from rlenv.models import ActionSpace, RLEnv, Observation
 from .rlenv_wrapper import RLEnvWrapper
 
 A = TypeVar("A", bound=ActionSpace)
@@ -15,10 +15,14 @@ class AvailableActions(RLEnvWrapper[A]):
 
     def reset(self):
         obs = self.wrapped.reset()
-        obs.extras = np.concatenate([obs.extras, self.available_actions().astype(np.float32)], axis=-1)
+        self._add_available_actions(obs)
         return obs
 
     def step(self, actions: npt.NDArray[np.int32]):
         obs, reward, done, truncated, info = self.wrapped.step(actions)
-        obs.extras = np.concatenate([obs.extras, self.available_actions().astype(np.float32)], axis=-1)
+        self._add_available_actions(obs)
         return obs, reward, done, truncated, info
+
+    def _add_available_actions(self, obs: Observation):
+        extras = self._output_buffer("extras", (self.n_agents, *self.extra_feature_shape))
+        obs.extras = np.concatenate([obs.extras, self.available_actions()], axis=-1, out=extras)
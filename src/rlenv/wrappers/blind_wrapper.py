@@ -22,5 +22,7 @@ class Blind(RLEnvWrapper[A]):
     def step(self, actions: npt.NDArray[np.int64,]):
         obs, r, done, trunc, info = super().step(actions)
         if random.random() < self.p:
-            obs.data = np.zeros_like(obs.data)
+            data = self._output_buffer("data", obs.data.shape, obs.data.dtype)
+            data.fill(0)
+            obs.data = data
         return obs, r, done, trunc, info
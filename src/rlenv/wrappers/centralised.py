@@ -52,10 +52,9 @@ class Centralised(RLEnvWrapper[A]):
         return available_actions.reshape((self.n_agents, self.n_actions))
 
     def _joint_observation(self, obs: Observation):
-        obs.data = np.concatenate(obs.data, axis=0)
-        obs.extras = np.concatenate(obs.extras, axis=0)
-        # Unsqueze the first dimension since there is one agent
-        obs.data = np.expand_dims(obs.data, axis=0)
-        obs.extras = np.expand_dims(obs.extras, axis=0)
+        # Concatenate the agents along the first dimension and add a leading dimension since there is one agent.
+        # The reshape only creates a view when the arrays are contiguous.
+        obs.data = obs.data.reshape((1, -1, *obs.data.shape[2:]))
+        obs.extras = obs.extras.reshape((1, -1, *obs.extras.shape[2:]))
         obs.available_actions = self.available_actions()
         return obs
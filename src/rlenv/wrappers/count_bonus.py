@@ -0,0 +1,146 @@
+from typing import Optional, TypeVar
+import numpy as np
+import numpy.typing as npt
+
+from rlenv.models import ActionSpace
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+_GOLDEN_RATIO = np.uint64(0x9E3779B97F4A7C15)
+
+
+class HashCounter:
+    """
+    Counts occurrences of 64 bits keys in an open-addressing hash table (linear probing) backed by numpy arrays.
+
+    The table grows by doubling until it can hold `max_entries` keys. When it is full, new keys are not inserted and
+    are considered as seen once.
+    """
+
+    def __init__(self, max_entries: int = 1_000_000, initial_capacity: int = 1024):
+        assert max_entries > 0
+        self.max_entries = max_entries
+        self._allocate(max(16, 1 << (initial_capacity - 1).bit_length()))
+        self.size = 0
+
+    def _allocate(self, capacity: int):
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._counts = np.zeros(capacity, dtype=np.uint32)
+        self._used = np.zeros(capacity, dtype=np.bool_)
+        self._shift = np.uint64(64 - (capacity.bit_length() - 1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the table"""
+        return self._keys.nbytes + self._counts.nbytes + self._used.nbytes
+
+    def _slots(self, keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint64]:
+        # Fibonacci hashing
+        return (keys * _GOLDEN_RATIO) >> self._shift
+
+    def increment(self, keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint32]:
+        """Increment the count of each key and return the updated counts."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        # Keep the load factor below 0.5
+        while self.size + len(keys) > self.capacity // 2 and self.capacity < 2 * self.max_entries:
+            self._grow()
+        counts = np.ones(len(keys), dtype=np.uint32)
+        mask = self.capacity - 1
+        for i, (key, slot) in enumerate(zip(keys, self._slots(keys).tolist())):
+            while self._used[slot] and self._keys[slot] != key:
+                slot = (slot + 1) & mask
+            if not self._used[slot]:
+                if self.size >= self.max_entries:
+                    continue
+                self._used[slot] = True
+                self._keys[slot] = key
+                self.size += 1
+            self._counts[slot] += 1
+            counts[i] = self._counts[slot]
+        return counts
+
+    def get(self, keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint32]:
+        """The count of each key (0 for unseen keys)."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        counts = np.zeros(len(keys), dtype=np.uint32)
+        mask = self.capacity - 1
+        for i, (key, slot) in enumerate(zip(keys, self._slots(keys).tolist())):
+            while self._used[slot]:
+                if self._keys[slot] == key:
+                    counts[i] = self._counts[slot]
+                    break
+                slot = (slot + 1) & mask
+        return counts
+
+    def _grow(self):
+        keys = self._keys[self._used]
+        counts = self._counts[self._used]
+        self._allocate(self.capacity * 2)
+        mask = self.capacity - 1
+        for key, count, slot in zip(keys, counts, self._slots(keys).tolist()):
+            while self._used[slot]:
+                slot = (slot + 1) & mask
+            self._used[slot] = True
+            self._keys[slot] = key
+            self._counts[slot] = count
+
+    def __len__(self):
+        return self.size
+
+
+class CountBonus(RLEnvWrapper[A]):
+    """
+    Count-based exploration bonus (Tang et al., 2017) added to the reward of each objective.
+
+    The observation data is hashed with SimHash, i.e. the signs of a random projection, computed for all the agents with a
+    single matrix product. The bonus is `beta / sqrt(n)` where `n` is the number of times the hash has been seen.
+    - If `joint` is True, the joint observation of all the agents is hashed.
+    - Otherwise, each agent observation is hashed and the bonus is the mean bonus of the agents.
+    """
+
+    beta: float
+    n_bits: int
+    joint: bool
+
+    def __init__(
+        self,
+        env: RLEnv[A],
+        beta: float = 0.01,
+        n_bits: int = 32,
+        joint: bool = False,
+        max_entries: int = 1_000_000,
+        seed: Optional[int] = None,
+    ):
+        assert 0 < n_bits <= 64, "The number of bits must be between 1 and 64"
+        super().__init__(env)
+        self.beta = beta
+        self.n_bits = n_bits
+        self.joint = joint
+        input_size = int(np.prod(env.observation_shape))
+        if joint:
+            input_size *= env.n_agents
+        rng = np.random.default_rng(seed)
+        self._projection = rng.standard_normal((input_size, n_bits)).astype(np.float32)
+        self._powers = np.left_shift(np.uint64(1), np.arange(n_bits, dtype=np.uint64))
+        self.counter = HashCounter(max_entries)
+
+    def hash(self, data: npt.NDArray[np.float32]) -> npt.NDArray[np.uint64]:
+        """The SimHash of the observation data, with one key per agent (or a single key if `joint`)."""
+        if self.joint:
+            data = data.reshape(1, -1)
+        else:
+            data = data.reshape(self.n_agents, -1)
+        bits = (data @ self._projection) > 0
+        return np.bitwise_or.reduce(np.where(bits, self._powers, np.uint64(0)), axis=-1)
+
+    def step(self, actions):
+        obs, reward, done, truncated, info = super().step(actions)
+        counts = self.counter.increment(self.hash(obs.data))
+        bonus = self.beta * np.mean(1.0 / np.sqrt(counts))
+        reward = np.add(reward, bonus, dtype=np.float32)
+        return obs, reward, done, truncated, info
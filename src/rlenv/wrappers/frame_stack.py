@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Optional, TypeVar
+import numpy as np
+import numpy.typing as npt
+
+from rlenv.models import ActionSpace, Observation
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+@dataclass
+class FrameStack(RLEnvWrapper[A]):
+    """
+    Stacks the last `n_frames` observations of each agent along the first dimension of the observation data, such that
+    the observation shape becomes `(n_frames * obs_shape[0], *obs_shape[1:])`. On reset, the first observation is
+    repeated `n_frames` times.
+
+    The frames are written in a preallocated buffer and the stacked observation is a view on that buffer. When the end of
+    the buffer is reached, the last `n_frames - 1` frames are moved to its beginning, which overwrites the views. The
+    view is only returned as is when buffer reuse is enabled with `RLEnv.reuse_buffers(size)`, in which case the stacked
+    data remains valid during `max(n_frames, size)` steps. Otherwise, it is copied such that observations can be kept.
+    """
+
+    n_frames: int
+
+    def __init__(self, env: RLEnv[A], n_frames: int):
+        assert n_frames >= 1, "At least one frame must be stacked"
+        super().__init__(env, observation_shape=(env.observation_shape[0] * n_frames, *env.observation_shape[1:]))
+        self.n_frames = n_frames
+        self._frames: Optional[npt.NDArray] = None
+        self._position = 0
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        super().reuse_buffers(size, debug)
+        # The buffer must be large enough for the stacked views to remain valid during `size` steps
+        self._frames = None
+
+    def reset(self):
+        obs = super().reset()
+        if self._frames is None or self._frames.dtype != obs.data.dtype:
+            # With this length, a stacked view is only overwritten `max(n_frames, size)` steps after its creation
+            length = 2 * self.n_frames - 2 + max(self.n_frames, self._buffer_ring_size)
+            self._frames = np.zeros((self.n_agents, length, *self.wrapped.observation_shape), dtype=obs.data.dtype)
+        self._frames[:, : self.n_frames] = obs.data[:, np.newaxis]
+        self._position = self.n_frames - 1
+        return self._stack(obs)
+
+    def step(self, actions):
+        obs, *rest = super().step(actions)
+        assert self._frames is not None, "FrameStack must be reset before stepping"
+        self._position += 1
+        if self._position == self._frames.shape[1]:
+            if self.n_frames > 1:
+                self._frames[:, : self.n_frames - 1] = self._frames[:, -(self.n_frames - 1) :]
+            self._position = self.n_frames - 1
+        self._frames[:, self._position] = obs.data
+        return self._stack(obs), *rest
+
+    def _snapshot_state(self):
+        if self._frames is None:
+            return None
+        start = self._position - self.n_frames + 1
+        return self._frames[:, start : self._position + 1].copy()
+
+    def _restore_state(self, state: Optional[npt.NDArray]):
+        if state is None:
+            self._frames = None
+            return
+        if self._frames is None or self._frames.dtype != state.dtype:
+            length = 2 * self.n_frames - 2 + max(self.n_frames, self._buffer_ring_size)
+            self._frames = np.zeros((self.n_agents, length, *self.wrapped.observation_shape), dtype=state.dtype)
+        self._frames[:, : self.n_frames] = state
+        self._position = self.n_frames - 1
+
+    def _stack(self, obs: Observation):
+        assert self._frames is not None
+        start = self._position - self.n_frames + 1
+        stacked = self._frames[:, start : self._position + 1].reshape((self.n_agents, *self.observation_shape))
+        if self._buffer_ring_size == 0:
+            stacked = stacked.copy()
+        obs.data = stacked
+        return obs
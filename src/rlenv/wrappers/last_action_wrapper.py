@@ -13,6 +13,7 @@ class LastAction(RLEnvWrapper):
             env,
             extra_feature_shape=(env.extra_feature_shape[0] + env.n_actions,),
         )
+        self._agents = np.arange(env.n_agents)
 
     def reset(self):
         obs = super().reset()
@@ -24,9 +25,11 @@ class LastAction(RLEnvWrapper):
         return obs_, r, done, truncated, info
 
     def _add_last_action(self, obs: Observation, last_actions: npt.NDArray[np.int32] | None):
-        one_hot_actions = np.zeros((self.n_agents, self.n_actions), dtype=np.float32)
+        extras = self._output_buffer("extras", (self.n_agents, *self.extra_feature_shape))
+        n_extras = obs.extras.shape[-1]
+        extras[:, :n_extras] = obs.extras
+        extras[:, n_extras:] = 0.0
         if last_actions is not None:
-            index = np.arange(self.n_agents)
-            one_hot_actions[index, last_actions] = 1.0
-        obs.extras = np.concatenate([obs.extras, one_hot_actions], axis=-1)
+            extras[self._agents, n_extras + np.asarray(last_actions)] = 1.0
+        obs.extras = extras
         return obs
@@ -0,0 +1,129 @@
+from typing import Optional, TypeVar
+import numpy as np
+
+from rlenv.models import ActionSpace, Observation, RunningMeanStd
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+class _Normalizer(RLEnvWrapper[A]):
+    """
+    Common logic of the normalization wrappers.
+
+    The statistics are kept twice: `statistics` are the ones used for normalization, and the updates since the last call
+    to `pop_updates` are kept aside. To synchronise N workers, each worker sends its `pop_updates()` to a central
+    process that `merge`s them in the global statistics, and sends them back with `load_statistics`.
+    """
+
+    statistics: dict[str, RunningMeanStd]
+    frozen: bool
+
+    def __init__(self, env: RLEnv[A], statistics: dict[str, RunningMeanStd], epsilon: float, clip: Optional[float]):
+        super().__init__(env)
+        self.statistics = statistics
+        self._updates = {key: RunningMeanStd(stats.shape) for key, stats in statistics.items()}
+        self.epsilon = epsilon
+        self.clip = clip
+        self.frozen = False
+
+    def freeze(self):
+        """Stop updating the statistics (e.g. for evaluation)"""
+        self.frozen = True
+
+    def unfreeze(self):
+        self.frozen = False
+
+    def _update(self, key: str, batch: np.ndarray):
+        if not self.frozen:
+            self.statistics[key].update(batch)
+            self._updates[key].update(batch)
+
+    def pop_updates(self) -> dict[str, RunningMeanStd]:
+        """The statistics of the samples seen since the last call to this method."""
+        updates = self._updates
+        self._updates = {key: RunningMeanStd(stats.shape) for key, stats in updates.items()}
+        return updates
+
+    def load_statistics(self, statistics: dict[str, RunningMeanStd]):
+        """
+        Replace the statistics, typically with the global ones. The samples seen since the last call to `pop_updates`
+        are not part of the global statistics yet and are merged back.
+        """
+        for key, stats in statistics.items():
+            stats = stats.copy()
+            stats.merge(self._updates[key])
+            self.statistics[key] = stats
+
+
+class NormalizeObservations(_Normalizer[A]):
+    """
+    Normalizes the observation data (and optionally the extras) with the running mean and variance of each feature.
+    The statistics are shared by all the agents.
+    """
+
+    def __init__(self, env: RLEnv[A], normalize_extras: bool = False, clip: Optional[float] = None, epsilon: float = 1e-8):
+        statistics = {"data": RunningMeanStd(env.observation_shape)}
+        if normalize_extras:
+            statistics["extras"] = RunningMeanStd(env.extra_feature_shape)
+        super().__init__(env, statistics, epsilon, clip)
+        self.normalize_extras = normalize_extras
+
+    def reset(self):
+        return self._normalize(super().reset())
+
+    def step(self, actions):
+        obs, *rest = super().step(actions)
+        return self._normalize(obs), *rest
+
+    def _normalize(self, obs: Observation):
+        self._update("data", obs.data)
+        out = self._output_buffer("data", obs.data.shape)
+        obs.data = self.statistics["data"].normalize(obs.data, self.epsilon, self.clip, out=out)
+        if self.normalize_extras:
+            self._update("extras", obs.extras)
+            out = self._output_buffer("extras", obs.extras.shape)
+            obs.extras = self.statistics["extras"].normalize(obs.extras, self.epsilon, self.clip, out=out)
+        return obs
+
+
+class NormalizeRewards(_Normalizer[A]):
+    """
+    Scales the (multi-objective) rewards by the running standard deviation of the discounted returns of each objective.
+    The rewards are not centered, such that their sign is preserved. The rewards are not scaled until at least two returns
+    have been observed, since the variance of a single return is zero.
+    """
+
+    gamma: float
+
+    def __init__(self, env: RLEnv[A], gamma: float = 0.99, clip: Optional[float] = None, epsilon: float = 1e-8):
+        super().__init__(env, {"returns": RunningMeanStd(env.reward_space.shape)}, epsilon, clip)
+        self.gamma = gamma
+        self._returns = np.zeros(env.reward_space.shape, dtype=np.float64)
+
+    def reset(self):
+        self._returns.fill(0.0)
+        return super().reset()
+
+    def step(self, actions):
+        obs, reward, done, truncated, info = super().step(actions)
+        self._returns *= self.gamma
+        self._returns += reward
+        self._update("returns", self._returns[np.newaxis])
+        stats = self.statistics["returns"]
+        if stats.count < 2:
+            reward = np.array(reward, dtype=np.float32)
+        else:
+            reward = (reward / np.sqrt(stats.var + self.epsilon)).astype(np.float32)
+        if self.clip is not None:
+            np.clip(reward, -self.clip, self.clip, out=reward)
+        if done or truncated:
+            self._returns.fill(0.0)
+        return obs, reward, done, truncated, info
+
+    def _snapshot_state(self):
+        # The running statistics are learnt across episodes and are not part of the snapshot
+        return self._returns.copy()
+
+    def _restore_state(self, state: np.ndarray):
+        self._returns[:] = state
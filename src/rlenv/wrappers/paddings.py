@@ -1,4 +1,3 @@
-import numpy as np
 from dataclasses import dataclass
 from rlenv.models import Observation
 from .rlenv_wrapper import RLEnvWrapper, RLEnv
@@ -23,7 +22,11 @@ class PadExtras(RLEnvWrapper):
         return self._add_extras(super().reset())
 
     def _add_extras(self, obs: Observation):
-        obs.extras = np.concatenate([obs.extras, np.zeros((obs.n_agents, self.n), dtype=np.float32)], axis=-1)
+        extras = self._output_buffer("extras", (obs.n_agents, *self.extra_feature_shape))
+        n_extras = obs.extras.shape[-1]
+        extras[:, :n_extras] = obs.extras
+        extras[:, n_extras:] = 0.0
+        obs.extras = extras
         return obs
 
 
@@ -43,5 +46,9 @@ class PadObservations(RLEnvWrapper):
         return self._add_obs(super().reset())
 
     def _add_obs(self, obs: Observation):
-        obs.data = np.concatenate([obs.data, np.zeros((obs.n_agents, self.n), dtype=np.float32)], axis=-1)
+        data = self._output_buffer("data", (obs.n_agents, *self.observation_shape))
+        n_features = obs.data.shape[-1]
+        data[:, :n_features] = obs.data
+        data[:, n_features:] = 0.0
+        obs.data = data
         return obs
@@ -1,18 +1,26 @@
 from dataclasses import dataclass
+from typing import TypeVar
 import numpy as np
 import numpy.typing as npt
-from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+from rlenv.models import ActionSpace
+from .reward_shaping import RewardShaping
+from .rlenv_wrapper import RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
 
 
 @dataclass
-class TimePenalty(RLEnvWrapper):
-    penalty: float
+class TimePenalty(RewardShaping[A]):
+    """Subtracts a penalty from the reward of each objective at every time step"""
+
+    penalty: float | npt.NDArray[np.float32]
 
-    def __init__(self, env: RLEnv, penalty: float):
+    def __init__(self, env: RLEnv[A], penalty: float | npt.ArrayLike):
         super().__init__(env)
+        if not isinstance(penalty, (int, float)):
+            penalty = np.broadcast_to(np.asarray(penalty, dtype=np.float32), env.reward_space.shape)
         self.penalty = penalty
 
-    def step(self, action: npt.NDArray[np.int64]):
-        obs, reward, *rest = self.wrapped.step(action)
-        reward = [r - self.penalty for r in reward]
-        return obs, reward, *rest
+    def _shape(self, reward, out, obs, done):
+        np.subtract(reward, self.penalty, out=out)
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from itertools import cycle
+from typing import Any, Iterable, Optional, TypeVar
+import queue
+import threading
+
+from rlenv.models import ActionSpace, Observation
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+@dataclass
+class ResetCache(RLEnvWrapper[A]):
+    """
+    Serves `reset()` from a pool of pre-generated initial states, for environments whose reset is expensive.
+
+    An initial state is generated by resetting the `generator` (the wrapped environment by default), optionally after
+    seeding it with the next value of `seeds`, and is captured with `snapshot()`. Resetting the environment then only
+    restores a snapshot of the pool, and each initial state is served `max_uses` times before being discarded.
+
+    - Without background refill, the pool is filled on demand (or explicitly with `fill()`).
+    - With `background=True`, a thread keeps the pool full. Since environments are not thread-safe, this requires a
+    separate `generator` environment, with the same wrappers as the wrapped one such that their snapshots are compatible.
+    """
+
+    pool_size: int
+    max_uses: int
+
+    def __init__(
+        self,
+        env: RLEnv[A],
+        pool_size: int = 16,
+        max_uses: int = 1,
+        seeds: Optional[Iterable[int]] = None,
+        generator: Optional[RLEnv[A]] = None,
+        background: bool = False,
+    ):
+        assert pool_size >= 1, "The pool must contain at least one initial state"
+        assert max_uses >= 1, "Each initial state must be used at least once"
+        if background and (generator is None or generator is env):
+            raise ValueError("A background refill requires a separate generator environment")
+        super().__init__(env)
+        self.pool_size = pool_size
+        self.max_uses = max_uses
+        self.generator = generator or env
+        self.n_generated = 0
+        self._seeds = cycle(seeds) if seeds is not None else None
+        self._pool = queue.Queue[tuple[Any, Observation]](maxsize=pool_size)
+        self._current: Optional[tuple[Any, Observation]] = None
+        self._uses_left = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._refill, daemon=True)
+            self._thread.start()
+
+    def _reset_generator(self) -> Observation:
+        if self._seeds is not None:
+            self.generator.seed(next(self._seeds))
+        obs = self.generator.reset().copy()
+        self.n_generated += 1
+        return obs
+
+    def _generate(self) -> tuple[Any, Observation]:
+        obs = self._reset_generator()
+        return self.generator.snapshot(), obs
+
+    def _refill(self):
+        while not self._stop.is_set():
+            item = self._generate()
+            while not self._stop.is_set():
+                try:
+                    self._pool.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def fill(self):
+        """Fill the pool with new initial states, without interrupting the current episode of the wrapped environment"""
+        assert self._thread is None, "The pool is already filled in the background"
+        token = self.wrapped.snapshot() if self.generator is self.wrapped else None
+        while not self._pool.full():
+            self._pool.put_nowait(self._generate())
+        if token is not None:
+            self.wrapped.restore(token)
+
+    def reset(self):
+        if self._uses_left == 0:
+            if self._thread is not None or not self._pool.empty():
+                self._current = self._pool.get()
+                self._uses_left = self.max_uses
+            elif self.generator is not self.wrapped:
+                self._current = self._generate()
+                self._uses_left = self.max_uses
+            else:
+                # The wrapped environment is already in the new initial state, so there is nothing to restore
+                obs = self._reset_generator()
+                if self.max_uses > 1:
+                    self._current = (self.wrapped.snapshot(), obs)
+                    self._uses_left = self.max_uses - 1
+                    return obs.copy()
+                return obs
+        assert self._current is not None
+        self._uses_left -= 1
+        token, obs = self._current
+        self.wrapped.restore(token)
+        return obs.copy()
+
+    def close(self):
+        """Stop the background refill"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
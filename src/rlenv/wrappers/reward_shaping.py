@@ -0,0 +1,99 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+import numpy as np
+import numpy.typing as npt
+
+from rlenv.models import ActionSpace, Observation
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+class RewardShaping(RLEnvWrapper[A], ABC):
+    """
+    Parent class for the wrappers that transform the rewards.
+
+    The shaped rewards are new float32 arrays of shape `reward_space.shape`, such that shaping wrappers can be stacked
+    without converting the rewards. Rewards are never written in reused buffers since they are stored by the consumers
+    (e.g. `EpisodeBuilder`) and cost almost nothing to allocate.
+    """
+
+    def step(self, actions):
+        obs, reward, done, truncated, info = self.wrapped.step(actions)
+        out = np.empty(self.reward_space.shape, dtype=np.float32)
+        self._shape(reward, out, obs, done)
+        return obs, out, done, truncated, info
+
+    @abstractmethod
+    def _shape(self, reward: npt.NDArray[np.float32], out: npt.NDArray[np.float32], obs: Observation, done: bool):
+        """Write the shaped `reward` into `out`"""
+
+
+@dataclass
+class ClipRewards(RewardShaping[A]):
+    """Clips the rewards of each objective in [low, high]"""
+
+    low: npt.NDArray[np.float32]
+    high: npt.NDArray[np.float32]
+
+    def __init__(self, env: RLEnv[A], low: float | npt.ArrayLike, high: float | npt.ArrayLike):
+        super().__init__(env)
+        self.low = np.broadcast_to(np.asarray(low, dtype=np.float32), env.reward_space.shape)
+        self.high = np.broadcast_to(np.asarray(high, dtype=np.float32), env.reward_space.shape)
+        assert np.all(self.low <= self.high), "The lower bounds must be smaller than the upper bounds"
+
+    def _shape(self, reward, out, obs, done):
+        np.clip(reward, self.low, self.high, out=out)
+
+
+@dataclass
+class ScaleRewards(RewardShaping[A]):
+    """Multiplies the reward of each objective by its scale factor"""
+
+    scale: npt.NDArray[np.float32]
+
+    def __init__(self, env: RLEnv[A], scale: float | npt.ArrayLike):
+        super().__init__(env)
+        self.scale = np.broadcast_to(np.asarray(scale, dtype=np.float32), env.reward_space.shape)
+
+    def _shape(self, reward, out, obs, done):
+        np.multiply(reward, self.scale, out=out)
+
+
+class PotentialShaping(RewardShaping[A]):
+    """
+    Potential-based reward shaping (Ng et al., 1999), which does not change the optimal policy.
+
+    The shaping term `gamma * potential(s') - potential(s)` is added to the reward, where the potential is computed on
+    the environment state (`get_state()`) and returns either a scalar or one value per objective. The potential of
+    terminal states is 0.
+    """
+
+    gamma: float
+
+    def __init__(self, env: RLEnv[A], potential: Callable[[npt.NDArray[np.float32]], float | npt.NDArray[np.float32]], gamma: float = 0.99):
+        super().__init__(env)
+        self.potential = potential
+        self.gamma = gamma
+        self._previous_potential = np.zeros(env.reward_space.shape, dtype=np.float32)
+
+    def reset(self):
+        obs = super().reset()
+        self._previous_potential[:] = self.potential(self.get_state())
+        return obs
+
+    def _shape(self, reward, out, obs, done):
+        if done:
+            potential = 0.0
+        else:
+            potential = self.potential(self.get_state())
+        np.subtract(reward, self._previous_potential, out=out)
+        out += self.gamma * np.asarray(potential, dtype=np.float32)
+        self._previous_potential[:] = potential
+
+    def _snapshot_state(self):
+        return self._previous_potential.copy()
+
+    def _restore_state(self, state: npt.NDArray[np.float32]):
+        self._previous_potential[:] = state
@@ -1,9 +1,9 @@
-from typing import TypeVar, Literal, overload, Optional
+from typing import Any, TypeVar, Literal, overload, Optional
 from dataclasses import dataclass
 from abc import ABC
 import numpy as np
 import numpy.typing as npt
-from rlenv.models import RLEnv, ActionSpace, DiscreteSpace
+from rlenv.models import RLEnv, ActionSpace, DiscreteSpace, BufferRing
 
 A = TypeVar("A", bound=ActionSpace)
 
@@ -38,6 +38,8 @@ class RLEnvWrapper(RLEnv[A], ABC):
         else:
             self.full_name = f"{self.__class__.__name__}({env.name})"
         self.name = env.name
+        self._buffer_rings = dict[str, BufferRing]()
+        self._buffer_ring_size = 0
 
     @property
     def agent_state_size(self):
@@ -68,3 +70,37 @@ class RLEnvWrapper(RLEnv[A], ABC):
 
     def seed(self, seed_value: int):
         return self.wrapped.seed(seed_value)
+
+    def snapshot(self):
+        return self.wrapped.snapshot(), self._snapshot_state()
+
+    def restore(self, snapshot):
+        wrapped_snapshot, state = snapshot
+        self.wrapped.restore(wrapped_snapshot)
+        self._restore_state(state)
+
+    def _snapshot_state(self) -> Any:
+        """The state of the wrapper itself to capture in snapshots. Stateless wrappers do not override this method."""
+        return None
+
+    def _restore_state(self, state: Any):
+        """Restore the state returned by `_snapshot_state`."""
+
+    def reuse_buffers(self, size: int = 2, debug: bool = False):
+        self.wrapped.reuse_buffers(size, debug)
+        self._buffer_rings = dict[str, BufferRing]()
+        self._buffer_ring_size = size
+
+    def _output_buffer(self, key: str, shape: tuple[int, ...], dtype: npt.DTypeLike = np.float32) -> np.ndarray:
+        """
+        Array in which the wrapper should write its output for `key`.
+
+        The array comes from a ring of preallocated buffers if buffer reuse is enabled, otherwise it is a new array.
+        """
+        if self._buffer_ring_size == 0:
+            return np.empty(shape, dtype=dtype)
+        ring = self._buffer_rings.get(key)
+        if ring is None or ring.shape != shape:
+            ring = BufferRing(shape, dtype, self._buffer_ring_size)
+            self._buffer_rings[key] = ring
+        return ring.next()
@@ -0,0 +1,48 @@
+from typing import Optional, TypeVar
+import numpy as np
+import numpy.typing as npt
+
+from rlenv.models import ActionSpace, DiscreteSpace, LinearScalarization
+from .rlenv_wrapper import RLEnvWrapper, RLEnv
+
+A = TypeVar("A", bound=ActionSpace)
+
+
+class Scalarize(RLEnvWrapper[A]):
+    """
+    Scalarizes the multi-objective rewards with W weight vectors at once. The reward space becomes of size W, where each
+    dimension is the reward for one preference weighting.
+
+    In this way, a single rollout gives the rewards, returns and scores of all the weightings. At the end of an episode,
+    the score of each weighting is added to the `info` dictionary with key `score_<label>`, which the `EpisodeBuilder`
+    puts in the `Episode.metrics`. Episodes that are truncated by a wrapper on top of this one do not get these scores.
+    """
+
+    scalarization: LinearScalarization
+
+    def __init__(self, env: RLEnv[A], weights: npt.ArrayLike | LinearScalarization, labels: Optional[list[str]] = None):
+        if not isinstance(weights, LinearScalarization):
+            weights = LinearScalarization(weights, labels)
+        assert weights.n_objectives == env.reward_space.size, f"Expected {env.reward_space.size} objectives, got {weights.n_objectives}"
+        super().__init__(env, reward_space=DiscreteSpace(weights.n_weights, weights.labels))
+        self.scalarization = weights
+        self._scores = np.zeros(weights.n_weights, dtype=np.float32)
+
+    def reset(self):
+        self._scores.fill(0.0)
+        return super().reset()
+
+    def step(self, actions):
+        obs, reward, done, truncated, info = super().step(actions)
+        reward = self.scalarization(reward)
+        self._scores += reward
+        if done or truncated:
+            for label, score in zip(self.scalarization.labels, self._scores):
+                info[f"score_{label}"] = float(score)
+        return obs, reward, done, truncated, info
+
+    def _snapshot_state(self):
+        return self._scores.copy()
+
+    def _restore_state(self, state: np.ndarray):
+        self._scores[:] = state
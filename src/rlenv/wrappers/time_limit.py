@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from typing import Optional, TypeVar
-import numpy as np
 
 from rlenv.models import ActionSpace, Observation
 from .rlenv_wrapper import RLEnvWrapper, RLEnv
@@ -66,10 +65,14 @@ class TimeLimit(RLEnvWrapper[A]):
             reward -= self.truncation_penalty
         return obs_, reward, done, truncated, info
 
+    def _snapshot_state(self):
+        return self._current_step
+
+    def _restore_state(self, state: int):
+        self._current_step = state
+
     def add_time_extra(self, obs: Observation):
-        time_ratio = np.full(
-            (self.n_agents, 1),
-            self._current_step / self.step_limit,
-            dtype=np.float32,
-        )
-        obs.extras = np.concatenate([obs.extras, time_ratio], axis=-1)
+        extras = self._output_buffer("extras", (self.n_agents, *self.extra_feature_shape))
+        extras[:, :-1] = obs.extras
+        extras[:, -1] = self._current_step / self.step_limit
+        obs.extras = extras
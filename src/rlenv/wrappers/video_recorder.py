@@ -56,6 +56,13 @@ class VideoRecorder(RLEnvWrapper):
         self._video_count += 1
         return res
 
+    def _snapshot_state(self):
+        # The frames that have already been written can not be removed from the video file
+        return self._video_count
+
+    def _restore_state(self, state: int):
+        self._video_count = state
+
     def __del__(self):
         if self._recorder is not None:
             self._recorder.release()
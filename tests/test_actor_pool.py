@@ -0,0 +1,93 @@
+import os
+import numpy as np
+from rlenv import ActorPool, MockEnv, RateLimiter
+
+
+def make_env():
+    return MockEnv(2, end_game=5)
+
+
+class ConstantPolicy:
+    def __init__(self):
+        self.action = 0
+
+    def set_weights(self, action: int):
+        self.action = action
+
+    def __call__(self, obs):
+        return np.full(2, self.action)
+
+
+class CrashingPolicy(ConstantPolicy):
+    def __call__(self, obs):
+        if self.action == 0:
+            # Simulate a hard crash of the worker
+            os._exit(1)
+        return super().__call__(obs)
+
+
+def test_actor_pool_episodes():
+    with ActorPool(make_env, ConstantPolicy(), n_workers=2, queue_size=2) as pool:
+        episodes = list(pool.episodes(6))
+    assert len(episodes) == 6
+    for episode in episodes:
+        assert len(episode) == 5
+        assert np.all(episode.actions == 0)
+
+
+def test_actor_pool_update_weights():
+    with ActorPool(make_env, ConstantPolicy(), n_workers=2, queue_size=2) as pool:
+        pool.update_weights(3)
+        # The episodes in the queue may have been produced with the old weights
+        for episode in pool.episodes(50):
+            if np.all(episode.actions == 3):
+                break
+        else:
+            assert False, "The workers did not apply the new weights"
+
+
+def test_actor_pool_restarts_workers():
+    pool = ActorPool(make_env, CrashingPolicy(), n_workers=1, max_restarts=3)
+    pool.start()
+    try:
+        list(pool.episodes(1, timeout=0.2))
+        assert False, "The workers always crash, so a RuntimeError should be raised"
+    except RuntimeError:
+        pass
+    finally:
+        pool.close()
+    assert pool.n_restarts == 3
+
+    pool = ActorPool(make_env, CrashingPolicy(), n_workers=1, max_restarts=3)
+    # Workers started after a weight update use the latest weights
+    pool.update_weights(1)
+    with pool:
+        (episode,) = list(pool.episodes(1, timeout=0.2))
+    assert np.all(episode.actions == 1)
+
+
+def test_actor_pool_restarts_workers_while_queue_is_fed():
+    with ActorPool(make_env, ConstantPolicy(), n_workers=2, queue_size=2) as pool:
+        episodes = pool.episodes(timeout=10.0)
+        next(episodes)
+        pool._processes[0].kill()
+        pool._processes[0].join()
+        # The other worker keeps the queue fed, so getting an episode never times out
+        for _ in range(5):
+            next(episodes)
+        assert pool.n_restarts == 1
+        assert all(process.is_alive() for process in pool._processes)
+
+
+def test_actor_pool_rate_limiter_single_thread():
+    limiter = RateLimiter(samples_per_insert=1.0, min_size_to_sample=5, error_buffer=10)
+    with ActorPool(make_env, ConstantPolicy(), n_workers=2, queue_size=2) as pool:
+        n_episodes = 0
+        for _ in range(10):
+            # The iteration stops when the learner must sample before receiving more episodes
+            n_episodes += len(list(pool.episodes(10, rate_limiter=limiter)))
+            while limiter.sample(timeout=0):
+                pass
+        assert 10 <= n_episodes < 100
+        diff = limiter.n_inserts * limiter.samples_per_insert - limiter.n_samples
+        assert limiter.min_diff <= diff <= limiter.max_diff
@@ -147,3 +147,109 @@ def test_pymarl():
     reward, done, _ = env.step([0] * N_AGENTS)
     assert reward == REWARD_STEP
     assert done
+
+
+def test_gym_adapter_reuse_buffers():
+    env = rlenv.make("CartPole-v1")
+    env.reuse_buffers(size=2)
+    obs0 = env.reset()
+    obs1, *_ = env.step(np.array([0]))
+    obs2, *_ = env.step(np.array([0]))
+    assert obs0 is obs2
+    assert obs1.data.shape == (1, *env.observation_shape)
+
+
+try:
+    from gymnasium import spaces
+    from pettingzoo import ParallelEnv
+
+    class _LeavingAgents(ParallelEnv):
+        """Agent `i` leaves the episode after `i + 1` steps, and observations are returned in reverse order."""
+
+        metadata = {"name": "leaving_agents"}
+
+        def __init__(self, n_agents: int = 3):
+            self.possible_agents = [f"agent_{i}" for i in range(n_agents)]
+            self.agents = list(self.possible_agents)
+            self.t = 0
+
+        def observation_space(self, agent):
+            return spaces.Box(-np.inf, np.inf, (2,), dtype=np.float32)
+
+        def action_space(self, agent):
+            return spaces.Discrete(4)
+
+        def _obs(self):
+            return {agent: np.full(2, self.possible_agents.index(agent) + 1, dtype=np.float32) for agent in reversed(self.agents)}
+
+        def reset(self, seed=None, options=None):
+            self.agents = list(self.possible_agents)
+            self.t = 0
+            return self._obs(), {agent: {} for agent in self.agents}
+
+        def step(self, actions):
+            assert set(actions) == set(self.agents)
+            self.t += 1
+            term = {agent: self.possible_agents.index(agent) + 1 <= self.t for agent in self.agents}
+            reward = {agent: 1.0 for agent in self.agents}
+            self.agents = [agent for agent in self.agents if not term[agent]]
+            trunc = {agent: False for agent in term}
+            return self._obs(), reward, term, trunc, {agent: {} for agent in term}
+
+    def test_pettingzoo_adapter_agents_leaving():
+        env = rlenv.adapters.PettingZoo(_LeavingAgents())
+        obs = env.reset()
+        # The observations are ordered as `possible_agents`, whatever the order of the dictionaries
+        assert np.array_equal(obs.data[:, 0], [1, 2, 3])
+        assert obs.alive is not None and obs.alive.all()
+
+        obs, reward, done, truncated, _ = env.step(np.zeros(3, dtype=np.int64))
+        assert np.array_equal(obs.data[:, 0], [0, 2, 3])
+        assert np.array_equal(obs.alive, [False, True, True])
+        assert reward.tolist() == [3.0]
+        assert not done and not truncated
+
+        obs, reward, done, truncated, _ = env.step(np.zeros(3, dtype=np.int64))
+        assert np.array_equal(obs.alive, [False, False, True])
+        assert reward.tolist() == [2.0]
+        assert not done
+
+        obs, _, done, truncated, _ = env.step(np.zeros(3, dtype=np.int64))
+        assert not obs.alive.any()
+        assert done and not truncated
+
+    def test_pettingzoo_adapter_alive_masks_in_episode():
+        env = rlenv.adapters.PettingZoo(_LeavingAgents())
+        env.reuse_buffers(size=2)
+        episode = next(rlenv.rollout(env, lambda obs: np.zeros(3, dtype=np.int64), 1))
+        assert episode.episode_len == 3
+        assert episode.alive_masks is not None
+        assert episode.alive_masks.tolist() == [
+            [True, True, True],
+            [False, True, True],
+            [False, False, True],
+            [False, False, False],
+        ]
+        assert episode.padded(5).alive_masks is not None
+        assert not episode.padded(5).alive_masks[4:].any()
+        # The buffers are recycled at each reset, including the alive masks
+        obs = env.reset()
+        assert np.array_equal(obs.data[:, 0], [1, 2, 3])
+        assert obs.alive is not None and obs.alive.all()
+
+    def test_pettingzoo_adapter_restore_alive():
+        env = rlenv.adapters.PettingZoo(_LeavingAgents())
+        env.reset()
+        env.step(np.zeros(3, dtype=np.int64))
+        snapshot = env.snapshot()
+        env.step(np.zeros(3, dtype=np.int64))
+        assert env.alive.tolist() == [False, False, True]
+        env.restore(snapshot)
+        assert env.alive.tolist() == [False, True, True]
+        # The snapshot can be restored several times
+        env.step(np.zeros(3, dtype=np.int64))
+        env.restore(snapshot)
+        assert env.alive.tolist() == [False, True, True]
+except ImportError:
+    # Skip the test if pettingzoo is not installed
+    pass
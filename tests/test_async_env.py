@@ -0,0 +1,54 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from rlenv import MockEnv, ThreadedAsyncEnv
+from rlenv.models import gather_reset, gather_step
+
+
+class SlowEnv(MockEnv):
+    """Environment whose steps wait for I/O"""
+
+    def step(self, action):
+        time.sleep(0.05)
+        return super().step(action)
+
+
+def test_threaded_async_env():
+    async def run():
+        env = ThreadedAsyncEnv(MockEnv(2, end_game=3))
+        assert env.n_agents == 2
+        obs = await env.reset()
+        assert np.all(obs.state == 0)
+        done = False
+        t = 0
+        while not done:
+            obs, reward, done, truncated, info = await env.step(np.array([0, 1]))
+            t += 1
+        assert t == 3
+        assert np.all(await env.get_state() == 3)
+        assert np.all(await env.available_actions())
+
+    asyncio.run(run())
+
+
+def test_gather_step_concurrently():
+    N_ENVS = 40
+
+    async def run():
+        executor = ThreadPoolExecutor(max_workers=N_ENVS)
+        envs = [ThreadedAsyncEnv(SlowEnv(2), executor) for _ in range(N_ENVS)]
+        observations = await gather_reset(envs)
+        assert len(observations) == N_ENVS
+        start = time.perf_counter()
+        steps = await gather_step(envs, [np.array([0, i % 5]) for i in range(N_ENVS)])
+        duration = time.perf_counter() - start
+        executor.shutdown()
+        return steps, duration
+
+    steps, duration = asyncio.run(run())
+    assert len(steps) == N_ENVS
+    assert all(np.all(obs.state == 1) for obs, *_ in steps)
+    # Sequential steps would take N_ENVS * 0.05 = 2 seconds
+    assert duration < 1.0
@@ -0,0 +1,81 @@
+from rlenv.benchmarks import BenchmarkResult, EpisodeScale, Scale, compare, load_results, save_results, run_episode_benchmarks
+from rlenv.benchmarks import run_serialization_benchmarks
+from rlenv.benchmarks.__main__ import DEFAULT_BASELINE, main
+from rlenv.benchmarks.stepping import run_stepping_benchmarks, wrapper_cases, builder_cases, adapter_cases
+
+
+def test_stepping_benchmarks_run():
+    cases = wrapper_cases() | builder_cases() | adapter_cases()
+    results = run_stepping_benchmarks([Scale(2, 8, 3)], n_steps=20, cases=cases)
+    assert len(results) == len(cases) - 2  # The Gym cases only apply to single-agent scales
+    for result in results:
+        assert result.metrics["steps_per_s"] > 0
+        assert result.metrics["latency_p50_us"] <= result.metrics["latency_p99_us"]
+
+
+def test_results_roundtrip(tmp_path):
+    results = run_stepping_benchmarks([Scale(1, 8, 3)], n_steps=10, name_filter="AgentId")
+    path = str(tmp_path / "results.json")
+    save_results(results, path)
+    loaded = load_results(path)
+    assert [r.key for r in loaded] == [r.key for r in results]
+    assert compare(results, loaded) == []
+
+
+def test_compare_detects_regressions():
+    baseline = [BenchmarkResult("stepping", "env", {"n_agents": 1}, {"steps_per_s": 1000.0, "latency_p50_us": 10.0})]
+    slower = [BenchmarkResult("stepping", "env", {"n_agents": 1}, {"steps_per_s": 700.0, "latency_p50_us": 11.0})]
+    regressions = compare(slower, baseline, threshold=0.2)
+    assert [r.metric for r in regressions] == ["steps_per_s"]
+    assert compare(slower, baseline, threshold=0.5) == []
+    # Benchmarks that are not in the baseline are ignored
+    other = [BenchmarkResult("stepping", "env", {"n_agents": 2}, {"steps_per_s": 1.0})]
+    assert compare(other, baseline) == []
+
+
+def test_episode_benchmarks_run():
+    results = run_episode_benchmarks([EpisodeScale(10, 2, 4)], n_repeats=2)
+    assert {r.name for r in results} >= {"EpisodeBuilder.add", "EpisodeBuilder.build", "Episode.padded", "Episode.compute_returns"}
+    for result in results:
+        assert result.metrics["time_min_us"] <= result.metrics["time_mean_us"]
+        assert result.metrics["peak_memory_kib"] >= 0
+
+
+def test_serialization_benchmarks_run():
+    results = run_serialization_benchmarks([EpisodeScale(10, 2, 4)], n_repeats=2)
+    assert {r.name for r in results} >= {"Transition/Decoder.decode", "Transition/pickle.loads", "Episode/wire.encode"}
+    for result in results:
+        assert result.metrics["time_min_us"] <= result.metrics["time_mean_us"]
+
+
+def test_main_with_baseline(tmp_path, capsys):
+    path = str(tmp_path / "results.json")
+    assert main(["stepping", "--quick", "--steps", "10", "--filter", "AgentId", "--output", path, "--no-baseline"]) == 0
+    # A huge threshold can not report regressions
+    assert main(["stepping", "--quick", "--steps", "10", "--filter", "AgentId", "--baseline", path, "--threshold", "1000"]) == 0
+    assert "No regression" in capsys.readouterr().out
+
+
+def test_default_baseline():
+    baseline = load_results(DEFAULT_BASELINE)
+    assert {r.suite for r in baseline} == {"stepping", "episodes", "serialization"}
+
+
+def test_main_missing_baseline(tmp_path, capsys):
+    try:
+        main(["stepping", "--quick", "--baseline", str(tmp_path / "missing.json")])
+        assert False, "A missing baseline should be reported"
+    except SystemExit as e:
+        assert e.code != 0
+    assert "not found" in capsys.readouterr().err
+
+
+def test_main_runs_all_suites_by_default(tmp_path):
+    path = str(tmp_path / "results.json")
+    assert main(["--quick", "--steps", "10", "--repeats", "1", "--filter", "Transition", "--no-baseline", "--output", path]) == 0
+    assert {r.suite for r in load_results(path)} == {"episodes", "serialization"}
+    try:
+        main(["unknown", "--no-baseline"])
+        assert False, "Unknown suites should be rejected"
+    except SystemExit as e:
+        assert e.code != 0
@@ -1,5 +1,6 @@
 import numpy as np
-from rlenv.models import EpisodeBuilder, Transition, Episode, RLEnv
+from rlenv.models import EpisodeBuilder, Transition, Episode, RLEnv, Observation
+import rlenv
 from rlenv import wrappers, MockEnv
 
 
@@ -185,3 +186,135 @@ def test_episode_with_logprobs():
     episode = generate_episode(env, with_probs=True)
     assert episode.actions_probs is not None
     assert len(episode.actions_probs) == 10
+
+
+def test_episode_builder_with_lazy_env():
+    env = MockEnv(2, end_game=10, lazy=True)
+    obs = env.reset()
+    builder = EpisodeBuilder()
+    while not builder.is_finished:
+        action = env.action_space.sample()
+        next_obs, r, done, truncated, info = env.step(action)
+        builder.add(Transition(obs, action, r, done, info, next_obs, truncated))
+        obs = next_obs
+    episode = builder.build()
+    assert np.array_equal(episode.states[:, 0], np.arange(10, dtype=np.float32))
+    assert episode.available_actions.shape == (10, 2, env.n_actions)
+
+
+def test_linear_scalarization():
+    from rlenv.models import LinearScalarization
+
+    env = MockEnv(2, n_objectives=3, end_game=10)
+    episode = generate_episode(env)
+    weights = np.random.random((100, 3)).astype(np.float32)
+    scalarization = LinearScalarization(weights)
+    returns = scalarization.returns(episode, discount=0.9)
+    assert returns.shape == (10, 100)
+    expected = episode.compute_returns(0.9) @ weights.T
+    assert np.allclose(returns, expected)
+    scalarization.add_metrics(episode)
+    for i in range(100):
+        assert abs(episode.metrics[f"score_w{i}"] - float(episode.rewards.sum(axis=0) @ weights[i])) < 1e-4
+
+
+def test_scalarize_wrapper_metrics():
+    weights = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 2.0]])
+    env = rlenv.Builder(MockEnv(2, n_objectives=2, end_game=10)).scalarize(weights, ["a", "b", "c"]).build()
+    assert env.reward_space.size == 3
+    episode = generate_episode(env)
+    assert episode.rewards.shape == (10, 3)
+    assert episode.metrics["score_a"] == 10.0
+    assert episode.metrics["score_b"] == 10.0
+    assert episode.metrics["score_c"] == 20.0
+
+
+def test_rollout_same_as_episode_builder():
+    def policy(obs):
+        return np.array([obs.data[0, 0] % 5, 1], dtype=np.int64)
+
+    env = wrappers.TimeLimit(MockEnv(2, end_game=100, extras_size=2), 70)
+    (episode,) = list(rlenv.rollout(env, policy, 1))
+
+    obs = env.reset()
+    builder = EpisodeBuilder()
+    while not builder.is_finished:
+        action = policy(obs)
+        next_obs, r, done, truncated, info = env.step(action)
+        builder.add(Transition(obs, action, r, done, info, next_obs, truncated))
+        obs = next_obs
+    expected = builder.build()
+
+    assert len(episode) == len(expected) == 70
+    assert np.array_equal(episode._observations, expected._observations)
+    assert np.array_equal(episode._extras, expected._extras)
+    assert np.array_equal(episode._states, expected._states)
+    assert np.array_equal(episode._available_actions, expected._available_actions)
+    assert np.array_equal(episode.actions, expected.actions)
+    assert np.array_equal(episode.rewards, expected.rewards)
+    assert episode.metrics == expected.metrics
+    assert episode.is_done == expected.is_done
+    assert episode.actions_probs is None
+
+
+def test_rollout_with_probs():
+    env = MockEnv(2, end_game=5)
+
+    def policy(obs):
+        return env.action_space.sample(), np.full((2, env.n_actions), 1 / env.n_actions)
+
+    episodes = list(rlenv.rollout(env, policy, 3))
+    assert len(episodes) == 3
+    for episode in episodes:
+        assert len(episode) == 5
+        assert episode.is_done
+        assert episode.actions_probs is not None
+        assert episode.actions_probs.shape == (5, 2, env.n_actions)
+
+
+def _stack(observations: list[Observation]) -> Observation:
+    return Observation(
+        np.stack([o.data for o in observations]),
+        np.stack([o.available_actions for o in observations]),
+        np.stack([o.state for o in observations]),
+        np.stack([o.extras for o in observations]),
+    )
+
+
+def test_batch_episode_builder():
+    END_GAMES = [3, 100, 7]
+    envs = [MockEnv(2, end_game=end_game) for end_game in END_GAMES]
+    builder = rlenv.BatchEpisodeBuilder(len(envs), initial_capacity=4)
+    observations = [env.reset() for env in envs]
+    episodes = {i: list[Episode]() for i in range(len(envs))}
+    for _ in range(100):
+        actions = np.array([[i, 1] for i in range(len(envs))])
+        steps = [env.step(action) for env, action in zip(envs, actions)]
+        next_observations = [step[0] for step in steps]
+        finished = builder.add(
+            _stack(observations),
+            actions,
+            np.stack([step[1] for step in steps]),
+            [step[2] for step in steps],
+            [step[3] for step in steps],
+            _stack(next_observations),
+            [step[4] for step in steps],
+        )
+        for i, episode in finished.items():
+            episodes[i].append(episode)
+            next_observations[i] = envs[i].reset()
+        observations = next_observations
+
+    assert len(episodes[0]) == 33
+    assert len(episodes[1]) == 1
+    assert len(episodes[2]) == 14
+    for i, env_episodes in episodes.items():
+        (expected,) = list(rlenv.rollout(MockEnv(2, end_game=END_GAMES[i]), lambda obs: np.array([i, 1]), 1))
+        for episode in env_episodes:
+            assert len(episode) == END_GAMES[i]
+            assert episode.is_done
+            assert np.array_equal(episode._observations, expected._observations)
+            assert np.array_equal(episode._states, expected._states)
+            assert np.array_equal(episode.actions, expected.actions)
+            assert np.array_equal(episode.rewards, expected.rewards)
+            assert episode.metrics == expected.metrics
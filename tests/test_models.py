@@ -1,4 +1,5 @@
-from rlenv import Observation, Transition, MockEnv
+from rlenv import Builder, Observation, Transition, MockEnv, StackProfiler
+from rlenv.models import RunningMeanStd, QuantileSketch, EpisodeStatistics, StatisticsWriter
 import numpy as np
 
 
@@ -74,6 +75,22 @@ def test_obs_hash():
     assert hash(obs1) == hash(obs2)
 
 
+def test_obs_eq_alive():
+    data = np.arange(6, dtype=np.float32).reshape(3, 2)
+    available_actions = np.full((3, 5), True)
+    state = np.ones(10, dtype=np.float32)
+    always_alive = Observation(data, available_actions, state)
+    all_alive = Observation(data, available_actions, state, alive=np.full(3, True))
+    one_dead = Observation(data, available_actions, state, alive=np.array([True, False, True]))
+
+    # No alive mask means that all the agents are alive
+    assert always_alive == all_alive
+    assert hash(always_alive) == hash(all_alive)
+    assert always_alive != one_dead
+    assert one_dead != always_alive
+    assert one_dead == Observation(data, available_actions, state, alive=np.array([True, False, True]))
+
+
 def test_transition_eq():
     t1 = Transition(
         obs=Observation(
@@ -205,3 +222,214 @@ def test_multi_objective_env():
     env.reset()
     reward = env.step([0] * N_AGENTS)[1]
     assert len(reward) == N_OBJECTVES
+
+
+def test_lazy_obs_fields():
+    calls = []
+
+    def state():
+        calls.append("state")
+        return np.ones(10, dtype=np.float32)
+
+    obs = Observation(np.arange(20, dtype=np.float32), lambda: np.full((5,), True), state)
+    assert not obs.is_resolved
+    assert len(calls) == 0
+    assert np.array_equal(obs.state, np.ones(10, dtype=np.float32))
+    assert np.array_equal(obs.state, np.ones(10, dtype=np.float32))
+    assert calls == ["state"]
+    assert not obs.is_resolved
+    obs.resolve()
+    assert obs.is_resolved
+
+
+def test_lazy_obs_eq_and_hash():
+    eager = Observation(np.arange(20, dtype=np.float32), np.full((5,), True), np.ones(10, dtype=np.float32))
+    lazy = Observation(np.arange(20, dtype=np.float32), lambda: np.full((5,), True), lambda: np.ones(10, dtype=np.float32))
+    assert eager == lazy
+    lazy = Observation(np.arange(20, dtype=np.float32), lambda: np.full((5,), True), lambda: np.ones(10, dtype=np.float32))
+    assert hash(eager) == hash(lazy)
+
+
+def test_lazy_mock_env():
+    env = MockEnv(2, lazy=True)
+    obs = env.reset()
+    assert not obs.is_resolved
+    obs.resolve()
+    obs_, *_ = env.step([0, 0])
+    # The state is computed with the time step of the observation
+    assert np.all(obs.state == 0)
+    assert np.all(obs_.state == 1)
+
+    # The observation is resolved before the environment steps
+    obs, *_ = env.step([0, 0])
+    env.step([0, 0])
+    assert obs.is_resolved
+    assert np.all(obs.state == 2)
+
+    # Observations that are not kept are never resolved
+    calls = []
+    get_state = env.get_state
+
+    def counted_get_state():
+        calls.append(env.t)
+        return get_state()
+
+    env.get_state = counted_get_state
+    for _ in range(50):
+        env.step([0, 0])
+    assert len(calls) == 0
+
+    # Expired fields are never computed
+    obs, *_ = env.step([0, 0])
+    obs.expire()
+    env.step([0, 0])
+    try:
+        obs.state
+        assert False, "Reading an expired lazy field should raise a ValueError"
+    except ValueError:
+        pass
+
+
+def test_running_mean_std():
+    data = np.random.normal(3.0, 2.0, size=(1000, 4))
+    stats = RunningMeanStd((4,))
+    for batch in np.split(data, 10):
+        stats.update(batch)
+    assert stats.count == 1000
+    assert np.allclose(stats.mean, data.mean(axis=0))
+    assert np.allclose(stats.var, data.var(axis=0))
+
+
+def test_running_mean_std_merge():
+    data1 = np.random.normal(3.0, 2.0, size=(100, 4))
+    data2 = np.random.normal(-1.0, 0.5, size=(300, 4))
+    stats1 = RunningMeanStd((4,))
+    stats1.update(data1)
+    stats2 = RunningMeanStd((4,))
+    stats2.update(data2)
+    stats1.merge(RunningMeanStd.from_dict(stats2.to_dict()))
+    all_data = np.concatenate([data1, data2])
+    assert stats1.count == 400
+    assert np.allclose(stats1.mean, all_data.mean(axis=0))
+    assert np.allclose(stats1.var, all_data.var(axis=0))
+
+
+def test_env_hooks():
+    env = Builder(MockEnv(2, end_game=5)).time_limit(10).build()
+    resets, steps, episodes = [], [], []
+    s1 = env.subscribe("reset", resets.append)
+    s2 = env.subscribe("step", steps.append, batch_size=3)
+    s3 = env.subscribe("episode_end", episodes.append)
+    assert "step" in env.__dict__
+    env.reset()
+    done = truncated = False
+    while not (done or truncated):
+        _, _, done, truncated, _ = env.step(np.array([0, 0]))
+    assert len(resets) == 1
+    # 5 steps in batches of 3: one batch delivered, 2 events pending
+    assert len(steps) == 1 and len(steps[0]) == 3
+    s2.flush()
+    assert len(steps) == 2 and len(steps[1]) == 2
+    assert len(episodes) == 1
+    assert episodes[0].episode_length == 5
+    assert np.array_equal(episodes[0].score, [5.0])
+    for subscription in (s1, s2, s3):
+        subscription.unsubscribe()
+    # Without subscribers, the methods of the class are used again
+    assert "step" not in env.__dict__ and "reset" not in env.__dict__ and "_hooks" not in env.__dict__
+    env.reset()
+    assert len(resets) == 1
+
+
+def test_env_hooks_with_profiler():
+    env = MockEnv(2)
+    steps = []
+    subscription = env.subscribe("step", steps.append)
+    with StackProfiler(env):
+        env.reset()
+        env.step(np.array([0, 0]))
+    env.step(np.array([0, 0]))
+    assert len(steps) == 2
+    subscription.unsubscribe()
+    assert "step" not in env.__dict__
+
+
+def test_env_hooks_and_profiler_in_any_order():
+    env = MockEnv(2)
+    steps = []
+    # The profiler is stopped while the hooks are installed
+    profiler = StackProfiler(env).start()
+    subscription = env.subscribe("step", steps.append)
+    profiler.stop()
+    env.reset()
+    env.step(np.array([0, 0]))
+    assert len(steps) == 1
+    assert profiler.stats[(0, "step")].n_calls == 0
+    subscription.unsubscribe()
+    assert "step" not in env.__dict__ and "_instrumentation" not in env.__dict__
+
+    # The hooks are removed while the profiler is running
+    subscription = env.subscribe("step", steps.append)
+    profiler = StackProfiler(env).start()
+    subscription.unsubscribe()
+    env.step(np.array([0, 0]))
+    assert len(steps) == 1
+    assert profiler.stats[(0, "step")].n_calls == 1
+    profiler.stop()
+    assert "step" not in env.__dict__ and "reset" not in env.__dict__ and "_hooks" not in env.__dict__
+
+
+def test_quantile_sketch():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 10, 100_000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for chunk in np.split(values, 10):
+        sketch.add(chunk)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        expected = np.quantile(values, q)
+        assert abs(sketch.quantile(q) - expected) <= 0.02 * abs(expected) + 0.05
+    assert len(sketch.positive) + len(sketch.negative) < 2 * 2048
+
+
+def test_quantile_sketch_merge_and_bounded_memory():
+    values = np.geomspace(1e-6, 1e6, 10_000)
+    s1, s2 = QuantileSketch(max_buckets=100), QuantileSketch(max_buckets=100)
+    s1.add(values[::2])
+    s2.add(values[1::2])
+    s1.merge(s2)
+    assert s1.count == len(values)
+    assert len(s1.positive) <= 100
+    # Collapsing only affects the lowest values
+    assert abs(s1.quantile(0.99) - np.quantile(values, 0.99)) <= 0.02 * np.quantile(values, 0.99)
+
+
+def test_episode_statistics(tmp_path):
+    metrics = [{"score": float(i), "episode_length": 10, "won": i % 2 == 0, "name": "x"} for i in range(100)]
+    stats = EpisodeStatistics()
+    stats.add_batch(metrics[:50])
+    other = EpisodeStatistics.from_dict(EpisodeStatistics().to_dict())
+    for m in metrics[50:]:
+        other.add(m)
+    stats.merge(EpisodeStatistics.from_dict(other.to_dict()))
+    summary = stats.summary()
+    assert stats.n_episodes == 100
+    assert "name" not in summary
+    assert summary["score"]["count"] == 100
+    assert np.isclose(summary["score"]["mean"], 49.5)
+    assert np.isclose(summary["score"]["std"], np.std(np.arange(100)))
+    assert abs(summary["score"]["p50"] - 49.5) <= 1.0
+    assert np.isclose(summary["won"]["mean"], 0.5)
+
+    for extension in ("jsonl", "csv"):
+        path = str(tmp_path / f"stats.{extension}")
+        writer = StatisticsWriter(path)
+        stats = EpisodeStatistics(writer=writer, flush_every=10, reset_on_flush=True)
+        stats.add_batch(metrics[:25])
+        stats.add_batch(metrics[25:35])
+        writer.close()
+        lines = open(path).read().splitlines()
+        if extension == "jsonl":
+            assert len(lines) == 2
+        else:
+            # Header and one row per numeric metric and per summary
+            assert len(lines) == 1 + 2 * 3
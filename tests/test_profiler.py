@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from rlenv import Builder, MockEnv, StackProfiler
+from rlenv.wrappers import TimeLimit
+
+
+def test_profiler_per_layer_stats():
+    env = Builder(MockEnv(2)).agent_id().time_limit(10).build()
+    with StackProfiler(env) as profiler:
+        env.reset()
+        for _ in range(5):
+            env.step(np.array([0, 0]))
+    assert [layer.__class__.__name__ for layer in profiler.layers] == ["TimeLimit", "AgentId", "MockEnv"]
+    for depth in range(3):
+        stats = profiler.stats[(depth, "step")]
+        assert stats.n_calls == 5
+        assert 0 <= stats.self_ns <= stats.cumulative_ns
+    # The cumulative time of a layer includes the cumulative time of the layer below
+    assert profiler.stats[(0, "step")].cumulative_ns >= profiler.stats[(1, "step")].cumulative_ns
+    assert "AgentId" in profiler.table()
+
+
+def test_profiler_is_removed_when_stopped():
+    env = TimeLimit(MockEnv(2), 10)
+    profiler = StackProfiler(env).start()
+    assert "step" in env.__dict__
+    profiler.stop()
+    assert "step" not in env.__dict__ and "step" not in env.wrapped.__dict__
+    env.reset()
+    env.step(np.array([0, 0]))
+    assert profiler.stats[(0, "step")].n_calls == 0
+
+
+def test_profiler_trace(tmp_path):
+    env = TimeLimit(MockEnv(2), 10)
+    with StackProfiler(env, trace=True) as profiler:
+        env.reset()
+        env.step(np.array([0, 0]))
+    path = tmp_path / "trace.json"
+    profiler.save_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {event["name"] for event in events} >= {"TimeLimit.step", "MockEnv.step", "MockEnv.reset"}
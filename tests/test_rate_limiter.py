@@ -0,0 +1,81 @@
+import threading
+import time
+from rlenv import RateLimiter, MockEnv, rollout
+import numpy as np
+
+
+def test_min_size_to_sample():
+    limiter = RateLimiter(samples_per_insert=2.0, min_size_to_sample=10, error_buffer=5)
+    assert not limiter.can_sample()
+    assert not limiter.sample(timeout=0.01)
+    assert limiter.insert(10)
+    assert limiter.can_sample()
+
+
+def test_insert_blocks_when_learner_is_behind():
+    limiter = RateLimiter(samples_per_insert=1.0, min_size_to_sample=1, error_buffer=5)
+    for _ in range(6):
+        assert limiter.insert(timeout=0.01)
+    assert not limiter.insert(timeout=0.01)
+    assert limiter.insert_blocked_time > 0
+    assert limiter.sample()
+    assert limiter.insert(timeout=0.01)
+    assert limiter.metrics["inserts"] == 7
+
+
+def test_sample_blocks_when_actors_are_behind():
+    limiter = RateLimiter(samples_per_insert=4.0, min_size_to_sample=1, error_buffer=4)
+    limiter.insert()
+    # The difference 1 * 4 - n_samples must remain above 4 - 4 = 0
+    for _ in range(4):
+        assert limiter.sample(timeout=0.01)
+    assert not limiter.sample(timeout=0.01)
+    assert limiter.sample_blocked_time > 0
+
+
+def test_ratio_with_threads():
+    SPI = 3.0
+    limiter = RateLimiter(samples_per_insert=SPI, min_size_to_sample=5, error_buffer=10)
+    env = MockEnv(2, end_game=5)
+
+    def produce():
+        for _ in rollout(env, lambda obs: np.zeros(2), 50, rate_limiter=limiter):
+            pass
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    n_samples = 0
+    while producer.is_alive() or limiter.can_sample():
+        if limiter.sample(timeout=0.05):
+            n_samples += 1
+            diff = limiter.n_inserts * SPI - limiter.n_samples
+            assert limiter.min_diff <= diff <= limiter.max_diff
+    producer.join()
+    assert limiter.n_inserts == 250
+    assert abs(limiter.n_samples - 250 * SPI) <= limiter.error_buffer + 5 * SPI
+
+
+def test_long_episodes_do_not_deadlock():
+    limiter = RateLimiter(samples_per_insert=1.0)
+    assert limiter.max_chunk_size == 100
+    env = MockEnv(2, end_game=250)
+
+    def produce():
+        for _ in rollout(env, lambda obs: np.zeros(2), 2, rate_limiter=limiter):
+            pass
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    deadline = time.time() + 10.0
+    while (producer.is_alive() or limiter.can_sample()) and time.time() < deadline:
+        limiter.sample(timeout=0.05)
+    assert not producer.is_alive(), "The producer is blocked"
+    assert limiter.n_inserts == 500
+
+    limiter = RateLimiter(samples_per_insert=1.0)
+    limiter.insert()
+    try:
+        limiter.insert(200)
+        assert False, "Inserting more items than the error buffer at once should fail"
+    except AssertionError:
+        pass
@@ -0,0 +1,120 @@
+import time
+from multiprocessing import AuthenticationError
+import numpy as np
+
+from rlenv import MockEnv
+from rlenv.remote import EnvServer, RemoteEnvClient
+
+
+def test_remote_env_matches_local_env():
+    with EnvServer(lambda: MockEnv(4)) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=1)
+        remote = client.envs[0]
+        local = MockEnv(4)
+        assert remote.n_agents == local.n_agents
+        assert remote.observation_shape == local.observation_shape
+        assert remote.reset() == local.reset()
+        for _ in range(5):
+            action = np.zeros(4, dtype=np.int64)
+            remote_obs, remote_reward, remote_done, remote_truncated, _ = remote.step(action)
+            local_obs, local_reward, local_done, local_truncated, _ = local.step(action)
+            assert remote_obs == local_obs
+            assert np.array_equal(remote_reward, local_reward)
+            assert remote_done == local_done and remote_truncated == local_truncated
+        assert np.array_equal(remote.get_state(), local.get_state())
+        client.close()
+
+
+def test_pipelined_step_all():
+    with EnvServer(lambda: MockEnv(2)) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=3)
+        observations = client.reset_all()
+        assert len(observations) == 3
+        results = client.step_all([np.zeros(2, dtype=np.int64)] * 3)
+        assert len(results) == 3
+        pending = [env.step_async(np.zeros(2, dtype=np.int64)) for env in client.envs]
+        # Results can be collected in any order
+        for p in reversed(pending):
+            obs, *_ = p.result()
+            assert obs.n_agents == 2
+        client.close()
+
+
+def test_reconnect_keeps_session():
+    with EnvServer(lambda: MockEnv(2)) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=1, retry_delay=0.01)
+        env = client.envs[0]
+        env.reset()
+        env.step(np.zeros(2, dtype=np.int64))
+        state_before = env.get_state()
+        # Simulate a lost connection
+        client._sock.close()  # type: ignore
+        assert np.array_equal(env.get_state(), state_before)
+        env.step(np.zeros(2, dtype=np.int64))
+        assert not np.array_equal(env.get_state(), state_before)
+        client.close()
+
+
+def test_remote_exception():
+    with EnvServer(lambda: MockEnv(2)) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=1)
+        try:
+            client.send(0, "render", "human").result()
+            assert False, "Only whitelisted methods can be called remotely"
+        except ValueError:
+            pass
+        client.close()
+
+
+def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_reconnect_does_not_execute_pipelined_steps_twice():
+    with EnvServer(lambda: MockEnv(2)) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=1, retry_delay=0.01)
+        env = client.envs[0]
+        env.reset()
+        pending = [env.step_async(np.zeros(2, dtype=np.int64)) for _ in range(2)]
+        server_env = server._sessions[client._session_id].envs[0]
+        assert _wait_until(lambda: server_env.t == 2)  # type: ignore
+        # The responses are lost with the connection, so both requests are sent again
+        client._sock.close()  # type: ignore
+        states = [p.result()[0].state for p in pending]
+        assert np.all(states[0] == 1) and np.all(states[1] == 2)
+        assert server_env.t == 2  # type: ignore
+        client.close()
+
+
+def test_sessions_are_discarded():
+    with EnvServer(lambda: MockEnv(2), session_timeout=0.2) as server:
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=2)
+        assert server.n_sessions == 1
+        client.close()
+        assert _wait_until(lambda: server.n_sessions == 0)
+
+        # Sessions without connection expire after the timeout
+        client = RemoteEnvClient(*server.address, server.authkey, n_envs=1, max_retries=1, retry_delay=0.01)
+        client._disconnect()
+        assert _wait_until(lambda: server.n_sessions == 0)
+        try:
+            client.envs[0].reset()
+            assert False, "The session has expired"
+        except ValueError:
+            pass
+
+
+def test_authentication():
+    with EnvServer(lambda: MockEnv(2), authkey=b"secret") as server:
+        client = RemoteEnvClient(*server.address, b"secret")
+        assert client.envs[0].reset().n_agents == 2
+        client.close()
+        try:
+            RemoteEnvClient(*server.address, b"wrong key")
+            assert False, "The client should not be able to connect with a wrong key"
+        except AuthenticationError:
+            pass
+        assert _wait_until(lambda: server.n_sessions == 0)
@@ -0,0 +1,41 @@
+from functools import partial
+
+import numpy as np
+
+import rlenv
+from rlenv import Builder, EpisodeReplay, MockEnv
+from rlenv.replay import episode_checksum, regenerate
+
+
+def _record(n_agents: int, n_episodes: int):
+    spec = Builder.from_factory(partial(MockEnv, n_agents, end_game=10)).agent_id().time_limit(8, add_extra=True).spec()
+    env = spec.make()
+    episodes = list(rlenv.rollout(env, lambda obs: np.random.randint(0, env.n_actions, size=n_agents), n_episodes))
+    return [EpisodeReplay.record(spec, None, episode) for episode in episodes], episodes
+
+
+def test_regenerate_episode():
+    replays, episodes = _record(2, 3)
+    for replay, episode in zip(replays, episodes):
+        regenerated = replay.regenerate()
+        assert episode_checksum(regenerated) == episode_checksum(episode)
+        assert regenerated.metrics == episode.metrics
+        assert np.array_equal(regenerated.actions, episode.actions)
+
+
+def test_regenerate_in_parallel():
+    replays, episodes = _record(3, 4)
+    regenerated = regenerate(replays, n_workers=2)
+    assert [episode_checksum(e) for e in regenerated] == [episode_checksum(e) for e in episodes]
+    assert len(regenerate(replays, n_workers=1)) == 4
+
+
+def test_regenerate_detects_mismatch():
+    replays, _ = _record(2, 1)
+    replay = replays[0]
+    replay.actions = (replay.actions + 1) % 5
+    try:
+        replay.regenerate()
+        assert False, "The checksum mismatch should be detected"
+    except ValueError:
+        pass
@@ -1,8 +1,12 @@
+import json
 import pickle
+import numpy as np
 import rlenv
-from dataclasses import asdict
+from functools import partial
 
 from rlenv import MockEnv
+from rlenv.env_builder import _canonical
+from rlenv.models import wire
 
 
 def test_registry():
@@ -34,3 +38,151 @@ def test_registry_wrapper():
     assert restored_env.state_shape == env.state_shape
     assert restored_env.extra_feature_shape == env.extra_feature_shape
     assert restored_env.n_actions == env.n_actions
+
+
+def test_wire_observation():
+    env = rlenv.Builder(MockEnv(4)).agent_id().build()
+    obs = env.reset()
+    message = wire.encode(obs)
+    decoded = wire.decode(bytes(message))
+    assert decoded == obs
+    assert decoded.data.dtype == obs.data.dtype
+    # Decoding is zero-copy
+    assert not decoded.data.flags.owndata
+    assert decoded.alive is None
+
+    obs.alive = np.array([True, False, True, True])
+    decoded = wire.decode(wire.encode(obs))
+    assert np.array_equal(decoded.alive, obs.alive)  # type: ignore
+
+
+def test_wire_transition():
+    env = MockEnv(2)
+    obs = env.reset()
+    action = np.array([0, 1])
+    obs_, reward, done, truncated, info = env.step(action)
+    transition = rlenv.Transition(obs, action, reward, done, info, obs_, truncated, np.full((2, env.n_actions), 0.5))
+    decoded = wire.decode(wire.encode(transition))
+    assert isinstance(decoded, rlenv.Transition)
+    assert decoded == transition
+    assert decoded.truncated == transition.truncated
+    assert np.array_equal(decoded.probs, transition.probs)  # type: ignore
+
+
+def test_wire_episode():
+    env = MockEnv(3)
+    builder = rlenv.EpisodeBuilder()
+    obs = env.reset()
+    while not builder.is_finished:
+        action = env.action_space.sample()
+        obs_, reward, done, truncated, info = env.step(action)
+        builder.add(rlenv.Transition(obs, action, reward, done, info, obs_, truncated))
+        obs = obs_
+    episode = builder.build()
+    decoded = wire.decode(wire.encode(episode))
+    assert isinstance(decoded, rlenv.Episode)
+    assert decoded.episode_len == episode.episode_len
+    assert decoded.metrics == episode.metrics
+    assert decoded.is_done == episode.is_done
+    for t1, t2 in zip(decoded.transitions(), episode.transitions()):
+        assert t1 == t2
+
+
+def test_wire_rejects_garbage():
+    try:
+        wire.decode(pickle.dumps(MockEnv(2)))
+        assert False, "Decoding a pickle should fail"
+    except ValueError:
+        pass
+
+
+def test_wire_stream_sends_schema_once():
+    env = MockEnv(2)
+    encoder, decoder = wire.Encoder(), wire.Decoder()
+    obs = env.reset()
+    obs_ = env.step(np.array([0, 1]))[0]
+    first, second = encoder.encode(obs), encoder.encode(obs_)
+    assert len(second) < len(first)
+    # The layout of the second message is unknown without the first one
+    try:
+        wire.Decoder().decode(second)
+        assert False, "Decoding a message of an unknown layout should fail"
+    except ValueError:
+        pass
+    assert decoder.decode(first) == obs
+    assert decoder.decode(second) == obs_
+
+
+def test_wire_zero_dimensional_arrays():
+    obs = rlenv.Observation(np.zeros((2, 3), dtype=np.float32), np.ones((2, 4), dtype=bool), np.array(3.0, dtype=np.float32))
+    decoded = wire.decode(wire.encode(obs))
+    assert decoded.state.shape == ()
+    assert decoded == obs
+
+
+def test_env_spec_roundtrip():
+    builder = rlenv.Builder.from_factory(partial(MockEnv, 4)).agent_id().time_limit(10, add_extra=True)
+    env = builder.build()
+    spec = builder.spec()
+    assert [name for name, _, _ in spec.operations] == ["agent_id", "time_limit"]
+    restored_spec = pickle.loads(pickle.dumps(spec))
+    assert len(pickle.dumps(spec)) < len(pickle.dumps(env))
+    assert restored_spec.content_hash == spec.content_hash
+    restored_env = restored_spec.make()
+    assert restored_env.extra_feature_shape == env.extra_feature_shape
+    assert restored_env.reset() == env.reset()
+    assert rlenv.make(spec).extra_feature_shape == env.extra_feature_shape
+
+
+def test_env_spec_hash():
+    spec1 = rlenv.Builder.from_factory(partial(MockEnv, 4)).agent_id().time_limit(10).spec()
+    spec2 = rlenv.Builder.from_factory(partial(MockEnv, 4)).agent_id().time_limit(10).spec()
+    spec3 = rlenv.Builder.from_factory(partial(MockEnv, 4)).agent_id().time_limit(20).spec()
+    spec4 = rlenv.Builder.from_factory(partial(MockEnv, 2)).agent_id().time_limit(10).spec()
+    assert spec1.content_hash == spec2.content_hash
+    assert spec1.content_hash != spec3.content_hash
+    assert spec1.content_hash != spec4.content_hash
+
+
+def test_env_spec_gym():
+    spec = rlenv.Builder.from_factory("CartPole-v1").time_limit(50).spec()
+    env = pickle.loads(pickle.dumps(spec)).make()
+    assert env.n_agents == 1
+    assert env.n_actions == 2
+
+
+def test_spec_requires_factory():
+    try:
+        rlenv.Builder(MockEnv(4)).agent_id().spec()
+        assert False, "A builder created from an instance can not produce a spec"
+    except ValueError:
+        pass
+
+
+def test_env_spec_normalizes_arguments():
+    spec1 = rlenv.Builder.from_factory(partial(MockEnv, 4)).time_limit(10).spec()
+    spec2 = rlenv.Builder.from_factory(partial(MockEnv, 4)).time_limit(n_steps=10).spec()
+    spec3 = rlenv.Builder.from_factory(partial(MockEnv, 4)).time_limit(10, False, None).spec()
+    assert spec1.content_hash == spec2.content_hash == spec3.content_hash
+    assert spec1 == spec2 == spec3
+    assert len({spec1, spec2, spec3}) == 1
+
+
+def test_env_spec_hashable_with_arrays():
+    spec = rlenv.Builder.from_factory(partial(MockEnv, 2)).scale_rewards(np.array([0.5])).spec()
+    assert hash(spec) == hash(pickle.loads(pickle.dumps(spec)))
+    # The hash of a module-level factory only depends on its import path
+    assert "0x" not in json.dumps(_canonical(spec.factory))
+
+
+def test_env_spec_rejects_unstable_arguments():
+    try:
+        rlenv.Builder.from_factory(lambda: MockEnv(2)).spec()
+        assert False, "A lambda has no stable representation"
+    except ValueError:
+        pass
+    try:
+        rlenv.Builder.from_factory(partial(MockEnv, 2)).reset_cache(generator=MockEnv(2)).spec()
+        assert False, "An environment instance has no stable representation"
+    except ValueError:
+        pass
@@ -40,7 +40,9 @@ def test_penalty_wrapper():
     done = False
     while not done:
         _, reward, done, *_ = env.step(np.array([0], dtype=np.int64))
-        assert reward == [mock.reward_step - 0.1] * N_OBJECTIVES
+        assert isinstance(reward, np.ndarray)
+        assert reward.dtype == np.float32
+        assert np.allclose(reward, [mock.reward_step - 0.1] * N_OBJECTIVES)
 
 
 def test_time_limit_wrapper():
@@ -235,3 +237,403 @@ def test_available_action_mask():
     assert np.array_equal(obs.available_actions, mask)
     obs, *_ = env.step([0, 1])
     assert np.array_equal(obs.available_actions, mask)
+
+
+def test_reuse_buffers_same_observations():
+    def run(env: rlenv.RLEnv):
+        observations = [env.reset().copy()]
+        for _ in range(10):
+            obs, *_ = env.step(np.array([1, 2]))
+            observations.append(obs.copy())
+        return observations
+
+    def make(reuse: bool):
+        builder = Builder(MockEnv(2, extras_size=3)).agent_id().last_action().available_actions().time_limit(20, add_extra=True)
+        builder = builder.pad("obs", 2).pad("extra", 1)
+        if reuse:
+            builder = builder.reuse_buffers(size=2)
+        return builder.build()
+
+    for expected, actual in zip(run(make(False)), run(make(True))):
+        assert expected == actual
+
+
+def test_reuse_buffers_keeps_rewards():
+    def run(reuse: bool):
+        builder = Builder(MockEnv(2, reward_step=2)).scale_rewards([0.5]).count_bonus(beta=1.0, seed=0)
+        if reuse:
+            builder = builder.reuse_buffers(size=2)
+        env = builder.build()
+        env.reset()
+        return [env.step(np.array([0, 0]))[1] for _ in range(4)]
+
+    # The rewards that are kept by the caller are not overwritten by the next steps
+    expected, actual = run(False), run(True)
+    assert len(set(r.tobytes() for r in expected)) > 1
+    for e, a in zip(expected, actual):
+        assert a.dtype == np.float32
+        assert np.array_equal(e, a)
+
+
+def test_reuse_buffers_mock_env_overridden_methods():
+    class ConstantStateEnv(MockEnv):
+        def get_state(self):
+            return np.full((self.n_agents * self.agent_state_size,), -1.0, dtype=np.float32)
+
+    env = ConstantStateEnv(2)
+    env.reuse_buffers(size=2)
+    env.reset()
+    obs, *_ = env.step(np.array([0, 0]))
+    assert np.all(obs.state == -1.0)
+
+
+def test_reuse_buffers_ring():
+    env = Builder(MockEnv(2)).agent_id().reuse_buffers(size=2).build()
+    obs0 = env.reset()
+    obs1, *_ = env.step(np.array([0, 0]))
+    obs2, *_ = env.step(np.array([0, 0]))
+    assert obs0 is obs2
+    assert obs1 is not obs2
+    assert np.shares_memory(obs0.extras, obs2.extras)
+
+
+def test_reuse_buffers_debug_detects_stale_reads():
+    env = Builder(MockEnv(2)).agent_id().reuse_buffers(size=2, debug=True).build()
+    obs0 = env.reset()
+    obs1, *_ = env.step(np.array([0, 0]))
+    assert obs0.data.shape == (2, env.observation_shape[0])
+    env.step(np.array([0, 0]))
+    assert obs1.extras.shape == (2, 2)
+    try:
+        obs0.data
+        assert False, "Reading a recycled observation should raise a ValueError"
+    except ValueError:
+        pass
+
+
+def test_reuse_buffers_centralised():
+    env = Builder(MockEnv(2)).centralised().reuse_buffers().build()
+    expected = Builder(MockEnv(2)).centralised().build()
+    assert env.reset() == expected.reset()
+    for _ in range(5):
+        assert env.step([3])[0] == expected.step([3])[0]
+
+
+def test_action_repeat():
+    N_OBJECTIVES = 2
+    mock = MockEnv(2, N_OBJECTIVES, end_game=10)
+    env = Builder(mock).action_repeat(3).build()
+    env.reset()
+    obs, reward, done, truncated, _ = env.step(np.array([0, 1]))
+    assert mock.t == 3
+    assert np.array_equal(reward, np.full(N_OBJECTIVES, 3 * mock.reward_step, dtype=np.float32))
+    assert np.all(obs.state == 3)
+    assert not done and not truncated
+    for _ in range(2):
+        env.step(np.array([0, 1]))
+    # Stops early when the episode is done
+    obs, reward, done, truncated, _ = env.step(np.array([0, 1]))
+    assert mock.t == 10
+    assert done
+    assert np.array_equal(reward, np.full(N_OBJECTIVES, mock.reward_step, dtype=np.float32))
+
+
+def test_action_repeat_max_pool():
+    mock = MockEnv(2, end_game=100)
+    env = Builder(mock).action_repeat(4, max_pool=True).build()
+    env.reset()
+    obs, *_ = env.step(np.array([0, 0]))
+    # MockEnv observations increase over time, so the max is the last observation
+    assert np.array_equal(obs.data, mock.observation().data)
+
+
+def test_action_repeat_skips_lazy_fields():
+    mock = MockEnv(2, lazy=True)
+    calls = []
+    get_state = mock.get_state
+
+    def counted_get_state():
+        calls.append(mock.t)
+        return get_state()
+
+    mock.get_state = counted_get_state
+    env = Builder(mock).action_repeat(4).build()
+    env.reset()
+    obs, *_ = env.step(np.array([0, 0]))
+    assert len(calls) == 0
+    assert np.all(obs.state == 4)
+    assert calls == [4]
+
+
+def test_frame_stack():
+    N_FRAMES = 3
+    mock = MockEnv(2, obs_size=4)
+    env = Builder(mock).frame_stack(N_FRAMES).build()
+    assert env.observation_shape == (N_FRAMES * 4,)
+    obs = env.reset()
+    assert obs.data.shape == (2, N_FRAMES * 4)
+    first = mock.observation().data
+    assert np.array_equal(obs.data, np.concatenate([first] * N_FRAMES, axis=-1))
+
+    frames = [first] * N_FRAMES
+    previous = []
+    for _ in range(20):
+        obs, *_ = env.step(np.array([0, 0]))
+        frames.append(mock.observation().data)
+        expected = np.concatenate(frames[-N_FRAMES:], axis=-1)
+        assert np.array_equal(obs.data, expected)
+        previous.append((obs, expected))
+    # Without buffer reuse, the observations remain valid
+    for obs, expected in previous:
+        assert np.array_equal(obs.data, expected)
+
+    # Reset cleanly
+    obs = env.reset()
+    assert np.array_equal(obs.data, np.concatenate([mock.observation().data] * N_FRAMES, axis=-1))
+
+
+def test_frame_stack_episode():
+    N_FRAMES = 3
+    env = Builder(MockEnv(2, obs_size=4, end_game=30)).frame_stack(N_FRAMES).build()
+    obs = env.reset()
+    builder = rlenv.EpisodeBuilder()
+    originals = [obs.data.copy()]
+    while not builder.is_finished:
+        obs_, reward, done, truncated, info = env.step(np.array([0, 0]))
+        originals.append(obs_.data.copy())
+        builder.add(rlenv.Transition(obs, np.array([0, 0]), reward, done, info, obs_, truncated))
+        obs = obs_
+    episode = builder.build()
+    assert episode.episode_len == 30
+    # The frames stored in the episode are not overwritten by the next steps
+    assert np.array_equal(episode.obs, np.array(originals[:-1]))
+    assert np.array_equal(episode.obs_, np.array(originals[1:]))
+
+
+def test_frame_stack_reuse_buffers():
+    N_FRAMES = 4
+    mock = MockEnv(2, obs_size=3)
+    env = Builder(mock).frame_stack(N_FRAMES).reuse_buffers(size=3).build()
+    env.reset()
+    frames = [mock.observation().data.copy()] * N_FRAMES
+    history = []
+    for _ in range(20):
+        obs, *_ = env.step(np.array([0, 0]))
+        frames.append(mock.observation().data.copy())
+        history.append((obs.data, np.concatenate(frames[-N_FRAMES:], axis=-1)))
+        # The stacked views remain valid during `size` steps
+        for data, expected in history[-3:]:
+            assert np.array_equal(data, expected)
+
+
+def test_frame_stack_composition():
+    mock = MockEnv(2, obs_size=4)
+    env = Builder(mock).pad("obs", 1).frame_stack(2).pad("obs", 2).centralised().build()
+    assert env.observation_shape == (2 * (2 * 5 + 2),)
+    obs = env.reset()
+    assert obs.data.shape == (1, *env.observation_shape)
+    obs, *_ = env.step([0])
+    assert obs.data.shape == (1, *env.observation_shape)
+
+
+def test_normalize_observations():
+    env = Builder(MockEnv(2, obs_size=5, extras_size=3)).normalize_observations(normalize_extras=True).build()
+    assert isinstance(env, rlenv.wrappers.NormalizeObservations)
+    env.reset()
+    for _ in range(10):
+        obs, *_ = env.step(np.array([0, 0]))
+    assert obs.data.dtype == np.float32
+    assert obs.data.shape == (2, 5)
+    assert env.statistics["data"].count == 22
+    assert env.statistics["extras"].count == 22
+    # The extras of each agent are constant, so they are standardized to -1 and 1
+    assert np.allclose(obs.extras, [[-1.0] * 3, [1.0] * 3], atol=1e-3)
+
+    env.freeze()
+    env.step(np.array([0, 0]))
+    assert env.statistics["data"].count == 22
+
+
+def test_normalize_observations_synchronisation():
+    from rlenv.models import RunningMeanStd
+
+    workers = [rlenv.wrappers.NormalizeObservations(MockEnv(2, obs_size=5, end_game=100)) for _ in range(3)]
+    global_stats = {"data": RunningMeanStd((5,))}
+    for i, worker in enumerate(workers):
+        worker.reset()
+        for _ in range(i + 1):
+            worker.step(np.array([0, 0]))
+        global_stats["data"].merge(worker.pop_updates()["data"])
+    assert global_stats["data"].count == 2 * (2 + 3 + 4)
+    for worker in workers:
+        worker.load_statistics(global_stats)
+        assert worker.statistics["data"].count == global_stats["data"].count
+        assert np.allclose(worker.statistics["data"].mean, global_stats["data"].mean)
+    # Updates made after the synchronisation are kept
+    workers[0].step(np.array([0, 0]))
+    updates = workers[0].pop_updates()["data"]
+    assert updates.count == 2
+    workers[0].load_statistics(global_stats)
+    assert workers[0].statistics["data"].count == global_stats["data"].count
+
+
+def test_normalize_rewards():
+    N_OBJECTIVES = 3
+    env = Builder(MockEnv(2, N_OBJECTIVES, reward_step=10)).normalize_rewards(gamma=0.9).build()
+    env.reset()
+    returns = []
+    for t in range(20):
+        _, reward, *_ = env.step(np.array([0, 0]))
+        assert isinstance(reward, np.ndarray)
+        assert reward.shape == (N_OBJECTIVES,)
+        assert reward.dtype == np.float32
+        returns.append(10 * (1 - 0.9 ** (t + 1)) / (1 - 0.9))
+        if t == 0:
+            # The first reward is not scaled since the variance of a single return is zero
+            assert np.allclose(reward, 10.0)
+        else:
+            assert np.allclose(reward, 10.0 / np.sqrt(np.var(returns) + 1e-8))
+
+
+def test_reward_shaping_chain():
+    N_OBJECTIVES = 3
+    mock = MockEnv(1, N_OBJECTIVES, reward_step=2)
+    env = Builder(mock).time_penalty(0.5).scale_rewards([1.0, 2.0, -1.0]).clip_rewards(-1.0, 2.5).build()
+    env.reset()
+    _, reward, *_ = env.step(np.array([0]))
+    assert reward.dtype == np.float32
+    assert reward.shape == (N_OBJECTIVES,)
+    assert np.allclose(reward, [1.5, 2.5, -1.0])
+
+
+def test_potential_shaping():
+    GAMMA = 0.9
+    mock = MockEnv(1, end_game=5)
+    # MockEnv's state is filled with the time step
+    env = Builder(mock).potential_shaping(lambda state: float(state[0]), GAMMA).build()
+    env.reset()
+    for t in range(1, 5):
+        _, reward, done, *_ = env.step(np.array([0]))
+        assert not done
+        assert np.allclose(reward, mock.reward_step + GAMMA * t - (t - 1))
+    _, reward, done, *_ = env.step(np.array([0]))
+    assert done
+    assert np.allclose(reward, mock.reward_step - 4)
+
+
+def test_hash_counter():
+    counter = rlenv.wrappers.HashCounter(max_entries=5000, initial_capacity=16)
+    keys = np.random.randint(0, 2**63, size=3000, dtype=np.uint64)
+    assert np.all(counter.increment(keys) == 1)
+    assert np.all(counter.increment(keys[:100]) == 2)
+    assert len(counter) == 3000
+    assert np.all(counter.get(keys[:100]) == 2)
+    assert np.all(counter.get(keys[100:]) == 1)
+    assert counter.get(np.array([2**63 + 1], dtype=np.uint64))[0] == 0
+
+
+def test_hash_counter_memory_cap():
+    counter = rlenv.wrappers.HashCounter(max_entries=100, initial_capacity=16)
+    counter.increment(np.arange(1000, dtype=np.uint64))
+    assert len(counter) == 100
+    assert counter.capacity <= 256
+    # Keys that could not be inserted are seen as new
+    assert np.all(counter.increment(np.arange(900, 1000, dtype=np.uint64)) == 1)
+
+
+def test_count_bonus():
+    BETA = 0.5
+    env = Builder(MockEnv(1, n_objectives=2, end_game=100)).count_bonus(beta=BETA, seed=0).build()
+    env.reset()
+    _, reward, *_ = env.step(np.array([0]))
+    assert reward.shape == (2,)
+    assert np.allclose(reward, 1 + BETA)
+
+    # The same observation is seen twice
+    env.reset()
+    _, reward, *_ = env.step(np.array([0]))
+    assert np.allclose(reward, 1 + BETA / np.sqrt(2))
+
+
+def test_count_bonus_joint():
+    env = rlenv.wrappers.CountBonus(MockEnv(3), joint=True, n_bits=64, seed=1)
+    keys = env.hash(env.reset().data)
+    assert keys.shape == (1,)
+    assert keys.dtype == np.uint64
+
+
+def test_snapshot_restore():
+    env = Builder(MockEnv(2, end_game=100)).time_limit(10, add_extra=True).frame_stack(3).last_action().build()
+    env.reset()
+    for _ in range(3):
+        env.step(np.array([0, 1]))
+    token = env.snapshot()
+    branch1 = [env.step(np.array([1, 0])) for _ in range(4)]
+    env.restore(token)
+    branch2 = [env.step(np.array([1, 0])) for _ in range(4)]
+    for (obs1, r1, d1, t1, _), (obs2, r2, d2, t2, _) in zip(branch1, branch2):
+        assert obs1 == obs2
+        assert np.array_equal(r1, r2)
+        assert d1 == d2 and t1 == t2
+    # The same token can be restored several times
+    env.restore(token)
+    obs, *_ = env.step(np.array([1, 0]))
+    assert obs == branch1[0][0]
+
+
+def test_snapshot_gym():
+    env = rlenv.make("CartPole-v1")
+    env.reset()
+    token = env.snapshot()
+    obs1, *_ = env.step(np.array([0]))
+    env.restore(token)
+    obs2, *_ = env.step(np.array([0]))
+    assert obs1 == obs2
+
+
+def test_reset_cache():
+    env = Builder(MockEnv(2)).time_limit(10, add_extra=True).reset_cache(pool_size=4, max_uses=2).build()
+    assert isinstance(env, rlenv.wrappers.ResetCache)
+    obs1 = env.reset()
+    env.step(np.array([0, 0]))
+    obs2 = env.reset()
+    assert obs1 == obs2
+    assert env.n_generated == 1
+    env.reset()
+    assert env.n_generated == 2
+    env.step(np.array([0, 0]))
+    # Filling the pool does not interrupt the current episode
+    env.fill()
+    assert env.n_generated == 6
+    obs, *_ = env.step(np.array([0, 0]))
+    assert obs.extras[0, -1] == 0.2
+
+
+def test_reset_cache_seeds_on_demand():
+    class SeededEnv(MockEnv):
+        def __init__(self):
+            super().__init__(2)
+            self.seeds = list[int]()
+
+        def seed(self, seed_value: int):
+            self.seeds.append(seed_value)
+
+    inner = SeededEnv()
+    env = rlenv.wrappers.ResetCache(inner, pool_size=4, max_uses=2, seeds=[1, 2, 3])
+    for _ in range(8):
+        env.reset()
+    assert inner.seeds == [1, 2, 3, 1]
+    assert env.n_generated == 4
+
+
+def test_reset_cache_background():
+    env = Builder(MockEnv(2)).time_limit(10).build()
+    generator = Builder(MockEnv(2)).time_limit(10).build()
+    cached = rlenv.wrappers.ResetCache(env, pool_size=2, generator=generator, background=True)
+    for _ in range(5):
+        obs = cached.reset()
+        assert obs == MockEnv(2).reset()
+        for _ in range(3):
+            cached.step(np.array([0, 0]))
+    cached.close()
+    assert cached.n_generated >= 5